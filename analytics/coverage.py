@@ -0,0 +1,221 @@
+"""
+Ward-level primary care coverage: how far each ward's centroid (the mean
+position of its facilities) is from a functional facility and how many
+facilities lie within a radius of it.
+
+Usage:
+  python -m analytics.coverage --radius-km 5
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from database.models.geo_unit import GeoAdminUnit
+from database.models.health_facilities import HealthFacility
+from database.models.ward_coverage import WardCoverage
+from etl.bulk_copy import copy_dataframe
+from .facility_search import FacilityGridIndex
+from .geo_math import EARTH_RADIUS_KM, KM_PER_DEGREE_LAT, degree_span, haversine_km
+
+DEFAULT_RADIUS_KM = 5.0
+DEFAULT_CELL_DEG = 0.1
+
+
+def _expand_box(lat, lon, km):
+    """Bounding box of the points in (lat, lon) grown by `km` on every side."""
+    lat_lo, lat_hi, lon_lo, lon_hi = lat.min(), lat.max(), lon.min(), lon.max()
+    lat_span, lon_span = degree_span(max(abs(lat_lo), abs(lat_hi)), km)
+    return lat_lo - lat_span, lat_hi + lat_span, lon_lo - lon_span, lon_hi + lon_span
+
+
+def _ward_groups(ward_lat, ward_lon, cell_deg):
+    """Ward positions grouped by grid cell, so nearby wards share one candidate lookup."""
+    rows = np.floor(ward_lat / cell_deg).astype(np.int64)
+    cols = np.floor(ward_lon / cell_deg).astype(np.int64)
+    keys = rows * (1 << 32) + cols
+    order = np.argsort(keys, kind="stable")
+    _, starts = np.unique(keys[order], return_index=True)
+    return np.split(order, starts[1:])
+
+
+def ward_coverage(ward_lat, ward_lon, fac_lat, fac_lon, fac_functional,
+                  radius_km: float = DEFAULT_RADIUS_KM, cell_deg: float = DEFAULT_CELL_DEG) -> dict:
+    """
+    Coverage measures for every ward against every facility, in NumPy.
+
+    Wards are bucketed by grid cell and facilities by FacilityGridIndex, so
+    each bucket of wards is compared (as one broadcast haversine matrix) only
+    with the facilities in the cells around it, never with the whole country.
+    Nearest-functional search widens a bucket's margin until every ward in it
+    has a facility no farther than the margin, which makes the answer exact.
+
+    Returns arrays aligned with the ward inputs: nearest_functional_km (NaN if
+    there is no functional facility), nearest_functional_index (position in
+    the facility inputs, -1 if none), facilities_within_radius and
+    functional_within_radius.
+    """
+    ward_lat = np.asarray(ward_lat, dtype=np.float64)
+    ward_lon = np.asarray(ward_lon, dtype=np.float64)
+    fac_lat = np.asarray(fac_lat, dtype=np.float64)
+    fac_lon = np.asarray(fac_lon, dtype=np.float64)
+    fac_functional = np.asarray(fac_functional, dtype=bool)
+
+    n = len(ward_lat)
+    nearest_km = np.full(n, np.nan)
+    nearest_index = np.full(n, -1, dtype=np.int64)
+    within = np.zeros(n, dtype=np.int64)
+    functional_within = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return {
+            "nearest_functional_km": nearest_km,
+            "nearest_functional_index": nearest_index,
+            "facilities_within_radius": within,
+            "functional_within_radius": functional_within,
+        }
+
+    positions = np.arange(len(fac_lat))
+    all_index = FacilityGridIndex(positions, fac_lat, fac_lon, cell_deg=cell_deg)
+    functional_index = FacilityGridIndex(
+        positions[fac_functional], fac_lat[fac_functional], fac_lon[fac_functional], cell_deg=cell_deg
+    )
+    functional_sorted = fac_functional[all_index.ids]
+    first_margin = max(radius_km, cell_deg * KM_PER_DEGREE_LAT)
+
+    for group in _ward_groups(ward_lat, ward_lon, cell_deg):
+        g_lat = ward_lat[group][:, None]
+        g_lon = ward_lon[group][:, None]
+
+        # Facilities within the radius
+        candidates = all_index.box_candidates(*_expand_box(g_lat, g_lon, radius_km))
+        if len(candidates):
+            distances = haversine_km(g_lat, g_lon, all_index.lat[candidates], all_index.lon[candidates])
+            inside = distances <= radius_km
+            within[group] = inside.sum(axis=1)
+            functional_within[group] = (inside & functional_sorted[candidates]).sum(axis=1)
+
+        # Nearest functional facility
+        pending = np.arange(len(group))
+        margin = first_margin
+        while len(pending) and len(functional_index):
+            p_lat, p_lon = g_lat[pending], g_lon[pending]
+            candidates = functional_index.box_candidates(*_expand_box(p_lat, p_lon, margin))
+            if len(candidates):
+                distances = haversine_km(
+                    p_lat, p_lon, functional_index.lat[candidates], functional_index.lon[candidates]
+                )
+                best = distances.argmin(axis=1)
+                best_km = distances[np.arange(len(pending)), best]
+                done = best_km <= margin
+                wards = group[pending[done]]
+                nearest_km[wards] = best_km[done]
+                nearest_index[wards] = functional_index.ids[candidates[best[done]]]
+                pending = pending[~done]
+            if margin > np.pi * EARTH_RADIUS_KM:
+                break
+            margin *= 2.0
+
+    return {
+        "nearest_functional_km": nearest_km,
+        "nearest_functional_index": nearest_index,
+        "facilities_within_radius": within,
+        "functional_within_radius": functional_within,
+    }
+
+
+def is_functional(status: pd.Series) -> pd.Series:
+    return status.astype("string").str.strip().str.lower().eq("functional").fillna(False).astype(bool)
+
+
+def load_wards(db: Session) -> pd.DataFrame:
+    """Ward-level geo units with their stored point (the first loaded facility's position, or NULL)."""
+    stmt = select(GeoAdminUnit.id, GeoAdminUnit.latitude, GeoAdminUnit.longitude).where(GeoAdminUnit.adm_level == 3)
+    return pd.DataFrame(db.execute(stmt).all(), columns=["geo_admin_unit_id", "latitude", "longitude"])
+
+
+def load_facilities(db: Session) -> pd.DataFrame:
+    stmt = select(
+        HealthFacility.facility_id, HealthFacility.geo_admin_unit_id, HealthFacility.latitude,
+        HealthFacility.longitude, HealthFacility.functional_status,
+    ).where(HealthFacility.latitude.isnot(None), HealthFacility.longitude.isnot(None))
+    return pd.DataFrame(
+        db.execute(stmt).all(),
+        columns=["facility_id", "geo_admin_unit_id", "latitude", "longitude", "functional_status"],
+    )
+
+
+def ward_centroids(wards: pd.DataFrame, facilities: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ward positions: the centroid (mean coordinates) of the ward's facilities.
+
+    geo_admin_unit holds no ward boundaries, and its point is just the first
+    facility loaded for the ward, so distances from it would be 0 whenever
+    that facility is functional. Wards without located facilities keep the
+    stored point; wards with neither are dropped.
+    """
+    means = facilities.groupby("geo_admin_unit_id")[["latitude", "longitude"]].mean()
+    centroids = wards[["geo_admin_unit_id"]].join(means, on="geo_admin_unit_id")
+    centroids = centroids.fillna({"latitude": wards["latitude"], "longitude": wards["longitude"]})
+    return centroids.dropna(subset=["latitude", "longitude"]).reset_index(drop=True)
+
+
+def compute_coverage(wards: pd.DataFrame, facilities: pd.DataFrame, radius_km: float = DEFAULT_RADIUS_KM) -> pd.DataFrame:
+    """ward_coverage rows for the given wards and facilities frames, measured from ward centroids."""
+    wards = ward_centroids(wards, facilities)
+    result = ward_coverage(
+        wards["latitude"].to_numpy(),
+        wards["longitude"].to_numpy(),
+        facilities["latitude"].to_numpy(),
+        facilities["longitude"].to_numpy(),
+        is_functional(facilities["functional_status"]).to_numpy(),
+        radius_km=radius_km,
+    )
+    nearest = result["nearest_functional_index"]
+    found = nearest >= 0
+    nearest_ids = pd.Series(pd.NA, index=range(len(wards)), dtype="Int64")
+    nearest_ids[found] = facilities["facility_id"].to_numpy()[nearest[found]]
+    return pd.DataFrame({
+        "geo_admin_unit_id": wards["geo_admin_unit_id"].to_numpy(),
+        "radius_km": radius_km,
+        "nearest_functional_km": result["nearest_functional_km"],
+        "nearest_functional_facility_id": nearest_ids.array,
+        "facilities_within_radius": result["facilities_within_radius"],
+        "functional_within_radius": result["functional_within_radius"],
+    })
+
+
+def write_coverage(db: Session, coverage: pd.DataFrame) -> int:
+    """Replace the ward_coverage table's contents in the session's transaction; the caller commits."""
+    db.execute(text(f"DELETE FROM {WardCoverage.__tablename__}"))
+    cursor = db.connection().connection.cursor()
+    try:
+        return copy_dataframe(cursor, coverage, WardCoverage.__tablename__)
+    finally:
+        cursor.close()
+
+
+def run_coverage(radius_km: float = DEFAULT_RADIUS_KM) -> int:
+    """Recompute ward coverage from the warehouse and store it; returns the number of wards written."""
+    from database.db_connection import get_session
+
+    start = time.perf_counter()
+    db = get_session("ingest")
+    try:
+        wards, facilities = load_wards(db), load_facilities(db)
+        coverage = compute_coverage(wards, facilities, radius_km=radius_km)
+        written = write_coverage(db, coverage)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Computed coverage for {written:,} wards against {len(facilities):,} facilities "
+          f"in {time.perf_counter() - start:.2f}s")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute ward coverage by health facilities")
+    parser.add_argument("--radius-km", type=float, default=DEFAULT_RADIUS_KM,
+                        help="Radius for the facilities-within-radius counts")
+    args = parser.parse_args()
+    run_coverage(radius_km=args.radius_km)
@@ -0,0 +1,214 @@
+import threading
+import numpy as np
+from geoalchemy2 import Geography
+from sqlalchemy import cast, func, inspect, literal_column, select
+from sqlalchemy.orm import Session
+from database.models.health_facilities import HealthFacility
+from .geo_math import EARTH_RADIUS_KM, KM_PER_DEGREE_LAT, degree_span, haversine_km
+
+# Added by migration 5b1d08e3f6a9 only when PostGIS is available, so it is not on the HealthFacility model
+FACILITY_LOCATION = literal_column(f"{HealthFacility.__tablename__}.location", Geography("POINT", srid=4326))
+
+FACILITY_COLUMNS = [
+    HealthFacility.facility_id,
+    HealthFacility.facility_name,
+    HealthFacility.facility_type,
+    HealthFacility.functional_status,
+    HealthFacility.latitude,
+    HealthFacility.longitude,
+]
+
+
+def location_column_exists(db: Session) -> bool:
+    """Whether health_facilities_master has the PostGIS location column (i.e. PostGIS search can run)."""
+    columns = inspect(db.connection()).get_columns(HealthFacility.__tablename__)
+    return any(column["name"] == "location" for column in columns)
+
+
+def geography_point(lat: float, lon: float):
+    """SQL expression for a WGS84 point as geography (distances in metres)."""
+    return cast(func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326), Geography(srid=4326))
+
+
+def _functional_only(stmt):
+    return stmt.where(func.lower(HealthFacility.functional_status) == "functional")
+
+
+def facilities_within_radius(db: Session, lat: float, lon: float, radius_km: float,
+                             functional_only: bool = False, limit: int | None = None):
+    """
+    Facilities within `radius_km` of a point, nearest first (PostGIS).
+
+    ST_DWithin on the geography column is answered from its GiST index, so only
+    facilities near the point are ever read.
+    """
+    point = geography_point(lat, lon)
+    distance_km = (func.ST_Distance(FACILITY_LOCATION, point) / 1000.0).label("distance_km")
+    stmt = (
+        select(*FACILITY_COLUMNS, distance_km)
+        .where(func.ST_DWithin(FACILITY_LOCATION, point, radius_km * 1000.0))
+        .order_by(distance_km)
+    )
+    if functional_only:
+        stmt = _functional_only(stmt)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def nearest_facilities(db: Session, lat: float, lon: float, k: int = 5, functional_only: bool = False):
+    """The k facilities nearest to a point (PostGIS KNN: ORDER BY location <-> point, walked on the GiST index)."""
+    point = geography_point(lat, lon)
+    distance_km = (func.ST_Distance(FACILITY_LOCATION, point) / 1000.0).label("distance_km")
+    stmt = (
+        select(*FACILITY_COLUMNS, distance_km)
+        .where(FACILITY_LOCATION.isnot(None))
+        .order_by(FACILITY_LOCATION.op("<->")(point))
+        .limit(k)
+    )
+    if functional_only:
+        stmt = _functional_only(stmt)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+class FacilityGridIndex:
+    """
+    In-process spatial index over facility coordinates, for environments without PostGIS.
+
+    Points are bucketed into a regular lat/lon grid (`cell_deg` degrees per
+    side) and stored sorted by (row, column) cell key, so every grid row's
+    cells in a column range are one contiguous slice found with searchsorted.
+    A query only computes exact haversine distances for points in the cells
+    under its bounding box. Longitudes are not wrapped at the antimeridian.
+    """
+
+    # Offsets keep cell rows/columns positive so (row, col) packs into one int64 key
+    _ROW_OFFSET = 1 << 20
+    _COL_STRIDE = 1 << 21
+
+    def __init__(self, ids, lat, lon, cell_deg: float = 0.1):
+        ids = np.asarray(ids)
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        valid = np.isfinite(lat) & np.isfinite(lon)
+
+        self.cell_deg = cell_deg
+        rows, cols = self._cells(lat[valid], lon[valid])
+        keys = self._key(rows, cols)
+        order = np.argsort(keys, kind="stable")
+
+        self.keys = keys[order]
+        self.ids = ids[valid][order]
+        self.lat = lat[valid][order]
+        self.lon = lon[valid][order]
+
+    @classmethod
+    def from_database(cls, db: Session, functional_only: bool = False, **kwargs):
+        """Build from health_facilities_master in one query."""
+        stmt = select(HealthFacility.facility_id, HealthFacility.latitude, HealthFacility.longitude).where(
+            HealthFacility.latitude.isnot(None), HealthFacility.longitude.isnot(None)
+        )
+        if functional_only:
+            stmt = _functional_only(stmt)
+        rows = db.execute(stmt).all()
+        ids, lat, lon = (np.array(column) for column in zip(*rows)) if rows else ([], [], [])
+        return cls(ids, lat, lon, **kwargs)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _cells(self, lat, lon):
+        rows = np.floor(np.asarray(lat) / self.cell_deg).astype(np.int64)
+        cols = np.floor(np.asarray(lon) / self.cell_deg).astype(np.int64)
+        return rows, cols
+
+    def _key(self, rows, cols):
+        return (rows + self._ROW_OFFSET) * self._COL_STRIDE + (cols + self._ROW_OFFSET)
+
+    def box_candidates(self, lat_lo, lat_hi, lon_lo, lon_hi):
+        """Positions (into the sorted arrays) of every point in the grid cells overlapping a lat/lon box."""
+        (row_lo, row_hi), (col_lo, col_hi) = self._cells(
+            np.clip([lat_lo, lat_hi], -90.0, 90.0),
+            np.clip([lon_lo, lon_hi], -180.0, 180.0),
+        )
+        rows = np.arange(row_lo, row_hi + 1)
+        starts = np.searchsorted(self.keys, self._key(rows, col_lo), side="left")
+        ends = np.searchsorted(self.keys, self._key(rows, col_hi), side="right")
+        if not len(rows) or not (ends - starts).any():
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(s, e) for s, e in zip(starts, ends) if e > s])
+
+    def _candidates(self, lat, lon, radius_km):
+        lat_span, lon_span = degree_span(lat, radius_km)
+        return self.box_candidates(lat - lat_span, lat + lat_span, lon - lon_span, lon + lon_span)
+
+    def within(self, lat: float, lon: float, radius_km: float):
+        """(ids, distances_km) of points within `radius_km`, nearest first."""
+        candidates = self._candidates(lat, lon, radius_km)
+        distances = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return self.ids[candidates[order]], distances[order]
+
+    def nearest(self, lat: float, lon: float, k: int = 5):
+        """
+        (ids, distances_km) of the k nearest points.
+
+        Searches a growing radius, starting at one cell: once at least k points
+        lie within radius r, the k nearest overall are among them.
+        """
+        if not len(self):
+            return self.ids[:0], np.empty(0)
+        k = min(k, len(self))
+        radius_km = self.cell_deg * KM_PER_DEGREE_LAT
+        while True:
+            ids, distances = self.within(lat, lon, radius_km)
+            if len(ids) >= k:
+                return ids[:k], distances[:k]
+            if radius_km > np.pi * EARTH_RADIUS_KM:
+                # Radius already covers the globe; nothing further to find
+                return ids, distances
+            radius_km *= 2.0
+
+
+class GridFacilitySearch:
+    """
+    facilities_within_radius / nearest_facilities for databases without PostGIS.
+
+    Distances come from a FacilityGridIndex over the facility coordinates,
+    built on first use and rebuilt when the data version changes; only the
+    matching facilities' columns are read back. Results have the same shape
+    as the PostGIS functions' (FACILITY_COLUMNS plus distance_km).
+    """
+
+    def __init__(self, cell_deg: float = 0.1):
+        self.cell_deg = cell_deg
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def index(self, db: Session, version, functional_only: bool = False) -> FacilityGridIndex:
+        key = (version, functional_only)
+        with self._lock:
+            if key not in self._indexes:
+                self._indexes = {k: v for k, v in self._indexes.items() if k[0] == version}
+                self._indexes[key] = FacilityGridIndex.from_database(db, functional_only, cell_deg=self.cell_deg)
+            return self._indexes[key]
+
+    @staticmethod
+    def _rows(db: Session, ids, distances):
+        if not len(ids):
+            return []
+        ids = ids.tolist()
+        stmt = select(*FACILITY_COLUMNS).where(HealthFacility.facility_id.in_(ids))
+        by_id = {row["facility_id"]: dict(row) for row in db.execute(stmt).mappings()}
+        return [{**by_id[i], "distance_km": float(d)} for i, d in zip(ids, distances) if i in by_id]
+
+    def within(self, db: Session, version, lat: float, lon: float, radius_km: float,
+               functional_only: bool = False, limit: int | None = None):
+        ids, distances = self.index(db, version, functional_only).within(lat, lon, radius_km)
+        return self._rows(db, ids[:limit], distances[:limit])
+
+    def nearest(self, db: Session, version, lat: float, lon: float, k: int = 5, functional_only: bool = False):
+        ids, distances = self.index(db, version, functional_only).nearest(lat, lon, k)
+        return self._rows(db, ids, distances)
@@ -0,0 +1,26 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = np.pi * EARTH_RADIUS_KM / 180.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in km between points given in degrees.
+
+    Fully vectorized: arguments broadcast against each other, so one point vs.
+    an array, or an (n, 1) column vs. a (1, m) row for a full distance matrix.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2.0) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def degree_span(lat, radius_km):
+    """(lat_degrees, lon_degrees) that a radius covers around latitude `lat`; a bounding box, never too small."""
+    lat_span = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = np.cos(np.radians(min(abs(lat) + lat_span, 89.9)))
+    return lat_span, lat_span / cos_lat
@@ -0,0 +1,255 @@
+"""
+Week-level outbreak series and an incremental surge detector.
+
+outbreak_reports rows carry cumulative case/death totals from first_epiwk to
+last_epiwk. Every new report of a (disease, country) series becomes one
+outbreak_epiweeks row with the cases/deaths added since the series' previous
+report, and that weekly case rate is scored against the series' rolling
+baseline in outbreak_detector_state:
+
+  spike  EWMA z-score >= Z_ALERT
+  cusum  one-sided CUSUM of the z-scores >= CUSUM_H (a sustained rise); resets after alerting
+
+Only reports above the watermark (the highest outbreak_reports.id already
+processed) are read, and only the affected series' state rows are written, so
+a run costs time proportional to the newly loaded reports, not to history.
+
+Usage:
+  python -m analytics.outbreak_detector
+"""
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from database.models.outbreak_epiweeks import OutbreakAlert, OutbreakDetectorState, OutbreakEpiweek
+from database.models.outbreak_reports import OutbreakReport
+from etl.bulk_copy import copy_dataframe
+
+EWMA_LAMBDA = 0.2     # weight of the newest week in the baseline mean/variance
+WARMUP_WEEKS = 4      # weeks of baseline before a series can alert
+Z_ALERT = 3.0
+CUSUM_K = 0.5         # slack, in standard deviations, before the CUSUM accumulates
+CUSUM_H = 4.0
+
+SERIES = ["disease_name", "country_code"]
+STATE_COLUMNS = [c.name for c in OutbreakDetectorState.__table__.columns if c.name != "updated_at"]
+EPIWEEK_COLUMNS = [c.name for c in OutbreakEpiweek.__table__.columns if c.name != "id"]
+ALERT_COLUMNS = ["disease_name", "country_code", "epiweek", "kind", "weekly_cases", "expected", "zscore", "cusum"]
+
+
+def load_state(db: Session) -> pd.DataFrame:
+    """The whole state table: one row per series, so it stays small however long the history gets."""
+    stmt = select(*(OutbreakDetectorState.__table__.c[name] for name in STATE_COLUMNS))
+    return pd.DataFrame(db.execute(stmt).all(), columns=STATE_COLUMNS)
+
+
+def new_reports(db: Session, watermark: int) -> pd.DataFrame:
+    """Reports loaded since the last run (an index range scan on the primary key)."""
+    stmt = (
+        select(
+            OutbreakReport.id,
+            OutbreakReport.disease_name,
+            OutbreakReport.country_code,
+            OutbreakReport.first_epiwk,
+            OutbreakReport.last_epiwk,
+            OutbreakReport.case_total,
+            OutbreakReport.death_total,
+        )
+        .where(OutbreakReport.id > watermark)
+        .order_by(OutbreakReport.id)
+    )
+    columns = ["id", *SERIES, "first_epiwk", "last_epiwk", "case_total", "death_total"]
+    return pd.DataFrame(db.execute(stmt).all(), columns=columns)
+
+
+def derive_epiweeks(reports: pd.DataFrame, state: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn new cumulative reports into per-report increments.
+
+    A report's predecessor is the previous report of its series in this batch,
+    or the last one recorded in the state. Reports not newer than the state's
+    last week are dropped (re-loads and late corrections), and of several
+    reports for the same week the last loaded wins. A new first_epiwk starts a
+    new reporting cycle, whose first report counts in full. Downward
+    revisions count as zero.
+    """
+    reports = reports.dropna(subset=SERIES + ["last_epiwk"]).copy()
+    for column in ("first_epiwk", "last_epiwk"):
+        reports[column] = pd.to_datetime(reports[column])
+    reports = (
+        reports.sort_values(SERIES + ["last_epiwk", "id"])
+        .drop_duplicates(SERIES + ["last_epiwk"], keep="last")
+    )
+
+    previous = state[SERIES + ["first_epiwk", "last_epiwk", "cum_cases", "cum_deaths"]].rename(columns={
+        "first_epiwk": "prev_first", "last_epiwk": "prev_last", "cum_cases": "prev_cases", "cum_deaths": "prev_deaths",
+    })
+    for column in ("prev_first", "prev_last"):
+        previous[column] = pd.to_datetime(previous[column])
+    for column in ("prev_cases", "prev_deaths"):
+        previous[column] = previous[column].astype("float64")
+    df = reports.merge(previous, on=SERIES, how="left")
+    df = df[df["prev_last"].isna() | (df["last_epiwk"] > df["prev_last"])].reset_index(drop=True)
+
+    grouped = df.groupby(SERIES, sort=False)
+    first_in_batch = grouped.cumcount() == 0
+    for column, source in (("prev_first", "first_epiwk"), ("prev_last", "last_epiwk"),
+                           ("prev_cases", "case_total"), ("prev_deaths", "death_total")):
+        df[column] = df[column].where(first_in_batch, grouped[source].shift(1))
+
+    same_cycle = df["prev_last"].notna() & (
+        (df["first_epiwk"] == df["prev_first"]) | df["first_epiwk"].isna() | df["prev_first"].isna()
+    )
+    base_cases = df["prev_cases"].where(same_cycle).fillna(0)
+    base_deaths = df["prev_deaths"].where(same_cycle).fillna(0)
+    cum_cases = df["case_total"].astype("Float64").fillna(base_cases)
+    cum_deaths = df["death_total"].astype("Float64").fillna(base_deaths)
+
+    since_previous = (df["last_epiwk"] - df["prev_last"]).dt.days // 7
+    whole_cycle = ((df["last_epiwk"] - df["first_epiwk"]).dt.days // 7 + 1).fillna(1)
+    weeks_covered = since_previous.where(same_cycle, whole_cycle).clip(lower=1)
+
+    return pd.DataFrame({
+        "disease_name": df["disease_name"],
+        "country_code": df["country_code"],
+        "epiweek": df["last_epiwk"].dt.date,
+        "weeks_covered": weeks_covered.astype("int64"),
+        "new_cases": (cum_cases - base_cases).clip(lower=0).astype("int64"),
+        "new_deaths": (cum_deaths - base_deaths).clip(lower=0).astype("int64"),
+        "cum_cases": cum_cases.astype("Int64"),
+        "cum_deaths": cum_deaths.astype("Int64"),
+        "report_id": df["id"],
+        "first_epiwk": df["first_epiwk"].dt.date,
+    })
+
+
+def detect(weeks: pd.DataFrame, state: pd.DataFrame):
+    """
+    Score new weeks against each series' baseline and roll the baseline forward.
+
+    Series are independent, so the k-th new week of every series is scored in
+    one vectorized step; a typical weekly load is a single step. Returns
+    (state rows for the series in `weeks`, alerts).
+    """
+    weeks = weeks.sort_values(SERIES + ["epiweek"]).reset_index(drop=True)
+    grouped = weeks.groupby(SERIES, sort=False)
+    series_codes = grouped.ngroup().to_numpy()
+    steps = grouped.cumcount().to_numpy()
+
+    latest = grouped.tail(1).reset_index(drop=True)
+    baseline = latest[SERIES].merge(state, on=SERIES, how="left")
+    mean, var, cusum, seen = (
+        baseline[column].astype("float64").fillna(0.0).to_numpy()
+        for column in ("ewma_mean", "ewma_var", "cusum", "weeks_seen")
+    )
+
+    rate = (weeks["new_cases"] / weeks["weeks_covered"]).to_numpy(dtype=np.float64)
+    alerts = []
+    for step in range(steps.max() + 1 if len(steps) else 0):
+        rows = np.flatnonzero(steps == step)
+        s = series_codes[rows]
+        x, m, v, c, n = rate[rows], mean[s], var[s], cusum[s], seen[s]
+
+        # Poisson floor on the spread, so a flat zero baseline does not turn one case into a surge
+        z = (x - m) / np.sqrt(np.maximum(v, np.maximum(m, 1.0)))
+        armed = n >= WARMUP_WEEKS
+        c = np.where(armed, np.maximum(0.0, c + z - CUSUM_K), 0.0)
+        for kind, fired in (("spike", armed & (z >= Z_ALERT)), ("cusum", armed & (c >= CUSUM_H))):
+            hit = np.flatnonzero(fired)
+            if len(hit):
+                alerts.append(pd.DataFrame({
+                    "disease_name": weeks["disease_name"].to_numpy()[rows[hit]],
+                    "country_code": weeks["country_code"].to_numpy()[rows[hit]],
+                    "epiweek": weeks["epiweek"].to_numpy()[rows[hit]],
+                    "kind": kind,
+                    "weekly_cases": x[hit],
+                    "expected": m[hit],
+                    "zscore": z[hit],
+                    "cusum": c[hit],
+                }))
+        cusum[s] = np.where(armed & (c >= CUSUM_H), 0.0, c)
+
+        d = x - m
+        mean[s] = np.where(n == 0, x, m + EWMA_LAMBDA * d)
+        var[s] = np.where(n == 0, 0.0, (1 - EWMA_LAMBDA) * (v + EWMA_LAMBDA * d * d))
+        seen[s] = n + 1
+
+    new_state = pd.DataFrame({
+        "disease_name": latest["disease_name"],
+        "country_code": latest["country_code"],
+        "last_report_id": latest["report_id"].astype("int64"),
+        "first_epiwk": latest["first_epiwk"],
+        "last_epiwk": latest["epiweek"],
+        "cum_cases": latest["cum_cases"],
+        "cum_deaths": latest["cum_deaths"],
+        "weeks_seen": seen.astype("int64"),
+        "ewma_mean": mean,
+        "ewma_var": var,
+        "cusum": cusum,
+    })
+    alerts = pd.concat(alerts, ignore_index=True) if alerts else pd.DataFrame(columns=ALERT_COLUMNS)
+    return new_state, alerts
+
+
+def save_state(db: Session, rows: pd.DataFrame):
+    """Upsert state rows (a handful per load: one per series that received reports)."""
+    if rows.empty:
+        return
+    records = rows[STATE_COLUMNS].astype(object).where(rows[STATE_COLUMNS].notna(), None).to_dict("records")
+    stmt = insert(OutbreakDetectorState).values(records)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=SERIES,
+        set_={**{name: stmt.excluded[name] for name in STATE_COLUMNS if name not in SERIES}, "updated_at": func.now()},
+    )
+    db.execute(stmt)
+
+
+def _copy(db: Session, df: pd.DataFrame, table: str, columns) -> int:
+    if df.empty:
+        return 0
+    cursor = db.connection().connection.cursor()
+    try:
+        return copy_dataframe(cursor, df, table, columns=columns)
+    finally:
+        cursor.close()
+
+
+def run_detector() -> dict:
+    """Process every report loaded since the last run; returns counts of reports, weeks and alerts."""
+    from database.db_connection import get_session
+
+    start = time.perf_counter()
+    db = get_session("ingest")
+    try:
+        # One detector at a time: a second run waits, then sees the first one's watermark
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext('outbreak_detector'))"))
+        state = load_state(db)
+        watermark = int(state["last_report_id"].max()) if len(state) else 0
+        reports = new_reports(db, watermark)
+
+        weeks = derive_epiweeks(reports, state)
+        new_state, alerts = detect(weeks, state)
+
+        # Series whose new reports were all stale still move the watermark past them
+        processed = reports.dropna(subset=SERIES).groupby(SERIES, as_index=False)["id"].max()
+        touched = pd.concat([new_state, state[~state.set_index(SERIES).index.isin(new_state.set_index(SERIES).index)]])
+        touched = touched.merge(processed, on=SERIES, how="inner")
+        touched["last_report_id"] = touched[["last_report_id", "id"]].max(axis=1)
+
+        weeks = weeks.sort_values(["epiweek", *SERIES])  # appended in date order for the BRIN index
+        written = _copy(db, weeks, OutbreakEpiweek.__tablename__, EPIWEEK_COLUMNS)
+        raised = _copy(db, alerts, OutbreakAlert.__tablename__, ALERT_COLUMNS)
+        save_state(db, touched.drop(columns="id"))
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"Outbreak detector: {len(reports):,} new reports -> {written:,} epiweek rows, "
+          f"{raised:,} alerts in {time.perf_counter() - start:.2f}s")
+    return {"reports": len(reports), "weeks": written, "alerts": raised}
+
+
+if __name__ == "__main__":
+    run_detector()
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from database.data_version import current_data_version
+from database.db_connection import get_engine
+
+# Seconds a looked-up data version is trusted before asking the database again
+DATA_VERSION_TTL = float(os.getenv("DATA_VERSION_TTL_SECONDS", "5"))
+
+
+class VersionClock:
+    """Current warehouse data version, re-read from the database at most once per `ttl` seconds."""
+
+    def __init__(self, ttl: float = DATA_VERSION_TTL):
+        self.ttl = ttl
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> int:
+        with self._lock:
+            if self._version is None or time.monotonic() - self._checked_at >= self.ttl:
+                with get_engine("serving").connect() as conn:
+                    self._version = current_data_version(conn)
+                self._checked_at = time.monotonic()
+            return self._version
+
+
+class ResponseCache:
+    """
+    Rendered response bodies keyed by (data version, request key).
+
+    Memory tier: an LRU bounded by entry count and total body bytes.
+    File tier (optional, `directory`): one file per entry under a per-version
+    folder, so cached bodies survive API restarts and are shared between
+    worker processes. Entries from older versions are never looked up again;
+    the memory tier drops them on the first lookup at a new version and the
+    file tier deletes their folders.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024, directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _switch_version(self, version):
+        # Called with the lock held
+        if version == self._version:
+            return
+        self._entries.clear()
+        self._bytes = 0
+        self._version = version
+        if self.directory and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name != str(version):
+                    shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _file_path(self, version, key):
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, str(version), f"{digest}.json")
+
+    def get(self, version, key):
+        with self._lock:
+            self._switch_version(version)
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+
+        if self.directory:
+            path = self._file_path(version, key)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    body = f.read()
+                self._remember(version, key, body)
+                self.hits += 1
+                return body
+
+        self.misses += 1
+        return None
+
+    def _remember(self, version, key, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._switch_version(version)
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key))
+            self._entries[key] = body
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def put(self, version, key, body: bytes):
+        self._remember(version, key, body)
+        if self.directory:
+            path = self._file_path(version, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+    def get_or_compute(self, version, key, compute) -> bytes:
+        """Cached JSON body for key, computing and storing it on a miss (for dashboard queries too)."""
+        body = self.get(version, key)
+        if body is None:
+            body = json.dumps(jsonable_encoder(compute()), separators=(",", ":")).encode()
+            self.put(version, key, body)
+        return body
+
+    def stats(self) -> dict:
+        return {
+            "version": self._version,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+data_version = VersionClock()
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("API_CACHE_MAX_ENTRIES", "512")),
+    max_bytes=int(os.getenv("API_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    directory=os.getenv("API_CACHE_DIR") or None,
+)
+
+
+def request_key(request: Request) -> str:
+    """Path plus query parameters in a stable order, so ?a=1&b=2 and ?b=2&a=1 share an entry."""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def make_etag(version: int, key: str) -> str:
+    return f'"v{version}-{hashlib.sha256(key.encode()).hexdigest()[:16]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def cached_json(request: Request, compute) -> Response:
+    """
+    JSON response for a read-only query, served from the cache while the data version holds.
+
+    The ETag depends only on the data version and the request, so a client
+    revalidating with If-None-Match gets a 304 without the query or even the
+    cached body being touched. `compute()` runs only on a cache miss.
+    """
+    version = data_version.current()
+    key = request_key(request)
+    etag = make_etag(version, key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get_or_compute(version, key, compute)
+    return Response(content=body, media_type="application/json", headers=headers)
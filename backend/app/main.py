@@ -0,0 +1,19 @@
+from fastapi import FastAPI
+from .cache import response_cache
+from .routers import facilities, indicators, mortality, outbreaks, rollups
+
+app = FastAPI(
+    title="RenewedCare API",
+    description="Read access to the RenewedCare warehouse tables for the dashboard and analysts.",
+)
+
+app.include_router(indicators.router)
+app.include_router(mortality.router)
+app.include_router(outbreaks.router)
+app.include_router(facilities.router)
+app.include_router(rollups.router)
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok", "cache": response_cache.stats()}
@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+from enum import Enum
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from geoalchemy2 import Geography, Geometry
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from database.db_connection import streaming_connection
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class Page:
+    """Keyset pagination parameters: rows with primary key > after_id, at most `limit` of them."""
+
+    def __init__(
+        self,
+        after_id: int | None = Query(None, description="Return rows after this id (the previous page's next_after)"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.after_id = after_id
+        self.limit = limit
+
+
+def primary_key(model):
+    return model.__mapper__.primary_key[0]
+
+
+def output_columns(model):
+    """Table columns that serialise to JSON/CSV; PostGIS columns are left out (latitude/longitude carry the position)."""
+    return [c for c in model.__table__.columns if not isinstance(c.type, (Geography, Geometry))]
+
+
+def filtered_rows(model, conditions):
+    """SELECT of the model's output columns with the filters applied, in primary key order."""
+    return select(*output_columns(model)).where(*conditions).order_by(primary_key(model))
+
+
+def keyset_page(db: Session, model, conditions, page: Page) -> dict:
+    """One page of a model's filtered rows, keyed on its primary key (see keyset_select)."""
+    return keyset_select(db, filtered_rows(model, conditions), primary_key(model), page)
+
+
+def keyset_select(db: Session, stmt, key, page: Page) -> dict:
+    """
+    One page of rows from `stmt` plus the cursor for the next one.
+
+    `stmt` must be ordered by `key`, a unique integer column it also selects.
+    Seeks on the key's index (WHERE key > after_id ORDER BY key LIMIT n)
+    instead of OFFSET, so page 1000 costs the same as page 1. One extra row is
+    fetched to tell whether another page exists; next_after is None on the last page.
+    """
+    if page.after_id is not None:
+        stmt = stmt.where(key > page.after_id)
+    rows = db.execute(stmt.limit(page.limit + 1)).mappings().all()
+
+    has_more = len(rows) > page.limit
+    items = [dict(row) for row in rows[:page.limit]]
+    return {
+        "items": items,
+        "next_after": items[-1][key.name] if has_more else None,
+    }
+
+
+def _ndjson_lines(result):
+    for partition in result.partitions():
+        yield "".join(json.dumps(dict(row._mapping), default=str) + "\n" for row in partition)
+
+
+def _csv_lines(result):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(result.keys())
+    for partition in result.partitions():
+        writer.writerows(partition)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_export(model, conditions, export_format: ExportFormat, filename: str) -> StreamingResponse:
+    """
+    Stream every matching row as NDJSON or CSV.
+
+    Rows come from a server-side cursor (database.db_connection.streaming_connection)
+    a few thousand at a time and are written out as they arrive, so a full-table
+    export never sits in the API process's memory. The connection is opened when
+    the response starts and released when it finishes or the client disconnects;
+    it deliberately does not use the request's get_db session, which is closed
+    before a streaming body is sent.
+    """
+    stmt = filtered_rows(model, conditions)
+    render = _csv_lines if export_format == ExportFormat.csv else _ndjson_lines
+
+    def body():
+        with streaming_connection() as conn:
+            yield from render(conn.execute(stmt))
+
+    media_type = "text/csv" if export_format == ExportFormat.csv else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
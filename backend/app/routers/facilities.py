@@ -0,0 +1,109 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from analytics.facility_search import GridFacilitySearch, facilities_within_radius, location_column_exists, nearest_facilities
+from database.db_connection import get_db
+from database.models.geo_unit import GeoAdminUnit
+from database.models.health_facilities import HealthFacility
+from ..cache import cached_json, data_version
+from ..query import ExportFormat, Page, keyset_page, stream_export
+
+router = APIRouter(prefix="/facilities", tags=["health facilities"])
+
+# Spatial search backend, decided on first use: PostGIS when the location column exists, else the grid index
+_postgis = {}
+grid_search = GridFacilitySearch()
+
+
+def use_postgis(db: Session) -> bool:
+    if "available" not in _postgis:
+        _postgis["available"] = location_column_exists(db)
+    return _postgis["available"]
+
+
+def escape_like(value: str) -> str:
+    """Literal text for a LIKE pattern (used with escape="\\"): '%' and '_' match only themselves"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def facility_filters(
+    name: str | None = Query(None, description="Substring of the facility name (case-insensitive)"),
+    state_name: str | None = None,
+    lga_name: str | None = None,
+    ward_name: str | None = None,
+    geo_admin_unit_id: int | None = None,
+    facility_type: str | None = None,
+    category: str | None = None,
+    ownership: str | None = None,
+    functional_status: str | None = None,
+):
+    conditions = []
+    if name is not None:
+        conditions.append(HealthFacility.facility_name.ilike(f"%{escape_like(name)}%", escape="\\"))
+
+    geo_conditions = [
+        column == value
+        for column, value in (
+            (GeoAdminUnit.state_name, state_name),
+            (GeoAdminUnit.lga_name, lga_name),
+            (GeoAdminUnit.ward_name, ward_name),
+        )
+        if value is not None
+    ]
+    if geo_conditions:
+        conditions.append(HealthFacility.geo_admin_unit_id.in_(select(GeoAdminUnit.id).where(*geo_conditions)))
+    if geo_admin_unit_id is not None:
+        conditions.append(HealthFacility.geo_admin_unit_id == geo_admin_unit_id)
+
+    for column, value in (
+        (HealthFacility.facility_type, facility_type),
+        (HealthFacility.category, category),
+        (HealthFacility.ownership, ownership),
+        (HealthFacility.functional_status, functional_status),
+    ):
+        if value is not None:
+            conditions.append(column == value)
+    return conditions
+
+
+@router.get("")
+def list_facilities(request: Request, conditions=Depends(facility_filters), page: Page = Depends(), db: Session = Depends(get_db)):
+    return cached_json(request, lambda: keyset_page(db, HealthFacility, conditions, page))
+
+
+@router.get("/export")
+def export_facilities(conditions=Depends(facility_filters), format: ExportFormat = ExportFormat.ndjson):
+    return stream_export(HealthFacility, conditions, format, "health_facilities")
+
+
+@router.get("/nearby")
+def facilities_nearby(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10.0, gt=0, le=500),
+    functional_only: bool = False,
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """Facilities within radius_km of a point, nearest first (PostGIS, or the in-process grid index without it)."""
+    if use_postgis(db):
+        return cached_json(request, lambda: facilities_within_radius(db, lat, lon, radius_km, functional_only, limit))
+    return cached_json(request, lambda: grid_search.within(
+        db, data_version.current(), lat, lon, radius_km, functional_only, limit
+    ))
+
+
+@router.get("/nearest")
+def facilities_nearest(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=100),
+    functional_only: bool = False,
+    db: Session = Depends(get_db),
+):
+    """The k facilities nearest to a point (PostGIS KNN, or the in-process grid index without PostGIS)."""
+    if use_postgis(db):
+        return cached_json(request, lambda: nearest_facilities(db, lat, lon, k, functional_only))
+    return cached_json(request, lambda: grid_search.nearest(db, data_version.current(), lat, lon, k, functional_only))
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from database.db_connection import get_db
+from database.models.disease_dim import Disease
+from database.models.disease_indicator import DiseaseIndicator
+from ..cache import cached_json
+from ..query import ExportFormat, Page, keyset_page, stream_export
+
+router = APIRouter(prefix="/indicators", tags=["disease indicators"])
+
+
+def indicator_filters(
+    disease: str | None = Query(None, description="Disease name, e.g. Tuberculosis (case-insensitive)"),
+    disease_id: int | None = None,
+    indicator_code: str | None = None,
+    year: int | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    dimension_code: str | None = None,
+    geo_admin_unit_id: int | None = None,
+):
+    conditions = []
+    if disease is not None:
+        conditions.append(DiseaseIndicator.disease_id.in_(
+            select(Disease.id).where(func.lower(Disease.name) == disease.lower())
+        ))
+    if disease_id is not None:
+        conditions.append(DiseaseIndicator.disease_id == disease_id)
+    if indicator_code is not None:
+        conditions.append(DiseaseIndicator.indicator_code == indicator_code)
+    if year is not None:
+        conditions.append(DiseaseIndicator.year == year)
+    if year_from is not None:
+        conditions.append(DiseaseIndicator.year >= year_from)
+    if year_to is not None:
+        conditions.append(DiseaseIndicator.year <= year_to)
+    if dimension_code is not None:
+        conditions.append(DiseaseIndicator.dimension_code == dimension_code)
+    if geo_admin_unit_id is not None:
+        conditions.append(DiseaseIndicator.geo_admin_unit_id == geo_admin_unit_id)
+    return conditions
+
+
+@router.get("")
+def list_indicators(request: Request, conditions=Depends(indicator_filters), page: Page = Depends(), db: Session = Depends(get_db)):
+    return cached_json(request, lambda: keyset_page(db, DiseaseIndicator, conditions, page))
+
+
+@router.get("/export")
+def export_indicators(conditions=Depends(indicator_filters), format: ExportFormat = ExportFormat.ndjson):
+    return stream_export(DiseaseIndicator, conditions, format, "disease_indicators")
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from database.db_connection import get_db
+from database.models.causes_of_death import CauseOfDeath
+from database.models.mortality_statistic import MortalityStatistic
+from ..cache import cached_json
+from ..query import ExportFormat, Page, keyset_page, stream_export
+
+router = APIRouter(prefix="/mortality", tags=["mortality statistics"])
+
+
+def mortality_filters(
+    country: str | None = Query(None, description="ISO3 country code, e.g. NGA"),
+    cause: str | None = Query(None, description="Cause of death name (case-insensitive)"),
+    cause_id: int | None = None,
+    year: int | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    gender: str | None = Query(None, description="BTSX, MLE or FMLE"),
+):
+    conditions = []
+    if country is not None:
+        conditions.append(MortalityStatistic.country == country)
+    if cause is not None:
+        conditions.append(MortalityStatistic.cause_id.in_(
+            select(CauseOfDeath.id).where(func.lower(CauseOfDeath.name) == cause.lower())
+        ))
+    if cause_id is not None:
+        conditions.append(MortalityStatistic.cause_id == cause_id)
+    if year is not None:
+        conditions.append(MortalityStatistic.year == year)
+    if year_from is not None:
+        conditions.append(MortalityStatistic.year >= year_from)
+    if year_to is not None:
+        conditions.append(MortalityStatistic.year <= year_to)
+    if gender is not None:
+        conditions.append(MortalityStatistic.gender == gender)
+    return conditions
+
+
+@router.get("")
+def list_mortality(request: Request, conditions=Depends(mortality_filters), page: Page = Depends(), db: Session = Depends(get_db)):
+    return cached_json(request, lambda: keyset_page(db, MortalityStatistic, conditions, page))
+
+
+@router.get("/export")
+def export_mortality(conditions=Depends(mortality_filters), format: ExportFormat = ExportFormat.ndjson):
+    return stream_export(MortalityStatistic, conditions, format, "mortality_statistics")
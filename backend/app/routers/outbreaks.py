@@ -0,0 +1,68 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from database.db_connection import get_db
+from database.models.outbreak_epiweeks import OutbreakAlert, OutbreakEpiweek
+from database.models.outbreak_reports import OutbreakReport
+from ..cache import cached_json
+from ..query import ExportFormat, Page, keyset_page, stream_export
+
+router = APIRouter(prefix="/outbreaks", tags=["outbreak reports"])
+
+
+def outbreak_filters(
+    disease: str | None = Query(None, description="Disease name, e.g. Cholera (case-insensitive)"),
+    country_code: str | None = None,
+    region: str | None = None,
+    active_since: date | None = Query(None, description="Only outbreaks whose last epi week is on or after this date"),
+):
+    conditions = []
+    if disease is not None:
+        conditions.append(func.lower(OutbreakReport.disease_name) == disease.lower())
+    if country_code is not None:
+        conditions.append(OutbreakReport.country_code == country_code)
+    if region is not None:
+        conditions.append(OutbreakReport.region == region)
+    if active_since is not None:
+        conditions.append(OutbreakReport.last_epiwk >= active_since)
+    return conditions
+
+
+@router.get("")
+def list_outbreaks(request: Request, conditions=Depends(outbreak_filters), page: Page = Depends(), db: Session = Depends(get_db)):
+    return cached_json(request, lambda: keyset_page(db, OutbreakReport, conditions, page))
+
+
+@router.get("/export")
+def export_outbreaks(conditions=Depends(outbreak_filters), format: ExportFormat = ExportFormat.ndjson):
+    return stream_export(OutbreakReport, conditions, format, "outbreak_reports")
+
+
+def series_filters(model):
+    def filters(
+        disease: str | None = Query(None, description="Disease name, e.g. Cholera (case-insensitive)"),
+        country_code: str | None = None,
+        since: date | None = Query(None, description="Only epi weeks on or after this date"),
+    ):
+        conditions = []
+        if disease is not None:
+            conditions.append(func.lower(model.disease_name) == disease.lower())
+        if country_code is not None:
+            conditions.append(model.country_code == country_code)
+        if since is not None:
+            conditions.append(model.epiweek >= since)
+        return conditions
+    return filters
+
+
+@router.get("/weekly")
+def list_weekly(request: Request, conditions=Depends(series_filters(OutbreakEpiweek)), page: Page = Depends(), db: Session = Depends(get_db)):
+    """New cases/deaths per report, derived from the cumulative totals by the outbreak detector."""
+    return cached_json(request, lambda: keyset_page(db, OutbreakEpiweek, conditions, page))
+
+
+@router.get("/alerts")
+def list_alerts(request: Request, conditions=Depends(series_filters(OutbreakAlert)), page: Page = Depends(), db: Session = Depends(get_db)):
+    """Weeks whose case rate broke the series' baseline (kind 'spike' or 'cusum')."""
+    return cached_json(request, lambda: keyset_page(db, OutbreakAlert, conditions, page))
@@ -0,0 +1,128 @@
+from enum import Enum
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from database.db_connection import get_db
+from database.models.geo_unit import GeoAdminUnit
+from database.models.rollups import facility_counts, indicator_summary, top_causes_of_death
+from database.models.ward_coverage import WardCoverage
+from ..cache import cached_json
+from ..query import Page, keyset_select
+
+router = APIRouter(prefix="/rollups", tags=["rollups"])
+
+
+class FacilityLevel(str, Enum):
+    state = "state"
+    lga = "lga"
+
+
+def rows(db: Session, stmt):
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+@router.get("/indicators")
+def indicator_rollup(
+    request: Request,
+    disease: str | None = Query(None, description="Disease name (case-insensitive)"),
+    indicator_code: str | None = None,
+    sex: str | None = Query(None, description="BTSX, MLE or FMLE"),
+    year_from: int | None = None,
+    year_to: int | None = None,
+    page: Page = Depends(),
+    db: Session = Depends(get_db),
+):
+    """Indicator values per disease / indicator / year / sex (from mv_indicator_summary), one keyset page."""
+    t = indicator_summary.c
+    stmt = select(indicator_summary).order_by(t.row_id)
+    if disease is not None:
+        stmt = stmt.where(func.lower(t.disease_name) == disease.lower())
+    if indicator_code is not None:
+        stmt = stmt.where(t.indicator_code == indicator_code)
+    if sex is not None:
+        stmt = stmt.where(t.sex == sex.upper())
+    if year_from is not None:
+        stmt = stmt.where(t.year >= year_from)
+    if year_to is not None:
+        stmt = stmt.where(t.year <= year_to)
+    return cached_json(request, lambda: keyset_select(db, stmt, t.row_id, page))
+
+
+@router.get("/top-causes")
+def top_causes_rollup(
+    request: Request,
+    country: str = Query(..., description="ISO3 country code, e.g. NGA"),
+    year: int | None = Query(None, description="Defaults to the latest year available for the country"),
+    gender: str = Query("BTSX", description="BTSX, MLE or FMLE"),
+    top: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """The `top` causes of death for a country / year / gender (from mv_top_causes_of_death)."""
+    t = top_causes_of_death.c
+    if year is None:
+        year = select(func.max(t.year)).where(t.country == country).scalar_subquery()
+    stmt = (
+        select(top_causes_of_death)
+        .where(t.country == country, t.year == year, t.gender == gender, t.cause_rank <= top)
+        .order_by(t.cause_rank, t.cause_name)
+    )
+    return cached_json(request, lambda: rows(db, stmt))
+
+
+@router.get("/facilities")
+def facility_rollup(
+    request: Request,
+    level: FacilityLevel = FacilityLevel.lga,
+    state_name: str | None = None,
+    functional_status: str | None = None,
+    db: Session = Depends(get_db),
+):
+    """Facility counts per state or LGA and functional status (from mv_facility_counts)."""
+    t = facility_counts.c
+    keys = [t.state_name] if level == FacilityLevel.state else [t.state_name, t.lga_name]
+    stmt = (
+        select(*keys, t.functional_status, func.sum(t.facility_count).label("facility_count"))
+        .group_by(*keys, t.functional_status)
+        .order_by(*keys, t.functional_status)
+    )
+    if state_name is not None:
+        stmt = stmt.where(t.state_name == state_name)
+    if functional_status is not None:
+        stmt = stmt.where(t.functional_status == functional_status)
+    return cached_json(request, lambda: rows(db, stmt))
+
+
+@router.get("/coverage")
+def coverage_rollup(
+    request: Request,
+    state_name: str | None = None,
+    lga_name: str | None = None,
+    min_distance_km: float | None = Query(None, ge=0, description="Only wards at least this far from a functional facility"),
+    page: Page = Depends(),
+    db: Session = Depends(get_db),
+):
+    """Ward coverage (from ward_coverage) in ward id order, one keyset page; filter with min_distance_km for gaps."""
+    stmt = (
+        select(
+            GeoAdminUnit.state_name,
+            GeoAdminUnit.lga_name,
+            GeoAdminUnit.ward_name,
+            WardCoverage.geo_admin_unit_id,
+            WardCoverage.radius_km,
+            WardCoverage.nearest_functional_km,
+            WardCoverage.nearest_functional_facility_id,
+            WardCoverage.facilities_within_radius,
+            WardCoverage.functional_within_radius,
+        )
+        .join(GeoAdminUnit, GeoAdminUnit.id == WardCoverage.geo_admin_unit_id)
+        .order_by(WardCoverage.geo_admin_unit_id)
+    )
+    if state_name is not None:
+        stmt = stmt.where(GeoAdminUnit.state_name == state_name)
+    if lga_name is not None:
+        stmt = stmt.where(GeoAdminUnit.lga_name == lga_name)
+    if min_distance_km is not None:
+        stmt = stmt.where(
+            (WardCoverage.nearest_functional_km >= min_distance_km) | WardCoverage.nearest_functional_km.is_(None)
+        )
+    return cached_json(request, lambda: keyset_select(db, stmt, WardCoverage.geo_admin_unit_id, page))
@@ -0,0 +1,178 @@
+"""
+Compare forecasting engines on held-out data: accuracy against cost.
+
+The last `--holdout` periods of every series are held out and forecast from
+the rest by each engine:
+  naive, linear, holt   ml.pipelines.baseline, all series in one batch
+  prophet               one model per series, as in ml/models/Forecast.ipynb
+                        (via ml.pipelines.forecast.fit_prophet); only if installed
+
+Reports each engine's fit time, error (MASE: MAE scaled by the series'
+in-sample naive error, so series of any magnitude compare; sMAPE) and 95%
+interval coverage, then picks for each series the cheapest engine whose MASE
+is within --tolerance of the best one.
+
+Usage:
+  python -m benchmarks.forecast_engines                       # indicator series from the database
+  python -m benchmarks.forecast_engines --synthetic 5000      # no database
+  python -m benchmarks.forecast_engines --output picks.csv    # per-series scores and picks
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from ml.pipelines import baseline
+from ml.pipelines.forecast import FREQUENCIES, INTERVAL_WIDTH, MIN_POINTS, Prophet, fit_prophet
+
+
+def synthetic_series(n: int, seed: int = 0) -> list:
+    """Annual series of 10-25 points mixing linear trends, damped trends, level shifts and random walks."""
+    rng = np.random.default_rng(seed)
+    series = []
+    for i in range(n):
+        length = int(rng.integers(10, 26))
+        start = int(rng.integers(1995, 2024 - length + 1))
+        t = np.arange(length, dtype=np.float64)
+        base = rng.uniform(10, 1000)
+        kind = i % 4
+        if kind == 0:
+            signal = base + rng.normal(0, 0.03) * base * t
+        elif kind == 1:
+            signal = base * (1 + rng.normal(0, 0.3) * (1 - 0.8 ** t))
+        elif kind == 2:
+            signal = base + np.where(t >= rng.integers(3, length), rng.normal(0, 0.2) * base, 0.0)
+        else:
+            signal = base + np.cumsum(rng.normal(0, 0.03 * base, length))
+        y = np.abs(signal + rng.normal(0, 0.02 * base, length))
+        ds = np.array([f"{start + k}-01-01" for k in range(length)], dtype="datetime64[D]")
+        series.append({"key": f"synthetic|{i}", "ds": ds, "y": y})
+    return series
+
+
+def database_series(source: str) -> list:
+    from database.db_connection import get_session
+    from ml.pipelines.forecast import extract_series, split_series
+
+    db = get_session("serving")
+    try:
+        return [s for s in split_series(extract_series(db)) if s["source"] == source]
+    finally:
+        db.close()
+
+
+def holdout_split(series, holdout: int, freq: str) -> list:
+    """(key, train ds, train y, test column offsets, test y) for series long enough to hold out `holdout` points."""
+    splits = []
+    for s in series:
+        if len(s["y"]) < MIN_POINTS + holdout:
+            continue
+        ordinals = baseline.period_ordinals(s["ds"], freq)
+        offsets = ordinals[-holdout:] - ordinals[-holdout - 1] - 1
+        splits.append((s["key"], s["ds"][:-holdout], s["y"][:-holdout], offsets, s["y"][-holdout:]))
+    return splits
+
+
+def run_baseline(engine, splits, freq, horizon):
+    start = time.perf_counter()
+    fit, _ = baseline.forecast_matrix(
+        engine, [s[1] for s in splits], [s[2] for s in splits], freq, horizon, INTERVAL_WIDTH
+    )
+    return time.perf_counter() - start, fit["yhat"], fit["yhat_lower"], fit["yhat_upper"]
+
+
+def run_prophet(splits, freq, horizon, sample):
+    """Prophet over the series at positions `sample`; other rows stay NaN."""
+    yhat, lower, upper = (np.full((len(splits), horizon), np.nan) for _ in range(3))
+    start = time.perf_counter()
+    for i in sample:
+        _, forecast = fit_prophet(splits[i][1], splits[i][2], freq, horizon)
+        yhat[i], lower[i], upper[i] = (forecast[c].to_numpy() for c in ("yhat", "yhat_lower", "yhat_upper"))
+    return time.perf_counter() - start, yhat, lower, upper
+
+
+def score(splits, yhat, lower, upper) -> pd.DataFrame:
+    """Per-series MASE, sMAPE (%) and interval coverage of one engine's forecasts."""
+    rows = []
+    for i, (key, _, train_y, offsets, test_y) in enumerate(splits):
+        predicted = yhat[i, offsets]
+        absolute = np.abs(test_y - predicted)
+        scale = np.mean(np.abs(np.diff(train_y)))
+        denominator = np.abs(test_y) + np.abs(predicted)
+        rows.append({
+            "key": key,
+            "mase": absolute.mean() / scale if scale > 0 else np.nan,
+            "smape": 200 * np.mean(np.divide(absolute, denominator, out=np.zeros_like(absolute), where=denominator > 0)),
+            "coverage": np.mean((test_y >= lower[i, offsets]) & (test_y <= upper[i, offsets])),
+        })
+    return pd.DataFrame(rows)
+
+
+def pick_engines(scores: dict, cost_ms: dict, tolerance: float) -> pd.Series:
+    """Per series: the cheapest engine whose MASE is within (1 + tolerance) x the best MASE."""
+    mase = pd.DataFrame({engine: frame["mase"].to_numpy() for engine, frame in scores.items()})
+    good_enough = mase.le(mase.min(axis=1) * (1 + tolerance), axis=0)
+    by_cost = sorted(mase.columns, key=lambda engine: cost_ms[engine])
+    return good_enough[by_cost].idxmax(axis=1).where(good_enough.any(axis=1))
+
+
+def run(series, source="indicator", holdout=None, prophet_series=200, tolerance=0.1, seed=0):
+    freq, default_holdout = FREQUENCIES[source]
+    holdout = holdout or default_holdout
+    splits = holdout_split(series, holdout, freq)
+    if not splits:
+        print(f"No series with at least {MIN_POINTS + holdout} points")
+        return None
+    horizon = int(max(s[3].max() for s in splits)) + 1
+    print(f"{len(splits):,} series, holdout {holdout} periods")
+
+    forecasts = {engine: run_baseline(engine, splits, freq, horizon) for engine in baseline.ENGINES}
+    evaluated = {engine: np.arange(len(splits)) for engine in baseline.ENGINES}
+    if Prophet is not None and prophet_series > 0:
+        rng = np.random.default_rng(seed)
+        sample = np.sort(rng.choice(len(splits), min(prophet_series, len(splits)), replace=False))
+        forecasts["prophet"] = run_prophet(splits, freq, horizon, sample)
+        evaluated["prophet"] = sample
+    else:
+        print("prophet not installed (or --prophet-series 0): comparing the NumPy engines only")
+
+    scores, cost_ms = {}, {}
+    print(f"{'engine':<10}{'series':>8}{'fit s':>10}{'ms/series':>11}{'MASE med':>10}{'sMAPE %':>9}{'coverage':>10}")
+    for engine, (seconds, yhat, lower, upper) in forecasts.items():
+        scores[engine] = score(splits, yhat, lower, upper)
+        cost_ms[engine] = seconds * 1000.0 / len(evaluated[engine])
+        fitted = scores[engine].iloc[evaluated[engine]]
+        print(f"{engine:<10}{len(fitted):>8,}{seconds:>10.3f}{cost_ms[engine]:>11.4f}"
+              f"{fitted['mase'].median():>10.3f}{fitted['smape'].mean():>9.2f}{fitted['coverage'].mean():>10.1%}")
+
+    picks = pick_engines(scores, cost_ms, tolerance)
+    print(f"Cheapest engine within {tolerance:.0%} of the best MASE, per series:")
+    for engine, count in picks.value_counts().items():
+        print(f"  {engine:<10}{count:>8,}")
+
+    table = pd.DataFrame({"key": [s[0] for s in splits], "pick": picks})
+    for engine, frame in scores.items():
+        table[f"{engine}_mase"] = frame["mase"].to_numpy()
+        table[f"{engine}_smape"] = frame["smape"].to_numpy()
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare forecasting engines on held-out data")
+    parser.add_argument("--synthetic", type=int, default=None, help="Use N synthetic annual series instead of the database")
+    parser.add_argument("--source", choices=list(FREQUENCIES), default="indicator")
+    parser.add_argument("--holdout", type=int, default=None, help="Periods held out per series (default: the forecast horizon)")
+    parser.add_argument("--prophet-series", type=int, default=200,
+                        help="Prophet is slow: fit it on a random sample of this many series")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Relative MASE slack when picking the cheaper engine")
+    parser.add_argument("--output", default=None, help="Write per-series scores and picks to this CSV")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        series, source = synthetic_series(args.synthetic), "indicator"
+    else:
+        series, source = database_series(args.source), args.source
+    table = run(series, source=source, holdout=args.holdout,
+                prophet_series=args.prophet_series, tolerance=args.tolerance)
+    if table is not None and args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Wrote {args.output}")
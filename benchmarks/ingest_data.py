@@ -0,0 +1,156 @@
+"""
+Synthetic ingest inputs shaped like data/processed/*, at 1x / 10x / 100x / 1000x.
+
+1x is about the size of today's real files (BASE_ROWS). Every kind keeps the
+column names and value formats its loader reads ("16 702 261"-style values,
+ISO epi weeks, GRID3 properties_* columns), and natural keys stay unique at
+every scale, so a merge-on-conflict loader inserts every row instead of
+skipping duplicates. Rows are generated and written in chunks, so 1000x
+files do not have to fit in memory.
+
+Usage:
+  python -m benchmarks.ingest_data                      # 1x, 10x and 100x into data/bench
+  python -m benchmarks.ingest_data --scales 1000 --kinds mortality
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from benchmarks.spatial_search import NIGERIA_BOUNDS
+
+DEFAULT_DATA_DIR = "data/bench"
+SCALES = (1, 10, 100, 1000)
+DEFAULT_SCALES = (1, 10, 100)
+CHUNK_ROWS = 200_000
+
+# 1x row counts, close to the largest real file of each kind
+BASE_ROWS = {
+    "indicator": 5_000,   # child_mortality_indicators_nga.csv: 4,701 rows
+    "mortality": 2_000,   # WHO_TOP_CAUSES_OF_DEATH_*.csv: ~2,000 rows
+    "outbreak": 35,       # cholera_adm0_public.csv: 35 countries
+    "facility": 1_000,    # GRID3 / NHFR extracts are loaded in files of this order and up
+}
+
+INDICATOR_YEARS = 35      # 1990-2024
+SEXES = [("BTSX", "Both sexes"), ("MLE", "Male"), ("FMLE", "Female")]
+MORTALITY_CAUSES = 100
+MORTALITY_COUNTRIES = 200
+STATES, LGAS, WARDS = 37, 774, 8_809
+
+
+def grouped(values: np.ndarray) -> pd.Series:
+    """WHO display values: digit groups separated by spaces ('16 702 261')."""
+    return pd.Series(values).map(lambda v: f"{v:,.0f}".replace(",", " "))
+
+
+def indicator_frame(rows: np.ndarray, rng) -> pd.DataFrame:
+    code, year, sex = rows // (INDICATOR_YEARS * 3), 1990 + (rows // 3) % INDICATOR_YEARS, rows % 3
+    numeric = rng.lognormal(8, 2, len(rows)).round(2)
+    return pd.DataFrame({
+        "indicator_code": [f"BENCH_{c}" for c in code],
+        "indicator_name": [f"Synthetic indicator {c}" for c in code],
+        "year": year,
+        "start_year": year,
+        "end_year": year,
+        "dimension_type": "Sex",
+        "dimension_code": np.array([s[0] for s in SEXES])[sex],
+        "dimension_name": np.array([s[1] for s in SEXES])[sex],
+        "numeric": numeric,
+        "value": grouped(numeric),
+    })
+
+
+def mortality_frame(rows: np.ndarray, rng) -> pd.DataFrame:
+    cause = rows % MORTALITY_CAUSES
+    country = (rows // MORTALITY_CAUSES) % MORTALITY_COUNTRIES
+    year = 2000 + rows // (MORTALITY_CAUSES * MORTALITY_COUNTRIES)
+    return pd.DataFrame({
+        "country_code": [f"C{c:02d}" for c in country],
+        "year": year,
+        "diseases": [f"synthetic cause {c}" for c in cause],
+        "sex": "MLE",
+        "death_rate": rng.gamma(1.5, 20, len(rows)).round(2),
+    })
+
+
+def outbreak_frame(rows: np.ndarray, rng) -> pd.DataFrame:
+    first = np.datetime64("2020-01-06") + (rows % 260) * 7
+    last = first + rng.integers(1, 52, len(rows)) * 7
+    cases = rng.integers(10, 200_000, len(rows))
+    return pd.DataFrame({
+        "country_name": [f"COUNTRY {r % 250}" for r in rows],
+        "region": "African Region",
+        "country_code": [f"C{r % 250:02d}" for r in rows],
+        "first_epiwk": pd.to_datetime(first).strftime("%Y-%m-%d"),
+        "last_epiwk": pd.to_datetime(last).strftime("%Y-%m-%d"),
+        "case_total": cases,
+        "death_total": (cases * rng.uniform(0, 0.03, len(rows))).astype(np.int64),
+    })
+
+
+def facility_frame(rows: np.ndarray, rng) -> pd.DataFrame:
+    ward = rows % WARDS
+    lga = ward % LGAS
+    state = lga % STATES
+    lat_min, lat_max, lon_min, lon_max = NIGERIA_BOUNDS
+    return pd.DataFrame({
+        "properties_name": [f"Synthetic Health Post {r}" for r in rows],
+        "properties_type": np.where(rows % 10 == 0, "Secondary", "Primary"),
+        "properties_category": "Primary Health Center",
+        "ownership": np.where(rows % 3 == 0, "Private", "Public"),
+        "properties_functional_status": np.where(rows % 7 == 0, "Not Functional", "Functional"),
+        "properties_state_name": [f"State {s}" for s in state],
+        "properties_state_code": [f"S{s:02d}" for s in state],
+        "properties_lga_name": [f"LGA {g}" for g in lga],
+        "properties_ward_name": [f"Ward {w}" for w in ward],
+        "properties_ward_code": [f"W{w:05d}" for w in ward],
+        "latitude": rng.uniform(lat_min, lat_max, len(rows)).round(6),
+        "longitude": rng.uniform(lon_min, lon_max, len(rows)).round(6),
+    })
+
+
+GENERATORS = {
+    "indicator": indicator_frame,
+    "mortality": mortality_frame,
+    "outbreak": outbreak_frame,
+    "facility": facility_frame,
+}
+
+
+def bench_path(data_dir, kind: str, scale: int) -> Path:
+    return Path(data_dir) / f"{scale}x" / f"{kind}.csv"
+
+
+def generate(kind: str, scale: int, data_dir=DEFAULT_DATA_DIR, seed: int = 0, force: bool = False) -> Path:
+    """Write (or reuse) the `kind` file at `scale`; returns its path."""
+    path = bench_path(data_dir, kind, scale)
+    if path.exists() and not force:
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    total = BASE_ROWS[kind] * scale
+    start = time.perf_counter()
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    for offset in range(0, total, CHUNK_ROWS):
+        rows = np.arange(offset, min(offset + CHUNK_ROWS, total))
+        GENERATORS[kind](rows, rng).to_csv(tmp_path, mode="a" if offset else "w", header=offset == 0, index=False)
+    os.replace(tmp_path, path)
+    print(f"Generated {path}: {total:,} rows in {time.perf_counter() - start:.2f}s")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic ingest benchmark inputs")
+    parser.add_argument("--scales", type=int, nargs="+", choices=SCALES, default=list(DEFAULT_SCALES))
+    parser.add_argument("--kinds", nargs="+", choices=list(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="Regenerate files that already exist")
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        for kind in args.kinds:
+            generate(kind, scale, args.data_dir, seed=args.seed, force=args.force)
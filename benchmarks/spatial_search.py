@@ -0,0 +1,121 @@
+"""
+Benchmark facility radius / nearest-neighbour search.
+
+Compares, over the same random query points:
+  - brute force: vectorized haversine against every facility
+  - grid: analytics.facility_search.FacilityGridIndex (in-process)
+  - postgis: ST_DWithin / <-> KNN on the GiST-indexed location column
+
+Usage:
+  python -m benchmarks.spatial_search                      # national facility set from the database
+  python -m benchmarks.spatial_search --synthetic 40000    # no database: clustered synthetic facilities
+"""
+import argparse
+import time
+import numpy as np
+from analytics.facility_search import FacilityGridIndex, facilities_within_radius, nearest_facilities
+from analytics.geo_math import haversine_km
+
+# Nigeria's bounding box (lat_min, lat_max, lon_min, lon_max)
+NIGERIA_BOUNDS = (4.2, 13.9, 2.7, 14.7)
+
+
+def synthetic_facilities(n: int, seed: int = 0):
+    """Facilities clustered around random 'towns' inside Nigeria's bounding box."""
+    rng = np.random.default_rng(seed)
+    lat_min, lat_max, lon_min, lon_max = NIGERIA_BOUNDS
+    towns = max(n // 50, 1)
+    town_lat = rng.uniform(lat_min, lat_max, towns)
+    town_lon = rng.uniform(lon_min, lon_max, towns)
+    which = rng.integers(0, towns, n)
+    lat = np.clip(town_lat[which] + rng.normal(0, 0.15, n), lat_min, lat_max)
+    lon = np.clip(town_lon[which] + rng.normal(0, 0.15, n), lon_min, lon_max)
+    return np.arange(1, n + 1), lat, lon
+
+
+def database_facilities(db):
+    index = FacilityGridIndex.from_database(db)
+    return index.ids, index.lat, index.lon
+
+
+def query_points(n: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    lat_min, lat_max, lon_min, lon_max = NIGERIA_BOUNDS
+    return rng.uniform(lat_min, lat_max, n), rng.uniform(lon_min, lon_max, n)
+
+
+def time_queries(search, q_lat, q_lon):
+    """Per-query latencies in milliseconds."""
+    latencies = np.empty(len(q_lat))
+    for i, (lat, lon) in enumerate(zip(q_lat, q_lon)):
+        start = time.perf_counter()
+        search(lat, lon)
+        latencies[i] = (time.perf_counter() - start) * 1000.0
+    return latencies
+
+
+def brute_force_within(lat_all, lon_all, lat, lon, radius_km):
+    distances = haversine_km(lat, lon, lat_all, lon_all)
+    return np.flatnonzero(distances <= radius_km)
+
+
+def brute_force_nearest(lat_all, lon_all, lat, lon, k):
+    distances = haversine_km(lat, lon, lat_all, lon_all)
+    return np.argpartition(distances, min(k, len(distances) - 1))[:k]
+
+
+def report(name, latencies):
+    print(f"  {name:<22} mean {latencies.mean():8.3f} ms   p95 {np.percentile(latencies, 95):8.3f} ms")
+    return {"mean_ms": float(latencies.mean()), "p95_ms": float(np.percentile(latencies, 95))}
+
+
+def run(ids, lat, lon, queries=1000, radius_km=10.0, k=5, cell_deg=0.1, db=None):
+    results = {"facilities": int(len(ids)), "queries": queries}
+    q_lat, q_lon = query_points(queries)
+
+    start = time.perf_counter()
+    index = FacilityGridIndex(ids, lat, lon, cell_deg=cell_deg)
+    results["grid_build_ms"] = (time.perf_counter() - start) * 1000.0
+    print(f"{len(ids):,} facilities, {queries:,} queries; grid build {results['grid_build_ms']:.1f} ms")
+
+    print(f"Radius {radius_km:g} km:")
+    results["radius_brute_force"] = report("brute force", time_queries(
+        lambda a, o: brute_force_within(lat, lon, a, o, radius_km), q_lat, q_lon))
+    results["radius_grid"] = report("grid index", time_queries(
+        lambda a, o: index.within(a, o, radius_km), q_lat, q_lon))
+    if db is not None:
+        results["radius_postgis"] = report("postgis ST_DWithin", time_queries(
+            lambda a, o: facilities_within_radius(db, a, o, radius_km), q_lat, q_lon))
+
+    print(f"{k} nearest:")
+    results["knn_brute_force"] = report("brute force", time_queries(
+        lambda a, o: brute_force_nearest(lat, lon, a, o, k), q_lat, q_lon))
+    results["knn_grid"] = report("grid index", time_queries(
+        lambda a, o: index.nearest(a, o, k), q_lat, q_lon))
+    if db is not None:
+        results["knn_postgis"] = report("postgis <-> KNN", time_queries(
+            lambda a, o: nearest_facilities(db, a, o, k), q_lat, q_lon))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark facility radius / KNN search")
+    parser.add_argument("--synthetic", type=int, default=None,
+                        help="Use N synthetic facilities instead of health_facilities_master (skips PostGIS)")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--radius-km", type=float, default=10.0)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--cell-deg", type=float, default=0.1)
+    args = parser.parse_args()
+
+    options = dict(queries=args.queries, radius_km=args.radius_km, k=args.k, cell_deg=args.cell_deg)
+    if args.synthetic:
+        run(*synthetic_facilities(args.synthetic), **options)
+    else:
+        from database.db_connection import get_session
+
+        db = get_session("serving")
+        try:
+            run(*database_facilities(db), db=db, **options)
+        finally:
+            db.close()
@@ -1,11 +1,18 @@
 import pandas as pd
 import numpy as np
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text
 from pathlib import Path
 import logging
 import json
+import re
+import time
 from datetime import datetime
-from database.db_connection import engine
+from pandas.tseries.api import guess_datetime_format
+from database.db_connection import get_engine
+from etl.bulk_copy import copy_dataframe, quote_ident
+from etl.manifest import DEFAULT_MANIFEST_PATH, LoadManifest
+from etl.normalize import DIGIT_SEPARATOR, GROUPED_NUMBER, drop_hashtag_rows
+from etl.sources import as_source, list_sources, open_source, rewind, source_name
 
 # Setup logging
 logging.basicConfig(
@@ -14,12 +21,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)  
 
+# Bulk loads use the ingest engine profile (no SQL echo, large insert batches)
+engine = get_engine('ingest')
+
 # Configuration for table naming and CSV processing
 CONFIG = {
     'csv_directory': './raw',
     'table_prefix': '',  # Optional prefix for all tables
-    'if_exists': 'replace',  # 'fail', 'replace', or 'append'
+    'if_exists': 'replace',  # 'fail', 'replace', 'append', or 'sync' (row-level delta)
     'chunksize': 1000,
+    'load_method': 'insert',  # 'insert' (to_sql multi-row INSERT) or 'copy' (COPY FROM STDIN via staging table)
+    'copy_chunksize': 50000,  # Rows per COPY buffer
+    'stream_chunksize': None,  # Read/clean/write in chunks of this many rows (None loads whole files)
+    'row_hash_column': '_row_hash',  # Per-row content hash stored by sync mode
+    'manifest_file': DEFAULT_MANIFEST_PATH,  # Content-hash manifest of loaded files (None disables skipping)
+    'schema_cache_dir': 'data/.schema_cache',  # Inferred per-file schemas (None disables caching)
+    'refresh_schema': False,  # Re-infer schemas even when a cached one matches the header
     'date_columns_pattern': ['date', 'epiwk', 'time', 'created', 'updated'],  # Auto-detect date columns
 }
 
@@ -30,9 +47,9 @@ def sanitize_table_name(filename):
     Rules:
     - Lowercase
     - Replace spaces and special chars with underscores
-    - Remove file extension
+    - Remove file extension (and a .gz suffix)
     """
-    name = Path(filename).stem.lower()
+    name = Path(source_name(filename)).stem.lower()
     name = ''.join(c if c.isalnum() else '_' for c in name)
     name = '_'.join(filter(None, name.split('_')))  # Remove consecutive underscores
     
@@ -59,41 +76,186 @@ def detect_date_columns(df):
         # Check if data looks like dates
         if df[col].dtype == 'object':
             sample = df[col].dropna().head(100)
-            if len(sample) > 0:
-                try:
-                    pd.to_datetime(sample, errors='coerce')
-                    non_null_ratio = sample.notna().sum() / len(sample)
-                    if non_null_ratio > 0.8:  # 80% successfully parsed
-                        date_cols.append(col)
-                except:
-                    pass
+            if len(sample) > 0 and date_parse_ratio(sample, detect_date_format(sample)) > 0.8:
+                date_cols.append(col)  # 80% successfully parsed
     
     return date_cols
 
-def clean_dataframe(df, csv_name):
+def detect_date_format(sample):
+    """strftime format of the sample's dates if one format fits them, else None"""
+    sample = sample.dropna().astype(str).head(100)
+    if len(sample) == 0:
+        return None
+    fmt = guess_datetime_format(sample.iloc[0])
+    if fmt and date_parse_ratio(sample, fmt) > 0.8:
+        return fmt
+    return None
+
+# Bare years ('2015') parse as dates with format='mixed' but are numbers
+BARE_YEAR = re.compile(r'\d{4}')
+
+def date_parse_ratio(sample, fmt=None):
+    """Share of the sample that parses as a date (with `fmt`, or element by element); bare years never count"""
+    sample = sample.astype(str)
+    try:
+        parsed = pd.to_datetime(sample, format=fmt or 'mixed', errors='coerce')
+    except (ValueError, TypeError):
+        return 0.0
+    return (parsed.notna() & ~sample.str.fullmatch(BARE_YEAR)).sum() / len(sample)
+
+def looks_like_numbers(series):
+    """True if every value of a text column is a plain or digit-grouped number"""
+    values = series.dropna().astype(str)
+    return len(values) > 0 and bool(values.str.fullmatch(GROUPED_NUMBER).all())
+
+def infer_schema(df):
     """
-    Generic cleaning for any CSV file
+    Decide once how each (whitespace-cleaned) column should be parsed
+
+    Kinds:
+        datetime: parsed with an explicit strftime 'format' when one fits
+        numeric_text: numbers stored as text, e.g. digit-grouped '16 702 261'
+        text: kept as strings
+        native: pandas already read it with a concrete 'dtype'
+    """
+    schema = {}
+    date_cols = set(detect_date_columns(df))
+    for col in df.columns:
+        series = df[col]
+        if col in date_cols:
+            schema[col] = {'kind': 'datetime', 'format': detect_date_format(series)}
+        elif series.dtype == 'object':
+            # Number columns read as text: digit-grouped, or left as text by a dropped hashtag row
+            schema[col] = {'kind': 'numeric_text' if looks_like_numbers(series) else 'text'}
+        elif pd.api.types.is_integer_dtype(series):
+            schema[col] = {'kind': 'native', 'dtype': 'Int64'}  # Nullable, so later NaNs still parse
+        else:
+            schema[col] = {'kind': 'native', 'dtype': str(series.dtype)}
+    return schema
+
+def apply_schema(df, schema):
+    """Convert date and digit-grouped columns according to an inferred schema"""
+    for col, spec in schema.items():
+        if spec['kind'] == 'datetime':
+            df[col] = pd.to_datetime(df[col], format=spec['format'] or 'mixed', errors='coerce')
+        elif spec['kind'] == 'numeric_text':
+            df[col] = pd.to_numeric(df[col].astype(str).str.replace(DIGIT_SEPARATOR, '', regex=True), errors='coerce')
+    return df
+
+def read_dtypes(schema, header):
+    """read_csv dtype mapping (keyed by raw header names) for a cached schema"""
+    dtypes = {}
+    for raw in header:
+        spec = schema[raw.strip()]
+        dtypes[raw] = spec['dtype'] if spec['kind'] == 'native' else str
+    return dtypes
+
+def schema_cache_path(csv_path):
+    return Path(CONFIG['schema_cache_dir']) / f"{sanitize_table_name(csv_path)}.json"
+
+def read_csv_header(csv_path):
+    with open_source(csv_path) as handle:
+        return list(pd.read_csv(handle, nrows=0).columns)
+
+def load_cached_schema(csv_path, header):
+    """Cached schema for this file if it was inferred for the same header, else None"""
+    if not CONFIG['schema_cache_dir'] or CONFIG['refresh_schema']:
+        return None
+    path = schema_cache_path(csv_path)
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        cached = json.load(f)
+    if cached.get('columns') != [c.strip() for c in header]:
+        logger.info("  Header changed since schema was cached, re-inferring")
+        return None
+    return cached['schema']
+
+def save_schema(csv_path, schema):
+    if not CONFIG['schema_cache_dir']:
+        return
+    path = schema_cache_path(csv_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'source': as_source(csv_path).name,
+            'columns': list(schema),
+            'schema': schema,
+            'inferred_at': datetime.utcnow().isoformat(timespec='seconds'),
+        }, f, indent=2)
+
+def read_csv_with_schema(csv_path, handle, **kwargs):
+    """
+    read_csv using the cached schema's explicit dtypes when there is one
+
+    `handle` is what open_source(csv_path) yielded; it must stay open while a
+    chunk iterator is consumed. Returns (DataFrame or chunk iterator, schema or None).
+    A cached schema that no longer fits the data (e.g. text in an integer column) is discarded.
+    With `chunksize` only the schema's date and digit-grouped conversions are reused, not its dtypes.
+    """
+    header = read_csv_header(csv_path)
+    schema = load_cached_schema(csv_path, header)
+    if schema is not None and 'chunksize' in kwargs:
+        # Chunks are parsed lazily, so a stale dtype would only fail mid-load; the streaming
+        # path reads native dtypes per chunk and conform_chunk widens the staging columns instead
+        return pd.read_csv(handle, **kwargs), schema
+    if schema is not None:
+        try:
+            return pd.read_csv(handle, dtype=read_dtypes(schema, header), **kwargs), schema
+        except (ValueError, TypeError) as e:
+            logger.info(f"  Cached schema no longer fits ({e}), re-inferring")
+            rewind(handle)
+    return pd.read_csv(handle, **kwargs), None
+
+def clean_columns(df, schema=None):
+    """
+    Column-by-column value cleaning, shared by the whole-file and streaming paths
+
+    Works on one column at a time so no full-frame copies are made.
+    Column types are inferred unless `schema` is given (cached, or from the first chunk).
+    Returns (df, schema).
     """
-    logger.info(f"  Original shape: {df.shape}")
-    
     # Strip whitespace from column names
     df.columns = df.columns.str.strip()
     
     # Strip whitespace from string columns
     for col in df.select_dtypes(include=['object']).columns:
-        df[col] = df[col].astype(str).str.strip()
         # Replace string 'nan', 'None', empty strings with actual NaN
-        df[col] = df[col].replace(['nan', 'None', 'NaN', ''], np.nan)
-    
-    # Handle Inf/-Inf values across all numeric columns
-    df = df.replace([np.inf, -np.inf], np.nan)
+        df[col] = df[col].astype(str).str.strip().replace(['nan', 'None', 'NaN', ''], np.nan)
+    
+    # HDX files carry a hashtag row under the header; it is metadata, not data, and
+    # left in it turns every column into text and hides numbers and years
+    rows = len(df)
+    df = drop_hashtag_rows(df)
+    if len(df) < rows:
+        logger.info(f"  Dropped {rows - len(df)} HDX hashtag rows")
+    
+    # Handle Inf/-Inf values (only float columns can hold them)
+    for col in df.select_dtypes(include=['float']).columns:
+        infinite = np.isinf(df[col].to_numpy())
+        if infinite.any():
+            df.loc[infinite, col] = np.nan
+    
+    # Infer column types once, then convert date and digit-grouped columns
+    if schema is None:
+        schema = infer_schema(df)
+    df = apply_schema(df, schema)
+    
+    return df, schema
+
+def clean_dataframe(df, csv_name, schema=None):
+    """
+    Generic cleaning for any CSV file
+
+    Returns (df, schema); pass a cached schema to skip type inference.
+    """
+    logger.info(f"  Original shape: {df.shape}")
     
-    # Auto-detect and convert date columns
-    date_cols = detect_date_columns(df)
+    inferred = schema is None
+    df, schema = clean_columns(df, schema)
+    date_cols = [col for col, spec in schema.items() if spec['kind'] == 'datetime']
     if date_cols:
-        logger.info(f"  Detected date columns: {date_cols}")
-        for col in date_cols:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
+        logger.info(f"  {'Detected' if inferred else 'Cached'} date columns: {date_cols}")
     
     # Remove completely duplicate rows
     initial_rows = len(df)
@@ -103,7 +265,7 @@ def clean_dataframe(df, csv_name):
     
     logger.info(f"  Cleaned shape: {df.shape}")
     
-    return df
+    return df, schema
 
 def get_table_info(table_name):
     """Get information about existing table"""
@@ -118,16 +280,296 @@ def get_table_info(table_name):
         }
     return {'exists': False}
 
-def load_csv_to_db(csv_path, table_name=None, if_exists=None):
+def staging_table_name(table_name):
+    """Name of the scratch table used while COPY-loading `table_name`"""
+    # PostgreSQL truncates identifiers at 63 characters
+    return f"{table_name[:50]}__staging"
+
+def copy_to_table(df, table_name, if_exists):
+    """
+    Load a DataFrame with COPY FROM STDIN into a staging table, then swap it in
+
+    The staging table is created with the same column types to_sql would use.
+    Everything runs in one transaction, so readers never see a half-loaded
+    table and a failure leaves the target untouched.
+
+    if_exists follows to_sql semantics:
+        fail: raise if the target table exists
+        replace: drop the target and rename the staging table into its place
+        append: INSERT ... SELECT from staging into the existing target
+    """
+    exists = inspect(engine).has_table(table_name)
+    if exists and if_exists == 'fail':
+        raise ValueError(f"Table '{table_name}' already exists.")
+
+    staging = staging_table_name(table_name)
+
+    with engine.begin() as conn:
+        df.head(0).to_sql(name=staging, con=conn, if_exists='replace', index=False)
+
+        cursor = conn.connection.cursor()
+        try:
+            rows = copy_dataframe(cursor, df, staging, chunksize=CONFIG['copy_chunksize'])
+        finally:
+            cursor.close()
+
+        swap_in_staging(conn, staging, table_name, df.columns, exists, if_exists)
+
+    return rows
+
+def swap_in_staging(conn, staging, table_name, columns, exists, if_exists):
+    """Append the staging table into the target, or rename it into the target's place"""
+    columns = ", ".join(quote_ident(c) for c in columns)
+
+    if exists and if_exists == 'append':
+        conn.execute(text(
+            f"INSERT INTO {quote_ident(table_name)} ({columns}) "
+            f"SELECT {columns} FROM {quote_ident(staging)}"
+        ))
+        conn.execute(text(f"DROP TABLE {quote_ident(staging)}"))
+    else:
+        if exists:
+            conn.execute(text(f"DROP TABLE {quote_ident(table_name)}"))
+        conn.execute(text(
+            f"ALTER TABLE {quote_ident(staging)} RENAME TO {quote_ident(table_name)}"
+        ))
+
+# Column kinds tracked while streaming, and the PostgreSQL type each widens to
+WIDER_COLUMN_TYPE = {
+    'integer': ('float', 'DOUBLE PRECISION'),
+    'float': ('text', 'TEXT'),
+    'bool': ('text', 'TEXT'),
+    'datetime': ('text', 'TEXT'),
+}
+
+def column_kind(series):
+    """Streaming schema kind of a cleaned column"""
+    if pd.api.types.is_bool_dtype(series):
+        return 'bool'
+    if pd.api.types.is_integer_dtype(series):
+        return 'integer'
+    if pd.api.types.is_float_dtype(series):
+        return 'float'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+    return 'text'
+
+def conform_chunk(chunk, schema, conn, staging):
+    """
+    Cast a later chunk to the column kinds established by earlier chunks
+
+    If a chunk holds values the staging column cannot take (e.g. text in a
+    numeric column), the staging column is widened in place with ALTER TABLE
+    and the schema updated, instead of silently dropping values.
+    """
+    for col, kind in schema.items():
+        series = chunk[col]
+        while kind != 'text':
+            if kind in ('integer', 'float') and not pd.api.types.is_bool_dtype(series):
+                values = pd.to_numeric(series, errors='coerce')
+                lossless = not (values.isna() & series.notna()).any()
+                if lossless and kind == 'integer' and (values.dropna() % 1 == 0).all():
+                    chunk[col] = values.astype('Int64')
+                    break
+                if lossless and kind == 'float':
+                    chunk[col] = values.astype(float)
+                    break
+            elif kind == column_kind(series):
+                break
+
+            kind, sql_type = WIDER_COLUMN_TYPE[kind]
+            conn.execute(text(
+                f"ALTER TABLE {quote_ident(staging)} ALTER COLUMN {quote_ident(col)} TYPE {sql_type}"
+            ))
+            logger.info(f"  Widened column '{col}' to {sql_type}")
+        schema[col] = kind
+    return chunk
+
+class RowHashSet:
+    """
+    Distinct 64-bit row hashes seen so far, kept as a few sorted runs
+
+    Each chunk's new hashes become a sorted run of their own; whenever a run
+    is at least as long as the one before it the two are merged with
+    np.union1d. Runs therefore shrink geometrically (O(log n) of them), every
+    hash is copied O(log n) times in total, and memory stays at 8 bytes per
+    distinct row, instead of np.insert copying the whole array for every chunk.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+    def add_new(self, hashes):
+        """Add `hashes`; returns a mask of those not seen before (first occurrence only)"""
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        for run in self.runs:
+            positions = np.searchsorted(run, hashes).clip(max=len(run) - 1)
+            keep &= run[positions] != hashes
+        if keep.any():
+            self.runs.append(np.sort(hashes[keep]))
+            while len(self.runs) > 1 and len(self.runs[-2]) <= len(self.runs[-1]):
+                newest = self.runs.pop()
+                self.runs[-1] = np.union1d(self.runs[-1], newest)
+        return keep
+
+def stream_csv_to_table(csv_path, table_name, if_exists, chunksize):
+    """
+    Read, clean, dedupe and COPY a CSV chunk by chunk into a staging table, then swap it in
+
+    Peak memory is bounded by `chunksize` rows: chunks are cleaned and written
+    one at a time. Duplicate rows are dropped across the whole file with a
+    RowHashSet of row hashes, the only state kept between chunks
+    (8 bytes per distinct row). The parse schema comes from the cache or is
+    inferred on the first chunk; later chunks are cast to the first chunk's
+    column types, widening a column when they would otherwise lose values.
+
+    Returns (rows_read, rows_written).
+    """
+    exists = inspect(engine).has_table(table_name)
+    if exists and if_exists == 'fail':
+        raise ValueError(f"Table '{table_name}' already exists.")
+
+    staging = staging_table_name(table_name)
+    seen = RowHashSet()
+    schema = None
+    rows_read = rows_written = 0
+
+    with open_source(csv_path) as handle, engine.begin() as conn:
+        chunks, parse_schema = read_csv_with_schema(csv_path, handle, chunksize=chunksize)
+        cached = parse_schema is not None
+
+        cursor = conn.connection.cursor()
+        try:
+            for chunk in chunks:
+                rows_read += len(chunk)
+                chunk, parse_schema = clean_columns(chunk, parse_schema)
+
+                if schema is None:
+                    chunk.head(0).to_sql(name=staging, con=conn, if_exists='replace', index=False)
+                    schema = {col: column_kind(chunk[col]) for col in chunk.columns}
+                    date_cols = [col for col, spec in parse_schema.items() if spec['kind'] == 'datetime']
+                    if date_cols:
+                        logger.info(f"  {'Cached' if cached else 'Detected'} date columns: {date_cols}")
+                else:
+                    chunk = conform_chunk(chunk, schema, conn, staging)
+
+                # Drop rows already seen in this or an earlier chunk
+                chunk = chunk[seen.add_new(pd.util.hash_pandas_object(chunk, index=False).to_numpy())]
+
+                rows_written += copy_dataframe(cursor, chunk, staging, chunksize=CONFIG['copy_chunksize'])
+        finally:
+            cursor.close()
+
+        if schema is None:
+            raise ValueError(f"No rows or header found in {csv_path}")
+
+        swap_in_staging(conn, staging, table_name, list(schema), exists, if_exists)
+
+    if not cached:
+        save_schema(csv_path, parse_schema)
+    if rows_read > rows_written:
+        logger.info(f"  Removed {rows_read - rows_written} duplicate rows")
+    return rows_read, rows_written
+
+def add_row_hashes(df):
+    """Append a stable 64-bit content hash of each row as CONFIG['row_hash_column']"""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy().view(np.int64)
+    return df.assign(**{CONFIG['row_hash_column']: hashes})
+
+def sync_table(df, table_name):
+    """
+    Bring `table_name` in line with `df` by applying only row-level inserts and deletes
+
+    Rows are identified by a hash of their cleaned values, stored alongside them.
+    Only the stored hashes are read back; rows missing from the file are deleted
+    and new rows are COPYed in, all in one transaction. Unchanged rows (and the
+    indexes over them) are left alone, so readers are not blocked by a rewrite.
+
+    Tables without stored hashes, or whose columns no longer match the file,
+    get one full replace that stores hashes for the next sync.
+
+    Returns {'added', 'removed', 'unchanged'} row counts.
+    """
+    hash_col = CONFIG['row_hash_column']
+    df = add_row_hashes(df)
+
+    table_info = get_table_info(table_name)
+    if not table_info['exists'] or set(table_info['columns']) != set(df.columns):
+        if table_info['exists']:
+            logger.info("  Stored row hashes missing or columns changed, doing one full replace")
+        added = copy_to_table(df, table_name, 'replace')
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE INDEX {quote_ident(f'ix_{table_name[:40]}_row_hash')} "
+                f"ON {quote_ident(table_name)} ({quote_ident(hash_col)})"
+            ))
+        return {'added': added, 'removed': table_info.get('row_count', 0), 'unchanged': 0}
+
+    with engine.begin() as conn:
+        result = conn.execute(text(f"SELECT {quote_ident(hash_col)} FROM {quote_ident(table_name)}"))
+        existing = np.fromiter((row[0] for row in result), dtype=np.int64)
+
+        incoming = df[hash_col].to_numpy()
+        new_rows = df[~np.isin(incoming, existing)]
+        removed = np.unique(existing[~np.isin(existing, incoming)])
+
+        cursor = conn.connection.cursor()
+        try:
+            if len(removed):
+                conn.execute(text("CREATE TEMP TABLE sync_removed (row_hash BIGINT) ON COMMIT DROP"))
+                copy_dataframe(cursor, pd.DataFrame({'row_hash': removed}), 'sync_removed')
+                deleted = conn.execute(text(
+                    f"DELETE FROM {quote_ident(table_name)} AS t USING sync_removed AS r "
+                    f"WHERE t.{quote_ident(hash_col)} = r.row_hash"
+                )).rowcount
+            else:
+                deleted = 0
+            added = copy_dataframe(cursor, new_rows, table_name, chunksize=CONFIG['copy_chunksize'])
+        finally:
+            cursor.close()
+
+    return {'added': added, 'removed': deleted, 'unchanged': len(df) - added}
+
+def write_dataframe(df, table_name, if_exists, method=None):
+    """Write a cleaned DataFrame with the configured load method, returns rows written"""
+    method = method or CONFIG['load_method']
+
+    if method == 'copy':
+        return copy_to_table(df, table_name, if_exists)
+
+    df.to_sql(
+        name=table_name,
+        con=engine,
+        if_exists=if_exists,
+        index=False,
+        method='multi',
+        chunksize=CONFIG['chunksize']
+    )
+    return len(df)
+
+def format_rate(rows, seconds):
+    """Human readable throughput for log lines"""
+    rate = rows / seconds if seconds > 0 else 0
+    return f"{rows:,} rows in {seconds:.2f}s ({rate:,.0f} rows/sec)"
+
+def load_csv_to_db(csv_path, table_name=None, if_exists=None, method=None, stats=None):
     """
     Load a single CSV file into database with automatic schema detection
-    
+
     Args:
-        csv_path: Path to CSV file
+        csv_path: Path to a CSV file, a .csv.gz file, or an 'archive.zip::member.csv' archive member
         table_name: Custom table name (optional, auto-generated from filename)
-        if_exists: 'fail', 'replace', or 'append'
+        if_exists: 'fail', 'replace', 'append', or 'sync'
+        method: 'insert' or 'copy' (defaults to CONFIG['load_method'])
+        stats: Optional dict; 'rows' and 'seconds' of the write step are added to it
+
+    With CONFIG['stream_chunksize'] set (and if_exists other than 'sync') the file
+    is streamed chunk by chunk with bounded memory via stream_csv_to_table.
     """
-    csv_path = Path(csv_path)
+    csv_path = as_source(csv_path)
     
     if not csv_path.exists():
         logger.error(f"File not found: {csv_path}")
@@ -135,10 +577,11 @@ def load_csv_to_db(csv_path, table_name=None, if_exists=None):
     
     # Generate table name if not provided
     if table_name is None:
-        table_name = sanitize_table_name(csv_path.name)
+        table_name = sanitize_table_name(csv_path)
     
     if_exists = if_exists or CONFIG['if_exists']
-    
+    method = method or CONFIG['load_method']
+
     logger.info(f"\n{'='*60}")
     logger.info(f"Processing: {csv_path.name}")
     logger.info(f"Target table: {table_name}")
@@ -150,23 +593,19 @@ def load_csv_to_db(csv_path, table_name=None, if_exists=None):
             logger.info(f"  Table exists with {table_info['row_count']} rows")
             logger.info(f"  Action: {if_exists}")
         
-        # Load CSV
-        df = pd.read_csv(csv_path)
-        logger.info(f"  Loaded {len(df)} rows, {len(df.columns)} columns")
-        
-        # Clean data
-        df = clean_dataframe(df, csv_path.name)
-        
-        # Load to database
-        df.to_sql(
-            name=table_name,
-            con=engine,
-            if_exists=if_exists,
-            index=False,
-            method='multi',
-            chunksize=CONFIG['chunksize']
-        )
-        
+        # Stream large files chunk by chunk (sync needs the whole file to diff against)
+        if CONFIG['stream_chunksize'] and if_exists != 'sync':
+            start = time.perf_counter()
+            rows_read, rows = stream_csv_to_table(csv_path, table_name, if_exists, CONFIG['stream_chunksize'])
+            elapsed = time.perf_counter() - start
+            logger.info(f"  Streamed {rows_read:,} rows in chunks of {CONFIG['stream_chunksize']:,}; "
+                        f"wrote {format_rate(rows, elapsed)} via copy")
+            if stats is not None:
+                stats['rows'] = stats.get('rows', 0) + rows
+                stats['seconds'] = stats.get('seconds', 0.0) + elapsed
+        else:
+            rows = load_whole_file(csv_path, table_name, if_exists, method, stats)
+
         # Verify
         new_count = pd.read_sql(f"SELECT COUNT(*) FROM {table_name}", engine).iloc[0, 0]
         logger.info(f"✓ Success! Table '{table_name}' now has {new_count} rows")
@@ -177,14 +616,75 @@ def load_csv_to_db(csv_path, table_name=None, if_exists=None):
         logger.error(f"✗ Error loading {csv_path.name}: {e}")
         return False
 
-def load_all_csvs(directory=None, pattern='*.csv', mapping_file=None):
+def load_whole_file(csv_path, table_name, if_exists, method, stats):
+    """Read, clean and write a CSV in one go; returns rows written"""
+    # Load CSV (with explicit dtypes when a schema is cached for this file)
+    with open_source(csv_path) as handle:
+        df, schema = read_csv_with_schema(csv_path, handle)
+    logger.info(f"  Loaded {len(df)} rows, {len(df.columns)} columns")
+    
+    # Clean data
+    cached = schema is not None
+    df, schema = clean_dataframe(df, csv_path.name, schema)
+    if not cached:
+        save_schema(csv_path, schema)
+    
+    # Load to database
+    start = time.perf_counter()
+    if if_exists == 'sync':
+        changes = sync_table(df, table_name)
+        rows = changes['added']
+        elapsed = time.perf_counter() - start
+        logger.info(f"  Synced: {changes['added']:,} added, {changes['removed']:,} removed, "
+                    f"{changes['unchanged']:,} unchanged in {elapsed:.2f}s")
+    else:
+        changes = {}
+        rows = write_dataframe(df, table_name, if_exists, method=method)
+        elapsed = time.perf_counter() - start
+        logger.info(f"  Wrote {format_rate(rows, elapsed)} via {method}")
+
+    if stats is not None:
+        stats['rows'] = stats.get('rows', 0) + rows
+        stats['seconds'] = stats.get('seconds', 0.0) + elapsed
+        for key, value in changes.items():
+            stats[key] = stats.get(key, 0) + value
+
+    return rows
+
+def load_if_changed(csv_path, table_name=None, manifest=None, force=False, stats=None, **kwargs):
+    """
+    Load a CSV unless the manifest shows it was already loaded into the same table unchanged
+
+    Returns None when the file was skipped, otherwise the load_csv_to_db result.
+    The manifest entry is updated (in memory) after a successful load.
+    """
+    csv_path = as_source(csv_path)
+    table_name = table_name or sanitize_table_name(csv_path)
+
+    if manifest is not None and not force and manifest.is_unchanged(csv_path, table_name):
+        logger.info(f"Skipping unchanged file: {csv_path.name} -> {table_name}")
+        return None
+
+    file_stats = {}
+    loaded = load_csv_to_db(csv_path, table_name=table_name, stats=file_stats, **kwargs)
+    if loaded and manifest is not None:
+        manifest.record(csv_path, table_name, file_stats.get('rows', 0))
+
+    if stats is not None:
+        for key, value in file_stats.items():
+            stats[key] = stats.get(key, 0) + value
+    return loaded
+
+def load_all_csvs(directory=None, pattern='*.csv', mapping_file=None, method=None, force=False):
     """
-    Load all CSV files from directory
+    Load all CSV files from a directory or a .zip archive
     
     Args:
-        directory: Directory containing CSV files
-        pattern: File pattern to match (default: '*.csv')
+        directory: Directory containing CSV files (plain or .gz), or a .zip archive streamed member by member
+        pattern: File name pattern to match (default: '*.csv')
         mapping_file: Optional JSON file mapping CSV files to table names
+        method: 'insert' or 'copy' (defaults to CONFIG['load_method'])
+        force: Reload files even if the manifest shows them unchanged
     """
     directory = Path(directory or CONFIG['csv_directory'])
     
@@ -199,8 +699,8 @@ def load_all_csvs(directory=None, pattern='*.csv', mapping_file=None):
             csv_to_table = json.load(f)
         logger.info(f"Loaded table name mappings from {mapping_file}")
     
-    # Find all CSV files
-    csv_files = sorted(list(directory.glob(pattern)))
+    # Find all CSV files (or archive members)
+    csv_files = list_sources(directory, pattern)
     logger.info(f"\nFound {len(csv_files)} CSV files in {directory}")
     
     if len(csv_files) == 0:
@@ -210,16 +710,28 @@ def load_all_csvs(directory=None, pattern='*.csv', mapping_file=None):
     # Process each CSV
     results = {
         'success': [],
-        'failed': []
+        'failed': [],
+        'skipped': [],
+        'stats': {'rows': 0, 'seconds': 0.0}
     }
-    
-    for csv_file in csv_files:
-        table_name = csv_to_table.get(csv_file.name)  # Use mapping if exists
-        
-        if load_csv_to_db(csv_file, table_name=table_name):
-            results['success'].append(csv_file.name)
-        else:
-            results['failed'].append(csv_file.name)
+
+    manifest = LoadManifest(CONFIG['manifest_file']) if CONFIG['manifest_file'] else None
+
+    try:
+        for csv_file in csv_files:
+            table_name = csv_to_table.get(source_name(csv_file))  # Use mapping if exists
+
+            loaded = load_if_changed(csv_file, table_name=table_name, manifest=manifest, force=force,
+                                     method=method, stats=results['stats'])
+            if loaded is None:
+                results['skipped'].append(csv_file.name)
+            elif loaded:
+                results['success'].append(csv_file.name)
+            else:
+                results['failed'].append(csv_file.name)
+    finally:
+        if manifest is not None:
+            manifest.save()
     
     # Summary
     logger.info(f"\n{'='*60}")
@@ -227,6 +739,12 @@ def load_all_csvs(directory=None, pattern='*.csv', mapping_file=None):
     logger.info(f"{'='*60}")
     logger.info(f"✓ Successfully loaded: {len(results['success'])} files")
     logger.info(f"✗ Failed: {len(results['failed'])} files")
+    logger.info(f"↷ Skipped (unchanged): {len(results['skipped'])} files")
+    logger.info(f"Throughput ({method or CONFIG['load_method']}): "
+                f"{format_rate(results['stats']['rows'], results['stats']['seconds'])}")
+    if 'unchanged' in results['stats']:
+        logger.info(f"Sync: {results['stats']['added']:,} rows added, {results['stats']['removed']:,} removed, "
+                    f"{results['stats']['unchanged']:,} unchanged")
     
     if results['failed']:
         logger.info("\nFailed files:")
@@ -251,17 +769,17 @@ def list_all_tables():
         except Exception as e:
             logger.info(f"  {table}: Error reading - {e}")
 
-def create_mapping_template(directory=None, output_file='table_mapping.json'):
+def create_mapping_template(directory=None, output_file='table_mapping.json', pattern='*.csv'):
     """
     Create a template JSON file for custom table name mappings
     """
     directory = Path(directory or CONFIG['csv_directory'])
-    csv_files = list(directory.glob('*.csv'))
+    csv_files = list_sources(directory, pattern)
     
     mapping = {}
     for csv_file in csv_files:
-        auto_name = sanitize_table_name(csv_file.name)
-        mapping[csv_file.name] = auto_name  # You can manually edit this
+        auto_name = sanitize_table_name(csv_file)
+        mapping[source_name(csv_file)] = auto_name  # You can manually edit this
     
     with open(output_file, 'w') as f:
         json.dump(mapping, f, indent=2)
@@ -273,12 +791,25 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description='Load CSV files into PostgreSQL')
-    parser.add_argument('--dir', default='./csv_files', help='Directory containing CSV files')
-    parser.add_argument('--file', help='Load a single CSV file')
+    parser.add_argument('--dir', default='./csv_files',
+                       help='Directory containing CSV files (plain or .gz), or a .zip archive of them')
+    parser.add_argument('--pattern', default='*.csv', help='File name pattern to load from --dir')
+    parser.add_argument('--file', help="Load a single CSV file (.csv, .csv.gz or 'archive.zip::member.csv')")
     parser.add_argument('--table', help='Table name for single file')
     parser.add_argument('--mapping', help='JSON file with CSV to table name mappings')
-    parser.add_argument('--if-exists', choices=['fail', 'replace', 'append'], 
-                       default='replace', help='What to do if table exists')
+    parser.add_argument('--if-exists', choices=['fail', 'replace', 'append', 'sync'],
+                       default='replace',
+                       help='What to do if table exists (sync applies only row-level inserts/deletes)')
+    parser.add_argument('--method', choices=['insert', 'copy'], default='insert',
+                       help='Write with multi-row INSERTs or stream with COPY into a staging table')
+    parser.add_argument('--stream-chunksize', type=int, default=None,
+                       help='Stream files in chunks of this many rows (bounded memory, COPY writes)')
+    parser.add_argument('--refresh-schema', action='store_true',
+                       help='Re-infer column types instead of using cached schemas')
+    parser.add_argument('--manifest', default=CONFIG['manifest_file'],
+                       help='Load manifest used to skip unchanged files')
+    parser.add_argument('--force', action='store_true',
+                       help='Reload files even if the manifest shows them unchanged')
     parser.add_argument('--list-tables', action='store_true', help='List all database tables')
     parser.add_argument('--create-mapping', action='store_true', 
                        help='Create table mapping template')
@@ -287,15 +818,23 @@ if __name__ == "__main__":
     
     # Update config
     CONFIG['if_exists'] = args.if_exists
+    CONFIG['load_method'] = args.method
+    CONFIG['manifest_file'] = args.manifest
+    CONFIG['stream_chunksize'] = args.stream_chunksize
+    CONFIG['refresh_schema'] = args.refresh_schema
     
     if args.list_tables:
         list_all_tables()
     elif args.create_mapping:
-        create_mapping_template(args.dir)
+        create_mapping_template(args.dir, pattern=args.pattern)
     elif args.file:
         # Load single file
-        load_csv_to_db(args.file, table_name=args.table, if_exists=args.if_exists)
+        manifest = LoadManifest(args.manifest) if args.manifest else None
+        load_if_changed(args.file, table_name=args.table, manifest=manifest, force=args.force,
+                        if_exists=args.if_exists)
+        if manifest is not None:
+            manifest.save()
     else:
         # Load all files from directory
-        load_all_csvs(directory=args.dir, mapping_file=args.mapping)
+        load_all_csvs(directory=args.dir, pattern=args.pattern, mapping_file=args.mapping, force=args.force)
         list_all_tables()
\ No newline at end of file
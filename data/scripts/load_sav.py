@@ -0,0 +1,290 @@
+import re
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect, text
+from etl.bulk_copy import copy_dataframe, quote_ident
+from etl.manifest import DEFAULT_MANIFEST_PATH, LoadManifest
+from data.scripts.load_csv import (
+    conform_chunk, engine, format_rate, logger, sanitize_table_name, staging_table_name, swap_in_staging,
+)
+
+try:
+    import pyreadstat
+except ImportError:  # optional dependency; see requirements.txt
+    pyreadstat = None
+
+# Configuration for the SPSS (.sav) survey files
+CONFIG = {
+    'sav_directory': 'data/raw/NGA_2002_PDPHCS_v01_M_SPSS',
+    'files': ['PHC.sav', 'STAFF.sav', 'LGA.sav', 'hfq-usefile.sav'],  # The authoritative survey files
+    'if_exists': 'replace',  # 'fail', 'replace' or 'append'
+    'chunksize': 10000,  # Rows read from the .sav file (and COPYed) at a time
+    'copy_chunksize': 50000,  # Rows per COPY buffer
+    'labels_table': 'spss_value_labels',  # (table_name, column_name, value, label) per labelled code
+    'variables_table': 'spss_variables',  # (table_name, column_name, position, label, spss_format) per column
+    'manifest_file': DEFAULT_MANIFEST_PATH,  # Content-hash manifest of loaded files (None disables skipping)
+}
+
+# SPSS print formats pyreadstat converts to datetimes; TIME/DTIME come back as times and are kept as text
+DATE_FORMATS = ('DATE', 'ADATE', 'EDATE', 'JDATE', 'SDATE', 'DATETIME', 'YMDHMS')
+SPSS_FORMAT = re.compile(r'([A-Z]+)(\d+)?(?:\.(\d+))?')
+
+# Empty-column dtype per kind, so to_sql creates the staging table with the right column types
+KIND_DTYPES = {'integer': 'Int64', 'float': 'float64', 'datetime': 'datetime64[ns]', 'text': 'object'}
+
+def column_kinds(meta):
+    """
+    Column kind of every variable, from the file's metadata instead of the data
+
+    SPSS stores every number as a double; the print format says what it is.
+    Numbers shown without decimals (F8, F3.0, and labelled codes) become
+    integers, dates become timestamps and strings stay text. Kinds use the
+    load_csv streaming names, so conform_chunk can cast (and if needed widen)
+    each chunk.
+    """
+    kinds = {}
+    for name in meta.column_names:
+        match = SPSS_FORMAT.match(meta.original_variable_types.get(name) or '')
+        fmt, decimals = (match.group(1), match.group(3)) if match else ('F', None)
+        if meta.readstat_variable_types.get(name) == 'string':
+            kinds[name] = 'text'
+        elif fmt in DATE_FORMATS:
+            kinds[name] = 'datetime'
+        elif fmt in ('TIME', 'DTIME'):
+            kinds[name] = 'text'
+        elif not decimals or int(decimals) == 0:
+            kinds[name] = 'integer'
+        else:
+            kinds[name] = 'float'
+    return kinds
+
+def label_value(value):
+    """Text form of a labelled code that matches `column::text` in PostgreSQL (1.0 -> '1')"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def value_label_rows(table_name, meta):
+    """One row per labelled code, instead of the label string repeated in every data row"""
+    rows = [
+        (table_name, name.lower(), label_value(value), label)
+        for name, labels in meta.variable_value_labels.items()
+        for value, label in labels.items()
+    ]
+    return pd.DataFrame(rows, columns=['table_name', 'column_name', 'value', 'label'])
+
+def variable_rows(table_name, meta):
+    """Variable labels and SPSS formats, one row per column"""
+    return pd.DataFrame({
+        'table_name': table_name,
+        'column_name': [name.lower() for name in meta.column_names],
+        'position': np.arange(1, len(meta.column_names) + 1),
+        'label': [meta.column_names_to_labels.get(name) for name in meta.column_names],
+        'spss_format': [meta.original_variable_types.get(name) for name in meta.column_names],
+    })
+
+def replace_lookup(conn, cursor, lookup_table, df, table_name):
+    """Swap one data table's rows in a shared lookup table (created on first use)"""
+    df.head(0).to_sql(name=lookup_table, con=conn, if_exists='append', index=False)
+    conn.execute(
+        text(f"DELETE FROM {quote_ident(lookup_table)} WHERE table_name = :table_name"),
+        {'table_name': table_name},
+    )
+    return copy_dataframe(cursor, df, lookup_table)
+
+def clean_chunk(chunk, kinds):
+    """Lower-case column names, blank (space-padded) strings to NULL, dates to datetime64"""
+    for col, kind in kinds.items():
+        if kind == 'text':
+            values = chunk[col].astype('string').str.strip()
+            chunk[col] = values.mask(values == '').astype(object)
+        elif kind == 'datetime':
+            chunk[col] = pd.to_datetime(chunk[col], errors='coerce')
+    chunk.columns = [col.lower() for col in chunk.columns]
+    return chunk
+
+def stream_sav_to_table(sav_path, table_name, if_exists, chunksize):
+    """
+    Read a .sav file chunk by chunk with typed columns and COPY it into a staging table, then swap it in
+
+    Value labels are not applied: columns keep their numeric codes and the
+    labels go to CONFIG['labels_table'] once per code, next to the variable
+    labels in CONFIG['variables_table']. The data table and both lookup
+    tables are replaced in one transaction.
+
+    Returns (rows_written, labelled codes).
+    """
+    exists = inspect(engine).has_table(table_name)
+    if exists and if_exists == 'fail':
+        raise ValueError(f"Table '{table_name}' already exists.")
+
+    _, meta = pyreadstat.read_sav(str(sav_path), metadataonly=True)
+    kinds = column_kinds(meta)
+    schema = {col.lower(): kind for col, kind in kinds.items()}
+    logger.info(f"  {meta.number_rows:,} rows, {len(kinds)} columns, "
+                f"{len(meta.variable_value_labels)} with value labels")
+
+    staging = staging_table_name(table_name)
+    rows = 0
+    chunks = pyreadstat.read_file_in_chunks(
+        pyreadstat.read_sav, str(sav_path), chunksize=chunksize, dates_as_pandas_datetime=True,
+    )
+
+    with engine.begin() as conn:
+        pd.DataFrame({col: pd.Series(dtype=KIND_DTYPES[kind]) for col, kind in schema.items()}).to_sql(
+            name=staging, con=conn, if_exists='replace', index=False,
+        )
+        cursor = conn.connection.cursor()
+        try:
+            for chunk, _ in chunks:
+                chunk = conform_chunk(clean_chunk(chunk, kinds), schema, conn, staging)
+                rows += copy_dataframe(cursor, chunk, staging, chunksize=CONFIG['copy_chunksize'])
+
+            swap_in_staging(conn, staging, table_name, list(schema), exists, if_exists)
+
+            labels = value_label_rows(table_name, meta)
+            replace_lookup(conn, cursor, CONFIG['labels_table'], labels, table_name)
+            replace_lookup(conn, cursor, CONFIG['variables_table'], variable_rows(table_name, meta), table_name)
+        finally:
+            cursor.close()
+
+    return rows, len(labels)
+
+def load_sav_to_db(sav_path, table_name=None, if_exists=None, stats=None):
+    """
+    Load a single SPSS .sav file into the database
+
+    Args:
+        sav_path: Path to the .sav file
+        table_name: Custom table name (optional; by default the name load_csv gives the file's CSV export)
+        if_exists: 'fail', 'replace' or 'append'
+        stats: Optional dict; 'rows' and 'seconds' of the load are added to it
+    """
+    sav_path = Path(sav_path)
+
+    if not sav_path.exists():
+        logger.error(f"File not found: {sav_path}")
+        return False
+
+    table_name = table_name or sanitize_table_name(sav_path.name)
+    if_exists = if_exists or CONFIG['if_exists']
+
+    logger.info(f"\n{'='*60}")
+    logger.info(f"Processing: {sav_path.name}")
+    logger.info(f"Target table: {table_name}")
+
+    try:
+        start = time.perf_counter()
+        rows, labels = stream_sav_to_table(sav_path, table_name, if_exists, CONFIG['chunksize'])
+        elapsed = time.perf_counter() - start
+        logger.info(f"  Wrote {format_rate(rows, elapsed)} via copy, {labels:,} value labels")
+        if stats is not None:
+            stats['rows'] = stats.get('rows', 0) + rows
+            stats['seconds'] = stats.get('seconds', 0.0) + elapsed
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Error loading {sav_path.name}: {e}")
+        return False
+
+def load_sav_if_changed(sav_path, table_name=None, manifest=None, force=False, stats=None, **kwargs):
+    """
+    Load a .sav file unless the manifest shows it was already loaded into the same table unchanged
+
+    Returns None when the file was skipped, otherwise the load_sav_to_db result.
+    """
+    table_name = table_name or sanitize_table_name(Path(sav_path).name)
+
+    if manifest is not None and not force and manifest.is_unchanged(sav_path, table_name):
+        logger.info(f"Skipping unchanged file: {Path(sav_path).name} -> {table_name}")
+        return None
+
+    file_stats = {}
+    loaded = load_sav_to_db(sav_path, table_name=table_name, stats=file_stats, **kwargs)
+    if loaded and manifest is not None:
+        manifest.record(sav_path, table_name, file_stats.get('rows', 0))
+
+    if stats is not None:
+        for key, value in file_stats.items():
+            stats[key] = stats.get(key, 0) + value
+    return loaded
+
+def load_all_savs(directory=None, files=None, force=False):
+    """Load the configured .sav files (or every .sav file when files is empty) from directory"""
+    if pyreadstat is None:
+        raise RuntimeError("pyreadstat is not installed; run: pip install pyreadstat")
+
+    directory = Path(directory or CONFIG['sav_directory'])
+    if not directory.exists():
+        logger.error(f"Directory not found: {directory}")
+        return
+
+    files = CONFIG['files'] if files is None else files
+    sav_files = [directory / name for name in files] if files else sorted(directory.glob('*.sav'))
+    logger.info(f"\nLoading {len(sav_files)} SPSS files from {directory}")
+
+    results = {'success': [], 'failed': [], 'skipped': [], 'stats': {'rows': 0, 'seconds': 0.0}}
+    manifest = LoadManifest(CONFIG['manifest_file']) if CONFIG['manifest_file'] else None
+
+    try:
+        for sav_file in sav_files:
+            loaded = load_sav_if_changed(sav_file, manifest=manifest, force=force, stats=results['stats'])
+            if loaded is None:
+                results['skipped'].append(sav_file.name)
+            elif loaded:
+                results['success'].append(sav_file.name)
+            else:
+                results['failed'].append(sav_file.name)
+    finally:
+        if manifest is not None:
+            manifest.save()
+
+    logger.info(f"\n{'='*60}")
+    logger.info("SUMMARY")
+    logger.info(f"{'='*60}")
+    logger.info(f"✓ Successfully loaded: {len(results['success'])} files")
+    logger.info(f"✗ Failed: {len(results['failed'])} files")
+    logger.info(f"↷ Skipped (unchanged): {len(results['skipped'])} files")
+    logger.info(f"Throughput (copy): {format_rate(results['stats']['rows'], results['stats']['seconds'])}")
+
+    if results['failed']:
+        logger.info("\nFailed files:")
+        for filename in results['failed']:
+            logger.info(f"  - {filename}")
+
+    return results
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Load SPSS (.sav) survey files into PostgreSQL')
+    parser.add_argument('--dir', default=CONFIG['sav_directory'], help='Directory containing .sav files')
+    parser.add_argument('--file', help='Load a single .sav file')
+    parser.add_argument('--table', help='Table name for single file')
+    parser.add_argument('--all', action='store_true', help="Load every .sav file in --dir, not just CONFIG['files']")
+    parser.add_argument('--if-exists', choices=['fail', 'replace', 'append'], default='replace',
+                       help='What to do if table exists')
+    parser.add_argument('--chunksize', type=int, default=CONFIG['chunksize'],
+                       help='Rows read from the .sav file at a time')
+    parser.add_argument('--manifest', default=CONFIG['manifest_file'],
+                       help='Load manifest used to skip unchanged files')
+    parser.add_argument('--force', action='store_true',
+                       help='Reload files even if the manifest shows them unchanged')
+
+    args = parser.parse_args()
+
+    CONFIG['if_exists'] = args.if_exists
+    CONFIG['chunksize'] = args.chunksize
+    CONFIG['manifest_file'] = args.manifest
+
+    if args.file:
+        if pyreadstat is None:
+            raise SystemExit("pyreadstat is not installed; run: pip install pyreadstat")
+        manifest = LoadManifest(args.manifest) if args.manifest else None
+        load_sav_if_changed(args.file, table_name=args.table, manifest=manifest, force=args.force)
+        if manifest is not None:
+            manifest.save()
+    else:
+        load_all_savs(directory=args.dir, files=[] if args.all else None, force=args.force)
@@ -0,0 +1,16 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from database.models.data_version import DataVersion
+
+
+def current_data_version(conn) -> int:
+    """Latest warehouse data version (0 before the first recorded load). Works on a Connection or Session."""
+    return conn.execute(select(func.coalesce(func.max(DataVersion.id), 0))).scalar_one()
+
+
+def bump_data_version(db: Session, files_loaded: int, rows_loaded: int) -> int:
+    """Record a finished load and return the new version; the caller commits."""
+    version = DataVersion(files_loaded=files_loaded, rows_loaded=rows_loaded)
+    db.add(version)
+    db.flush()
+    return version.id
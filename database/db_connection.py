@@ -1,4 +1,5 @@
 # db.py
+from contextlib import contextmanager
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
@@ -17,18 +18,90 @@ DB_NAME = os.getenv("DB_NAME")
 # Create database URL
 DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, echo=True)  # echo=True shows SQL logs
+# Plain libpq-style DSN for asyncpg (used by the async ingest path)
+ASYNC_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Named engine settings per workload; engines are built lazily by get_engine()
+ENGINE_PROFILES = {
+    # Ad-hoc scripts and tests; echo=True shows SQL logs
+    "default": {
+        "echo": os.getenv("DB_ECHO", "true").lower() in ("1", "true", "yes"),
+    },
+    # Bulk ETL: no SQL logging, large psycopg2 batches for executemany / insertmanyvalues
+    "ingest": {
+        "echo": False,
+        "executemany_mode": "values_plus_batch",
+        "insertmanyvalues_page_size": 10000,
+        "executemany_batch_page_size": 1000,
+        "pool_size": 4,
+        "max_overflow": 4,
+    },
+    # API / dashboard reads: bigger pool, dead-connection checks, bounded query time
+    "serving": {
+        "echo": False,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "connect_args": {
+            "options": f"-c statement_timeout={os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000')}",
+        },
+    },
+}
+
+# Execution options for large reads: server-side (named) cursor, rows fetched in batches
+STREAM_EXECUTION_OPTIONS = {"stream_results": True, "max_row_buffer": 5000}
+
+_engines = {}
+_sessionmakers = {}
+
+
+def get_engine(profile: str = "default"):
+    """Engine for a named profile, created on first use and cached per process."""
+    if profile not in _engines:
+        _engines[profile] = create_engine(DATABASE_URL, **ENGINE_PROFILES[profile])
+    return _engines[profile]
+
+
+def get_sessionmaker(profile: str = "default"):
+    if profile not in _sessionmakers:
+        _sessionmakers[profile] = sessionmaker(autocommit=False, autoflush=False, bind=get_engine(profile))
+    return _sessionmakers[profile]
+
+
+def get_session(profile: str = "default"):
+    """New ORM session bound to the given profile's engine."""
+    return get_sessionmaker(profile)()
+
+
+@contextmanager
+def streaming_connection(profile: str = "serving"):
+    """Connection whose results stream through a server-side cursor instead of being buffered."""
+    with get_engine(profile).connect() as conn:
+        yield conn.execution_options(**STREAM_EXECUTION_OPTIONS)
+
+
+def dispose_engines(close: bool = True):
+    """Drop pooled connections, e.g. in a forked worker (close=False leaves the parent's sockets alone)."""
+    for engine in _engines.values():
+        engine.dispose(close=close)
+
+
+def __getattr__(name):
+    # Backwards compatible module attributes, built only when first used
+    if name == "engine":
+        return get_engine("default")
+    if name == "SessionLocal":
+        return get_sessionmaker("default")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
 
 def get_db():
     """Dependency-style generator for getting DB session."""
-    db = SessionLocal()
+    db = get_session("serving")
     try:
         yield db
     finally:
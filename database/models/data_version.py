@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, Integer
+from database.db_connection import Base
+
+
+class DataVersion(Base):
+    """
+    One row per successful ETL run; the highest id is the current warehouse data version.
+
+    API and dashboard caches key their entries on it, so anything cached
+    before the latest load is never served again.
+    """
+    __tablename__ = "warehouse_data_versions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    loaded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    files_loaded = Column(Integer, nullable=False, default=0)
+    rows_loaded = Column(BigInteger, nullable=False, default=0)
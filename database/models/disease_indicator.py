@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from database.db_connection import Base
 
@@ -21,3 +21,17 @@ class DiseaseIndicator(Base):
 
     disease = relationship("Disease", back_populates="indicators")
     geo_admin_unit = relationship("GeoAdminUnit", back_populates="indicators")
+
+    # NULL-safe natural key; ETL merges rely on it for ON CONFLICT DO NOTHING
+    __table_args__ = (
+        Index(
+            "ux_disease_indicators_natural_key",
+            func.coalesce(disease_id, 0),
+            func.coalesce(geo_admin_unit_id, 0),
+            func.coalesce(indicator_code, ""),
+            func.coalesce(year, 0),
+            func.coalesce(dimension_type, ""),
+            func.coalesce(dimension_code, ""),
+            unique=True,
+        ),
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String, func
+from database.db_connection import Base
+
+
+class Forecast(Base):
+    """
+    Forecast points per series, written by ml.pipelines.forecast.
+
+    A series is identified by series_key (source|disease|indicator_code|dimension_code);
+    series_hash fingerprints the data and model it was fitted from, so a
+    rerun only replaces series whose hash changed.
+    """
+    __tablename__ = "forecasts"
+
+    id = Column(Integer, primary_key=True)
+    series_key = Column(String, nullable=False, index=True)
+    series_hash = Column(String(40), nullable=False)
+    source = Column(String, nullable=False)               # 'indicator' or 'outbreak'
+    disease = Column(String, index=True)
+    indicator_code = Column(String)                       # 'case_total' for outbreak series
+    dimension_code = Column(String)                       # country code for outbreak series
+    model = Column(String, nullable=False)
+    ds = Column(Date, nullable=False)
+    yhat = Column(Float)
+    yhat_lower = Column(Float)
+    yhat_upper = Column(Float)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
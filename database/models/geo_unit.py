@@ -8,6 +8,7 @@ from sqlalchemy import (
     Integer,
     String,
     Index,
+    func,
 )
 from database.db_connection import Base
 from sqlalchemy.orm import declarative_base, relationship
@@ -46,5 +47,17 @@ class GeoAdminUnit(Base):
     #    Index("ix_geo_country_state_lga", "country_code", "state_name", "lga_name"),
     #)
 
+    # NULL-safe natural key; lets ETL resolvers use INSERT ... ON CONFLICT DO NOTHING
+    __table_args__ = (
+        Index(
+            "ux_geo_admin_unit_natural_key",
+            country_code,
+            func.coalesce(state_name, ""),
+            func.coalesce(lga_name, ""),
+            func.coalesce(ward_name, ""),
+            unique=True,
+        ),
+    )
+
     #def __repr__(self):
      #   return f"<GeoAdminUnit(id={self.geo_admin_unit_id} country={self.country_code} state={self.state_name} lga={self.lga_name})>"
@@ -10,7 +10,7 @@ from sqlalchemy import (
     Index,
     Text,
     JSON,
-    ForeignKey
+    ForeignKey,
 )
 from database.db_connection import Base
 from sqlalchemy.orm import declarative_base, relationship
@@ -31,6 +31,8 @@ class HealthFacility(Base):
     geo_admin_unit_id = Column(Integer, ForeignKey("geo_admin_unit.id", ondelete="SET NULL"), nullable=True, index=True)
     latitude = Column(Float, nullable=True, index=True)
     longitude = Column(Float, nullable=True, index=True)
+    # `location` (geography, generated from latitude/longitude) exists only where PostGIS is installed
+    # (migration 5b1d08e3f6a9), so it is not mapped here; see analytics.facility_search.FACILITY_LOCATION
 
     properties = Column(JSON, nullable=True)  # raw properties JSON if you want to keep original row
 
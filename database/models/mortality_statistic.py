@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from database.db_connection import Base
 
@@ -14,4 +14,17 @@ class MortalityStatistic(Base):
     deaths = Column(Float, nullable=True)
 
     cause_obj = relationship("CauseOfDeath", back_populates="statistics")
-    geo_admin_unit = relationship("GeoAdminUnit", back_populates="mortalities")
\ No newline at end of file
+    geo_admin_unit = relationship("GeoAdminUnit", back_populates="mortalities")
+
+    # NULL-safe natural key; ETL merges rely on it for ON CONFLICT DO NOTHING
+    __table_args__ = (
+        Index(
+            "ux_mortality_statistics_natural_key",
+            func.coalesce(country, ""),
+            func.coalesce(cause_id, 0),
+            func.coalesce(geo_admin_unit_id, 0),
+            func.coalesce(year, 0),
+            func.coalesce(gender, ""),
+            unique=True,
+        ),
+    )
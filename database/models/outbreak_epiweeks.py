@@ -0,0 +1,68 @@
+from sqlalchemy import BigInteger, Column, Date, DateTime, Float, Index, Integer, String, func
+from database.db_connection import Base
+
+
+class OutbreakEpiweek(Base):
+    """
+    Week-level outbreak series, derived by analytics.outbreak_detector from
+    the cumulative totals of successive outbreak_reports.
+
+    Each row holds the cases/deaths reported since the series' previous
+    report (over weeks_covered weeks). Rows are appended in epiweek order, so
+    a BRIN index on epiweek stays tiny and still prunes date-range scans.
+    """
+    __tablename__ = "outbreak_epiweeks"
+
+    id = Column(BigInteger, primary_key=True)
+    disease_name = Column(String, nullable=False)
+    country_code = Column(String, nullable=False)
+    epiweek = Column(Date, nullable=False)            # last_epiwk of the report the row came from
+    weeks_covered = Column(Integer, nullable=False)   # weeks since the previous report in the series
+    new_cases = Column(Integer, nullable=False)
+    new_deaths = Column(Integer, nullable=False)
+    cum_cases = Column(Integer)
+    cum_deaths = Column(Integer)
+    report_id = Column(Integer)
+
+    __table_args__ = (
+        Index("ix_outbreak_epiweeks_epiweek_brin", "epiweek", postgresql_using="brin"),
+        Index("ux_outbreak_epiweeks_series_week", "disease_name", "country_code", "epiweek", unique=True),
+    )
+
+
+class OutbreakDetectorState(Base):
+    """
+    One row per (disease, country): the last report seen and the rolling
+    EWMA / CUSUM baseline. Updating it is all the detector needs to process a
+    new load, so history is never rescanned.
+    """
+    __tablename__ = "outbreak_detector_state"
+
+    disease_name = Column(String, primary_key=True)
+    country_code = Column(String, primary_key=True)
+    last_report_id = Column(Integer, nullable=False)  # the max over all rows is the detector's watermark
+    first_epiwk = Column(Date)                        # reporting cycle of the last report
+    last_epiwk = Column(Date)
+    cum_cases = Column(Integer)
+    cum_deaths = Column(Integer)
+    weeks_seen = Column(Integer, nullable=False, default=0)
+    ewma_mean = Column(Float, nullable=False, default=0.0)
+    ewma_var = Column(Float, nullable=False, default=0.0)
+    cusum = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class OutbreakAlert(Base):
+    """A week whose case rate broke the series' baseline: kind 'spike' (EWMA z-score) or 'cusum' (sustained rise)."""
+    __tablename__ = "outbreak_alerts"
+
+    id = Column(Integer, primary_key=True)
+    disease_name = Column(String, nullable=False)
+    country_code = Column(String, nullable=False)
+    epiweek = Column(Date, nullable=False, index=True)
+    kind = Column(String, nullable=False)
+    weekly_cases = Column(Float, nullable=False)
+    expected = Column(Float, nullable=False)
+    zscore = Column(Float, nullable=False)
+    cusum = Column(Float, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
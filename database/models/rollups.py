@@ -0,0 +1,44 @@
+from sqlalchemy import BigInteger, Column, Float, Integer, MetaData, String, Table
+
+# Materialized views created by migration e27b94d0c518 (row_id: b4e8d2a61f37) and refreshed by etl.rollups.
+# They live on their own MetaData so Alembic autogenerate never tries to create them as tables.
+rollup_metadata = MetaData()
+
+indicator_summary = Table(
+    "mv_indicator_summary",
+    rollup_metadata,
+    Column("row_id", Integer),  # keyset for /rollups/indicators, numbered in its sort order
+    Column("disease_id", Integer),
+    Column("disease_name", String),
+    Column("indicator_code", String),
+    Column("indicator_name", String),
+    Column("year", Integer),
+    Column("sex", String),
+    Column("value_count", BigInteger),
+    Column("value_avg", Float),
+    Column("value_min", Float),
+    Column("value_max", Float),
+)
+
+top_causes_of_death = Table(
+    "mv_top_causes_of_death",
+    rollup_metadata,
+    Column("country", String),
+    Column("year", Integer),
+    Column("gender", String),
+    Column("cause_id", Integer),
+    Column("cause_name", String),
+    Column("deaths", Float),
+    Column("cause_rank", BigInteger),
+)
+
+facility_counts = Table(
+    "mv_facility_counts",
+    rollup_metadata,
+    Column("state_name", String),
+    Column("lga_name", String),
+    Column("functional_status", String),
+    Column("facility_count", BigInteger),
+)
+
+ROLLUP_TABLES = [indicator_summary, top_causes_of_death, facility_counts]
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, func
+from database.db_connection import Base
+
+
+class WardCoverage(Base):
+    """
+    Primary care coverage per ward, recomputed by analytics.coverage.
+
+    Distances are great-circle km from the ward's centroid: the mean position of its facilities
+    (the geo_admin_unit point for wards without located facilities).
+    """
+    __tablename__ = "ward_coverage"
+
+    geo_admin_unit_id = Column(Integer, ForeignKey("geo_admin_unit.id", ondelete="CASCADE"), primary_key=True)
+    radius_km = Column(Float, nullable=False)
+    nearest_functional_km = Column(Float, nullable=True, index=True)  # NULL: no functional facility anywhere
+    nearest_functional_facility_id = Column(Integer, nullable=True)
+    facilities_within_radius = Column(Integer, nullable=False, default=0)
+    functional_within_radius = Column(Integer, nullable=False, default=0)
+    computed_at = Column(DateTime, nullable=False, server_default=func.now())
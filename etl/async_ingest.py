@@ -0,0 +1,118 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from database.db_connection import ASYNC_DATABASE_URL
+from .bulk_copy import quote_ident
+from .normalize import to_tuples
+
+DEFAULT_CHUNKSIZE = 20000
+DEFAULT_WRITERS = 3
+
+
+def _next_batch(reader, transform):
+    """Parse and normalize the next CSV chunk; None once the file is exhausted."""
+    chunk = next(reader, None)
+    if chunk is None:
+        return None
+    df = transform(chunk)
+    return list(df.columns), to_tuples(df)
+
+
+async def merge_records(conn, table_name: str, columns, records) -> int:
+    """
+    asyncpg counterpart of staging.merge_frame for one batch of row tuples.
+
+    COPYs the batch into a per-transaction temp table and inserts the rows
+    whose natural key is not in `table_name` yet. Returns rows inserted.
+    """
+    staging = f"stage_{table_name}"
+    column_sql = ", ".join(quote_ident(c) for c in columns)
+    async with conn.transaction():
+        await conn.execute(
+            f"CREATE TEMP TABLE {quote_ident(staging)} ON COMMIT DROP AS "
+            f"SELECT {column_sql} FROM {quote_ident(table_name)} WITH NO DATA"
+        )
+        await conn.copy_records_to_table(staging, records=records, columns=columns)
+        status = await conn.execute(
+            f"INSERT INTO {quote_ident(table_name)} ({column_sql}) "
+            f"SELECT {column_sql} FROM {quote_ident(staging)} "
+            f"ON CONFLICT DO NOTHING"
+        )
+    # Command tag is "INSERT 0 <rows>"
+    return int(status.split()[-1])
+
+
+async def _produce(reader, transform, queue, executor, writers):
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = await loop.run_in_executor(executor, _next_batch, reader, transform)
+        if batch is None:
+            break
+        if batch[1]:
+            await queue.put(batch)
+    for _ in range(writers):
+        await queue.put(None)
+
+
+async def _consume(pool, queue, table_name, merge, totals):
+    while True:
+        batch = await queue.get()
+        if batch is None:
+            return
+        columns, records = batch
+        async with pool.acquire() as conn:
+            if merge:
+                written = await merge_records(conn, table_name, columns, records)
+            else:
+                await conn.copy_records_to_table(table_name, records=records, columns=columns)
+                written = len(records)
+        totals["rows_read"] += len(records)
+        totals["rows_written"] += written
+
+
+async def ingest_csv_async(csv_path, table_name: str, transform, merge=False,
+                           chunksize=DEFAULT_CHUNKSIZE, writers=DEFAULT_WRITERS, pool=None) -> dict:
+    """
+    Load a CSV into `table_name` with parsing and writing overlapped.
+
+    One producer reads `chunksize`-row chunks and runs `transform(chunk) -> DataFrame`
+    (column names = target columns) on a worker thread, so the event loop stays
+    free while pandas works. `writers` consumers take finished batches off a
+    bounded queue and send them with copy_records_to_table over their own pooled
+    asyncpg connection. merge=True routes each batch through a temp table and
+    INSERT ... ON CONFLICT DO NOTHING, as the synchronous loaders do.
+
+    The queue holds at most two batches per writer, so memory stays bounded by
+    chunk size rather than file size. `transform` is called from a single
+    thread, in file order, and may use a (synchronous) session of its own.
+    Returns {'rows_read', 'rows_written'}.
+    """
+    import asyncpg  # only needed on this path
+
+    owns_pool = pool is None
+    if owns_pool:
+        pool = await asyncpg.create_pool(ASYNC_DATABASE_URL, min_size=1, max_size=writers)
+
+    totals = {"rows_read": 0, "rows_written": 0}
+    queue = asyncio.Queue(maxsize=writers * 2)
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        with pd.read_csv(csv_path, chunksize=chunksize) as reader:
+            # A failing task cancels the others, so a dead writer cannot leave the producer blocked
+            try:
+                async with asyncio.TaskGroup() as group:
+                    group.create_task(_produce(reader, transform, queue, executor, writers))
+                    for _ in range(writers):
+                        group.create_task(_consume(pool, queue, table_name, merge, totals))
+            except ExceptionGroup as failures:
+                raise failures.exceptions[0]
+    finally:
+        executor.shutdown(wait=True)
+        if owns_pool:
+            await pool.close()
+    return totals
+
+
+def ingest_csv(csv_path, table_name: str, transform, **kwargs) -> int:
+    """Synchronous entry point for the loaders; returns the number of rows written."""
+    return asyncio.run(ingest_csv_async(csv_path, table_name, transform, **kwargs))["rows_written"]
@@ -0,0 +1,36 @@
+import io
+import pandas as pd
+
+# NULL marker used in the CSV stream handed to COPY; keeps real empty strings distinct
+COPY_NULL = "\\N"
+
+
+def quote_ident(name: str) -> str:
+    """Quote a PostgreSQL identifier (table or column name)."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def copy_dataframe(cursor, df: pd.DataFrame, table_name: str, columns=None, chunksize: int = 50000) -> int:
+    """
+    Stream a DataFrame into `table_name` with COPY ... FROM STDIN.
+
+    `cursor` is a raw psycopg2 cursor. Rows are serialised to CSV one chunk at a
+    time, so the text buffer never holds more than `chunksize` rows.
+    Returns the number of rows written.
+    """
+    columns = list(columns if columns is not None else df.columns)
+    column_sql = ", ".join(quote_ident(c) for c in columns)
+    statement = (
+        f"COPY {quote_ident(table_name)} ({column_sql}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+
+    written = 0
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, columns=columns, index=False, header=False, na_rep=COPY_NULL)
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+        written += len(chunk)
+    return written
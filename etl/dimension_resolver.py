@@ -0,0 +1,113 @@
+import pandas as pd
+from sqlalchemy import and_, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+
+def normalize_key_value(value):
+    """NaN / pd.NA become None so keys compare equal to what the database returns."""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value
+
+
+class DimensionResolver:
+    """
+    In-memory natural key -> surrogate id map for one dimension table.
+
+    The table is preloaded with a single SELECT. Keys a file needs that are not
+    in the map yet are inserted together with one
+    INSERT ... ON CONFLICT DO NOTHING RETURNING; keys another loader inserted
+    concurrently come back through one follow-up SELECT.
+
+    Keys are scalars for single-column natural keys (e.g. Disease.name) and
+    tuples otherwise (e.g. GeoAdminUnit state/LGA/ward).
+    """
+
+    def __init__(self, db: Session, model, key_columns, id_column="id", row_defaults=None):
+        self.db = db
+        self.model = model
+        self.key_columns = list(key_columns)
+        self.id_column = getattr(model, id_column)
+        # Optional callable(key) -> dict of extra column values for newly inserted rows
+        self.row_defaults = row_defaults
+        self.ids = {}
+        self.preload()
+
+    @property
+    def columns(self):
+        return [getattr(self.model, name) for name in self.key_columns]
+
+    def _key_from_row(self, values):
+        values = tuple(values)
+        return values[0] if len(self.key_columns) == 1 else values
+
+    def _normalize(self, key):
+        if len(self.key_columns) == 1:
+            return normalize_key_value(key)
+        return tuple(normalize_key_value(v) for v in key)
+
+    def _as_tuple(self, key):
+        return (key,) if len(self.key_columns) == 1 else key
+
+    def preload(self):
+        rows = self.db.execute(select(self.id_column, *self.columns)).all()
+        self.ids = {self._key_from_row(row[1:]): row[0] for row in rows}
+
+    def _new_row(self, key, attributes):
+        row = dict(zip(self.key_columns, self._as_tuple(key)))
+        if self.row_defaults is not None:
+            row.update(self.row_defaults(key))
+        if attributes and key in attributes:
+            row.update(attributes[key])
+        return row
+
+    def _fetch(self, keys):
+        conditions = []
+        for key in keys:
+            conditions.append(and_(*[
+                column.is_(None) if value is None else column == value
+                for column, value in zip(self.columns, self._as_tuple(key))
+            ]))
+        rows = self.db.execute(select(self.id_column, *self.columns).where(or_(*conditions))).all()
+        for row in rows:
+            self.ids[self._key_from_row(row[1:])] = row[0]
+
+    def resolve_many(self, keys, attributes=None) -> dict:
+        """
+        Return {key: id} for every key, inserting the unseen ones in one statement.
+
+        `attributes` optionally maps a key to extra column values used only when
+        that key has to be inserted (e.g. coordinates of a new ward).
+        """
+        keys = {self._normalize(key) for key in keys}
+        missing = [key for key in keys if key not in self.ids]
+
+        if missing:
+            rows = [self._new_row(key, attributes) for key in missing]
+            # A multi-row VALUES needs the same columns in every row; keys without attributes get NULLs
+            columns = set().union(*rows)
+            stmt = (
+                insert(self.model)
+                .values([{column: row.get(column) for column in columns} for row in rows])
+                .on_conflict_do_nothing()
+                .returning(self.id_column, *self.columns)
+            )
+            for row in self.db.execute(stmt):
+                self.ids[self._key_from_row(row[1:])] = row[0]
+
+            # Rows that already existed (inserted by a concurrent loader) return nothing above
+            raced = [key for key in missing if key not in self.ids]
+            if raced:
+                self._fetch(raced)
+
+        return {key: self.ids[key] for key in keys}
+
+    def resolve(self, key) -> int:
+        key = self._normalize(key)
+        return self.resolve_many([key])[key]
@@ -1,10 +1,29 @@
-from .load_disease_indicators import load_all_disease_files
-from .load_mortality_data import load_all_mortality_files
-from .load_outbreak_reports import load_all_outbreak_files
-from .load_health_facilities import load_all_facility_files
+import argparse
+import os
+from .manifest import DEFAULT_MANIFEST_PATH
+from .orchestrator import run_pipeline
+from .transform_raw import transform_all
 
 if __name__ == "__main__":
-    load_all_disease_files("data/processed/disease_indicators")
-    load_all_mortality_files("data/processed/mortality")
-    load_all_outbreak_files("data/processed/outbreaks")
-    load_all_facility_files("data/processed/Facility_level_data")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Load all processed datasets into PostgreSQL")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Parallel file-level jobs (1 = run serially in-process)")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST_PATH,
+                        help="Load manifest used to skip unchanged source files")
+    parser.add_argument("--force", action="store_true",
+                        help="Reload every file even if the manifest shows it unchanged")
+    parser.add_argument("--async-ingest", action="store_true",
+                        help="Overlap CSV parsing with asyncpg COPY writes inside each job")
+    parser.add_argument("--transform-raw", action="store_true",
+                        help="Rebuild data/processed/disease_indicators from the raw WHO files first (etl.transform_raw)")
+    args = parser.parse_args()
+
+    if args.transform_raw:
+        transformed = transform_all(workers=args.workers)
+        if transformed["failed"]:
+            raise SystemExit(1)
+
+    results = run_pipeline(workers=args.workers, force=args.force, manifest_path=args.manifest,
+                           async_ingest=args.async_ingest)
+    if results["failed"] or results["failed_steps"]:
+        raise SystemExit(1)
@@ -1,89 +1,73 @@
 import os
 import pandas as pd
-from sqlalchemy.orm import Session
 from database.models.disease_dim import Disease
 from database.models.disease_indicator import DiseaseIndicator
-from database.db_connection import SessionLocal
+from database.db_connection import get_session
+from .async_ingest import ingest_csv
+from .dimension_resolver import DimensionResolver
+from .normalize import dataset_name_from_filename, normalize_frame
+from .staging import merge_frame
 
-def load_disease_indicators(csv_path: str, disease_name: str):
-    df = pd.read_csv(csv_path)
-    db = SessionLocal()
+# Canonical column -> source columns across the WHO GHO export flavours
+# (processed snake_case, raw "GHO (CODE)" headers, HDX lowercase headers, TB sex_* columns)
+INDICATOR_COLUMN_ALIASES = {
+    "indicator_code": ["indicator_code", "GHO (CODE)", "gho_code"],
+    "indicator_name": ["indicator_name", "GHO (DISPLAY)", "gho_display"],
+    "year": ["year", "YEAR (DISPLAY)", "year_display"],
+    "start_year": ["start_year", "STARTYEAR", "startyear"],
+    "end_year": ["end_year", "ENDYEAR", "endyear"],
+    "dimension_type": ["dimension_type", "DIMENSION (TYPE)", "sex_type"],
+    "dimension_code": ["dimension_code", "DIMENSION (CODE)", "sex_code"],
+    "dimension_name": ["dimension_name", "DIMENSION (NAME)", "sex_name"],
+    "numeric": ["numeric", "Numeric"],
+    "value": ["value", "Value"],
+}
 
-    # 🧹 Clear previous records
-    #db.execute("TRUNCATE TABLE outbreak_reports RESTART IDENTITY CASCADE;")
-    #db.commit()
+INTEGER_FIELDS = {"year", "start_year", "end_year"}
 
-    # Cache known diseases
-    known_diseases = {d.name: d.id for d in db.query(Disease).all()}
 
-    # Check or create the disease
-    if disease_name not in known_diseases:
-        disease = Disease(name=disease_name)
-        db.add(disease)
-        db.commit()
-        db.refresh(disease)
-        known_diseases[disease_name] = disease.id
-    disease_id = known_diseases[disease_name]
+def normalize_indicator_frame(df: pd.DataFrame, disease_id: int) -> pd.DataFrame:
+    df = normalize_frame(df, INDICATOR_COLUMN_ALIASES, numeric_fields={"numeric"}, integer_fields=INTEGER_FIELDS)
+    # HDX exports carry a "#indicator+code" hashtag row under the header
+    df = df[df["indicator_code"].notna() & ~df["indicator_code"].str.startswith("#", na=False)]
+    df.insert(0, "disease_id", disease_id)
+    return df
 
-    # Cache existing indicators for idempotency (by unique fields)
-    existing = set(
-        (i.indicator_code, i.year)
-        for i in db.query(DiseaseIndicator.indicator_code, DiseaseIndicator.year)
-        .filter(DiseaseIndicator.disease_id == disease_id)
-        .all()
-    )
 
-    new_records = []
-    for _, row in df.iterrows():
-         # Normalize cross-dataset fields
-        dimension_type = (
-            row.get("DIMENSION (TYPE)")
-            or row.get("sex_type")
-        )
-        dimension_code = (
-            row.get("DIMENSION (CODE)")
-            or row.get("sex_code")
-        )
-        dimension_name = (
-            row.get("DIMENSION (NAME)")
-            or row.get("sex_name")
-        )
-        indicator_code=(row.get("indicator_code")
-            or row.get("GHO (CODE)")
-        )
-        indicator_name=(row.get("indicator_name")
-            or row.get("GHO (DISPLAY)")
-        ),
-        key = (row.get("indicator_code"), row.get("year"))
-        if key in existing:
-            continue  # skip duplicate rows
+def load_disease_indicators(csv_path: str, disease_name: str, async_ingest: bool = False):
+    db = get_session("ingest")
+
+    # 🧹 Clear previous records
+    #db.execute("TRUNCATE TABLE outbreak_reports RESTART IDENTITY CASCADE;")
+    #db.commit()
 
+    # Resolve (or create) the disease against the preloaded dimension map
+    disease_id = DimensionResolver(db, Disease, ["name"]).resolve(disease_name)
 
-        indicator = DiseaseIndicator(
-            disease_id=disease_id,
-            indicator_code=(indicator_code),
-            indicator_name=(indicator_name),
-            year=row.get("year"),
-            start_year=row.get("start_year"),
-            end_year=row.get("end_year"),
-            dimension_type=( dimension_type),
-            dimension_code=( dimension_code),
-            dimension_name=( dimension_name),
-            numeric=row.get("numeric"),
-            value=row.get("value"),
+    if async_ingest:
+        # Writers use their own connections, so the disease row must be committed first
+        db.commit()
+        loaded = ingest_csv(
+            csv_path,
+            DiseaseIndicator.__tablename__,
+            lambda chunk: normalize_indicator_frame(chunk, disease_id),
+            merge=True,
         )
-        new_records.append(indicator)
+    else:
+        # Staged merge; rows already in the table (by natural key) are skipped server-side
+        df = normalize_indicator_frame(pd.read_csv(csv_path), disease_id)
+        loaded = merge_frame(db, df, DiseaseIndicator.__tablename__)
 
-    db.bulk_save_objects(new_records)
     db.commit()
     db.close()
-    print(f"Loaded {len(new_records)} new indicators for {disease_name}")
+    print(f"Loaded {loaded} new indicators for {disease_name}")
+    return loaded
 
 
 def load_all_disease_files(folder_path: str):
     for filename in os.listdir(folder_path):
         if filename.endswith(".csv"):
-            disease_name = filename.split("_")[0].capitalize()
+            disease_name = dataset_name_from_filename(filename)
             file_path = os.path.join(folder_path, filename)
             print(f"Loading disease indicators for {disease_name} from {filename}")
-            load_disease_indicators(file_path, disease_name)
\ No newline at end of file
+            load_disease_indicators(file_path, disease_name)
@@ -1,72 +1,79 @@
 import os
 import pandas as pd
-from sqlalchemy.orm import Session
 from database.models.causes_of_death import CauseOfDeath
 from database.models.mortality_statistic import MortalityStatistic
-from database.db_connection import SessionLocal
+from database.db_connection import get_session
+from .async_ingest import ingest_csv
+from .dimension_resolver import DimensionResolver
+from .normalize import normalize_frame
+from .staging import merge_frame
 
-def load_mortality_data(csv_path: str, gender: str):
-    df = pd.read_csv(csv_path)
-    db = SessionLocal()
+MORTALITY_COLUMN_ALIASES = {
+    "cause": ["diseases", "cause"],
+    "country": ["country_code"],
+    "year": ["year"],
+    "deaths": ["death_rate"],
+}
+
+
+def normalize_mortality_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = normalize_frame(df, MORTALITY_COLUMN_ALIASES, numeric_fields={"deaths"}, integer_fields={"year"})
+    return df[df["cause"].notna()]
+
+
+def mortality_rows(df: pd.DataFrame, causes: DimensionResolver, gender: str) -> pd.DataFrame:
+    """Normalized mortality frame -> mortality_statistics columns, resolving causes in one batch."""
+    known_causes = causes.resolve_many(df["cause"].unique())
+    return pd.DataFrame({
+        "country": df["country"],
+        "cause_id": df["cause"].map(known_causes).astype("Int64"),
+        "year": df["year"],
+        "gender": gender,
+        "deaths": df["deaths"],
+    })
+
+
+def load_mortality_data(csv_path: str, gender: str, async_ingest: bool = False):
+    db = get_session("ingest")
 
         # 🧹 Clear previous records
     #db.execute("TRUNCATE TABLE outbreak_reports RESTART IDENTITY CASCADE;")
     #db.commit()
     
-    # Cache known causes
-    known_causes = {c.name: c.id for c in db.query(CauseOfDeath).all()}
+    causes = DimensionResolver(db, CauseOfDeath, ["name"])
 
-    # Cache existing records for idempotency
-    existing = set(
-        (m.country, m.cause_id, m.year, m.gender)
-        for m in db.query(MortalityStatistic.country,
-                          MortalityStatistic.cause_id,
-                          MortalityStatistic.year,
-                          MortalityStatistic.gender).all()
-    )
-
-    new_records = []
-    for _, row in df.iterrows():
-        cause_name = row.get("diseases") or row.get("cause")
-        if not cause_name:
-            continue
-
-        if cause_name not in known_causes:
-            cause = CauseOfDeath(name=cause_name)
-            db.add(cause)
+    if async_ingest:
+        def transform(chunk):
+            rows = mortality_rows(normalize_mortality_frame(chunk), causes, gender)
+            # New causes must be visible to the writer connections
             db.commit()
-            db.refresh(cause)
-            known_causes[cause_name] = cause.id
-
-        cause_id = known_causes[cause_name]
-        key = (row.get("country_code"), cause_id, row.get("year"), gender)
-        if key in existing:
-            continue
+            return rows
 
-        stat = MortalityStatistic(
-            country=row.get("country_code"),
-            cause_id=cause_id,
-            year=row.get("year"),
-            gender=gender,
-            deaths=row.get("death_rate"),
-        )
-        new_records.append(stat)
+        loaded = ingest_csv(csv_path, MortalityStatistic.__tablename__, transform, merge=True)
+    else:
+        df = mortality_rows(normalize_mortality_frame(pd.read_csv(csv_path)), causes, gender)
+        # Staged merge; rows already in the table (by natural key) are skipped server-side
+        loaded = merge_frame(db, df, MortalityStatistic.__tablename__)
 
-    db.bulk_save_objects(new_records)
     db.commit()
     db.close()
-    print(f"Loaded {len(new_records)} new mortality records for gender={gender}")
+    print(f"Loaded {loaded} new mortality records for gender={gender}")
+    return loaded
+
+
+def gender_from_filename(filename: str) -> str:
+    name = filename.upper()
+    if "FEMALE" in name or "FMLE" in name:
+        return "FMLE"
+    if "MALE" in name or "MLE" in name:
+        return "MLE"
+    return "BTSX"
 
 
 def load_all_mortality_files(folder_path: str):
     for filename in os.listdir(folder_path):
         if filename.endswith(".csv"):
-            if "mle" in filename.upper():
-                gender = "MLE"
-            elif "fmle" in filename.upper():
-                gender = "FMLE"
-            else:
-                gender = "BTSX"
+            gender = gender_from_filename(filename)
             file_path = os.path.join(folder_path, filename)
             print(f"Loading mortality data ({gender}) from {filename}")
             load_mortality_data(file_path, gender)
@@ -1,47 +1,63 @@
 import os
 import pandas as pd
-from sqlalchemy.orm import Session
 from database.models.outbreak_reports import OutbreakReport
-from database.db_connection import SessionLocal
+from database.db_connection import get_session
+from .async_ingest import ingest_csv
+from .normalize import dataset_name_from_filename, normalize_frame, to_records
+
+OUTBREAK_COLUMN_ALIASES = {
+    "country_name": ["country_name"],
+    "region": ["region"],
+    "country_code": ["country_code"],
+    "first_epiwk": ["first_epiwk"],
+    "last_epiwk": ["last_epiwk"],
+    "case_total": ["case_total"],
+    "death_total": ["death_total"],
+}
 
 
 def safe_datetime(value):
     dt = pd.to_datetime(value, errors="coerce")
     return None if pd.isna(dt) else dt
 
-def load_outbreak_reports(csv_path: str, disease_name: str):
-    df = pd.read_csv(csv_path)
-    db = SessionLocal()
+def normalize_outbreak_frame(df: pd.DataFrame, disease_name: str) -> pd.DataFrame:
+    df = normalize_frame(df, OUTBREAK_COLUMN_ALIASES, integer_fields={"case_total", "death_total"})
+    for field in ("first_epiwk", "last_epiwk"):
+        df[field] = pd.to_datetime(df[field], errors="coerce").dt.date
+    df.insert(0, "disease_name", disease_name)
+    return df
+
+
+def load_outbreak_reports(csv_path: str, disease_name: str, async_ingest: bool = False):
+    if async_ingest:
+        loaded = ingest_csv(
+            csv_path,
+            OutbreakReport.__tablename__,
+            lambda chunk: normalize_outbreak_frame(chunk, disease_name),
+        )
+        print(f" Loaded outbreak reports for {disease_name}")
+        return loaded
+
+    df = normalize_outbreak_frame(pd.read_csv(csv_path), disease_name)
+    db = get_session("ingest")
 
     # 🧹 Clear previous records
     #db.execute("TRUNCATE TABLE outbreak_reports RESTART IDENTITY CASCADE;")
     #db.commit()
 
-    new_records = []
-    for _, row in df.iterrows():
-        new_records.append(
-            OutbreakReport(
-                disease_name=disease_name,
-                country_name=row.get("country_name"),
-                region=row.get("region"),
-                country_code=row.get("country_code"),
-                first_epiwk=safe_datetime(row.get("first_epiwk")),
-                last_epiwk=safe_datetime(row.get("last_epiwk")),
-                case_total=int(row.get("case_total")) if pd.notna(row.get("case_total")) else None,
-                death_total=int(row.get("death_total")) if pd.notna(row.get("death_total")) else None,
-            )
-        )
+    new_records = to_records(df)
 
-    db.bulk_save_objects(new_records)
+    db.bulk_insert_mappings(OutbreakReport, new_records)
     db.commit()
     db.close()
     print(f" Loaded outbreak reports for {disease_name}")
+    return len(new_records)
 
 
 def load_all_outbreak_files(folder_path: str):
     for filename in os.listdir(folder_path):
         if filename.endswith(".csv"):
-            disease_name = filename.split("_")[0].capitalize()
+            disease_name = dataset_name_from_filename(filename)
             file_path = os.path.join(folder_path, filename)
             print(f"Loading outbreak data for {disease_name} from {filename}")
             load_outbreak_reports(file_path, disease_name)
\ No newline at end of file
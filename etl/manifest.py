@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from .sources import ArchiveMember
+
+DEFAULT_MANIFEST_PATH = "data/.load_manifest.json"
+
+
+def file_sha256(path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LoadManifest:
+    """
+    Persisted record of what each source file looked like when it was last loaded.
+
+    Stored as JSON: {path: {sha256, size, mtime, target, row_count, loaded_at}}.
+    A file counts as unchanged when its target is the same and its content hash
+    matches. Size + mtime are checked first so untouched files are never re-hashed.
+
+    Members of .zip archives (etl.sources.ArchiveMember) are keyed
+    'archive.zip::member' and fingerprinted by the CRC-32 and size in the
+    archive's directory, so checking them decompresses nothing.
+    """
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = str(path)
+        self.entries = {}
+        self._hashes = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def _key(file_path) -> str:
+        if isinstance(file_path, ArchiveMember):
+            return str(file_path)
+        return os.path.normpath(str(file_path))
+
+    def _sha256(self, file_path) -> str:
+        stat = os.stat(file_path)
+        key = (self._key(file_path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._hashes:
+            self._hashes[key] = file_sha256(file_path)
+        return self._hashes[key]
+
+    def is_unchanged(self, file_path, target) -> bool:
+        entry = self.entries.get(self._key(file_path))
+        if entry is None or entry.get("target") != target:
+            return False
+
+        if isinstance(file_path, ArchiveMember):
+            info = file_path.info()
+            return entry.get("crc32") == info.CRC and entry["size"] == info.file_size
+
+        stat = os.stat(file_path)
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime == entry["mtime"]:
+            return True
+
+        # Touched but maybe not modified: the content hash decides
+        if self._sha256(file_path) != entry["sha256"]:
+            return False
+        entry["mtime"] = stat.st_mtime
+        return True
+
+    def record(self, file_path, target, row_count):
+        if isinstance(file_path, ArchiveMember):
+            info = file_path.info()
+            self.entries[self._key(file_path)] = {
+                "crc32": info.CRC,
+                "size": info.file_size,
+                "target": target,
+                "row_count": int(row_count or 0),
+                "loaded_at": datetime.utcnow().isoformat(timespec="seconds"),
+            }
+            return
+
+        stat = os.stat(file_path)
+        self.entries[self._key(file_path)] = {
+            "sha256": self._sha256(file_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "target": target,
+            "row_count": int(row_count or 0),
+            "loaded_at": datetime.utcnow().isoformat(timespec="seconds"),
+        }
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,85 @@
+import re
+import pandas as pd
+
+# HXL hashtags, e.g. "#indicator+value+num" (HDX files carry a row of them under the header)
+HXL_TAG = re.compile(r"#[a-z][a-z0-9_]*(?:\+[a-z0-9_]+)*")
+# Plain or digit-grouped number: "16 702 261" (spaces or non-breaking spaces), "1,204", "13.19"
+GROUPED_NUMBER = re.compile(r"-?\d{1,3}(?:[ ,\u00a0]\d{3})+(?:\.\d+)?|-?\d+(?:\.\d+)?")
+DIGIT_SEPARATOR = re.compile(r"[ ,\u00a0]")
+
+
+def dataset_name_from_filename(filename: str) -> str:
+    """'malaria_indicators_nga.csv' -> 'Malaria' (a leading 'cleaned_' is ignored)."""
+    stem = filename[len("cleaned_"):] if filename.startswith("cleaned_") else filename
+    return stem.split("_")[0].capitalize()
+
+
+def clean_text_column(series: pd.Series) -> pd.Series:
+    """Strip a column as text; blanks become missing."""
+    series = series.astype("string").str.strip()
+    return series.mask(series == "")
+
+
+def to_int_column(series: pd.Series) -> pd.Series:
+    """Numeric column as nullable Int64 (unparseable values become missing)."""
+    return pd.to_numeric(series, errors="coerce").round().astype("Int64")
+
+
+def hashtag_rows(df: pd.DataFrame) -> pd.Series:
+    """Mask of rows whose every filled cell is an HXL hashtag."""
+    text_cols = set(df.select_dtypes(include=["object", "string"]).columns)
+    mask = df.notna().any(axis=1).to_numpy()
+    # A cheap '#' prefix check narrows the rows column by column; only the few left get the regex
+    for check in (lambda s: s.str.startswith("#"), lambda s: s.str.fullmatch(HXL_TAG)):
+        for col in df.columns:
+            if not mask.any():
+                break
+            values = df.loc[mask, col]
+            passed = values.isna().to_numpy()
+            if col in text_cols:
+                passed |= check(values.astype("string")).to_numpy(dtype=bool, na_value=False)
+            mask[mask] = passed
+    return pd.Series(mask, index=df.index)
+
+
+def drop_hashtag_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """df without its HXL hashtag rows ('#indicator+code', '#date+year', ...)."""
+    tags = hashtag_rows(df)
+    return df[~tags].copy() if tags.any() else df
+
+
+def coalesce_aliases(df: pd.DataFrame, aliases, numeric=False) -> pd.Series:
+    """First non-missing value across the alias columns present in df, column-wise."""
+    present = [col for col in aliases if col in df.columns]
+    if not present:
+        return pd.Series(pd.NA, index=df.index, dtype="Float64" if numeric else "string")
+
+    convert = (lambda s: pd.to_numeric(s, errors="coerce")) if numeric else clean_text_column
+    # fillna per alias, not bfill(axis=1): pandas 2.2 fills a one-column extension-dtype frame down the rows
+    result = convert(df[present[0]])
+    for col in present[1:]:
+        result = result.fillna(convert(df[col]))
+    return result
+
+
+def normalize_frame(df: pd.DataFrame, column_aliases: dict, numeric_fields=(), integer_fields=()) -> pd.DataFrame:
+    """Map a source extract onto canonical columns in one column-wise pass."""
+    out = pd.DataFrame({
+        field: coalesce_aliases(df, aliases, numeric=field in numeric_fields or field in integer_fields)
+        for field, aliases in column_aliases.items()
+    })
+    for field in integer_fields:
+        out[field] = to_int_column(out[field])
+    return out
+
+
+def to_records(df: pd.DataFrame):
+    """Plain row dicts with pandas missing values turned into None."""
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict("records")
+
+
+def to_tuples(df: pd.DataFrame):
+    """Plain row tuples (column order of df) with pandas missing values turned into None."""
+    df = df.astype(object)
+    return list(df.where(df.notna(), None).itertuples(index=False, name=None))
@@ -0,0 +1,231 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from analytics.coverage import run_coverage
+from analytics.outbreak_detector import run_detector
+from database.data_version import bump_data_version
+from database.db_connection import dispose_engines, get_session
+from database.models.causes_of_death import CauseOfDeath
+from database.models.disease_dim import Disease
+from ml.feature_store import build_features
+from .dimension_resolver import DimensionResolver
+from .load_disease_indicators import load_disease_indicators
+from .load_health_facilities import load_health_facilities
+from .load_mortality_data import (
+    MORTALITY_COLUMN_ALIASES,
+    gender_from_filename,
+    load_mortality_data,
+    normalize_mortality_frame,
+)
+from .load_outbreak_reports import load_outbreak_reports
+from .manifest import DEFAULT_MANIFEST_PATH, LoadManifest
+from .normalize import dataset_name_from_filename
+from . import parquet_export
+from .rollups import refresh_rollups
+
+# Job kind -> loader(csv_path, arg)
+LOADERS = {
+    "disease": load_disease_indicators,
+    "mortality": load_mortality_data,
+    "outbreak": load_outbreak_reports,
+    "facility": load_health_facilities,
+}
+
+# Job kind -> fact table it writes (recorded in the load manifest)
+TARGET_TABLES = {
+    "disease": "disease_indicators",
+    "mortality": "mortality_statistics",
+    "outbreak": "outbreak_reports",
+    "facility": "health_facilities_master",
+}
+
+DEFAULT_SOURCES = {
+    "disease": "data/processed/disease_indicators",
+    "mortality": "data/processed/mortality",
+    "outbreak": "data/processed/outbreaks",
+    "facility": "data/processed/Facility_level_data",
+}
+
+
+def build_jobs(sources=None):
+    """One job per CSV file (plain or .gz): {'kind', 'path', 'arg'} where arg is the loader's second argument."""
+    sources = sources or DEFAULT_SOURCES
+    jobs = []
+    for kind, folder in sources.items():
+        if not os.path.isdir(folder):
+            print(f"Skipping {kind} files: {folder} not found")
+            continue
+        for filename in sorted(os.listdir(folder)):
+            if not filename.endswith((".csv", ".csv.gz")):
+                continue
+            arg = gender_from_filename(filename) if kind == "mortality" else dataset_name_from_filename(filename)
+            jobs.append({"kind": kind, "path": os.path.join(folder, filename), "arg": arg})
+    return jobs
+
+
+def skip_unchanged(jobs, manifest):
+    """Split jobs into (to_run, skipped) using the load manifest."""
+    to_run, skipped = [], []
+    for job in jobs:
+        if manifest.is_unchanged(job["path"], TARGET_TABLES[job["kind"]]):
+            skipped.append(job)
+        else:
+            to_run.append(job)
+    return to_run, skipped
+
+
+def resolve_dimensions(jobs):
+    """
+    Create every disease and cause of death the fact jobs will need, up front.
+
+    Workers then only hit their preloaded resolver maps, so parallel fact
+    loads never race each other on dimension inserts.
+    """
+    disease_names = {job["arg"] for job in jobs if job["kind"] == "disease"}
+    cause_names = set()
+    for job in jobs:
+        if job["kind"] == "mortality":
+            causes = pd.read_csv(job["path"], usecols=lambda c: c in MORTALITY_COLUMN_ALIASES["cause"])
+            cause_names.update(normalize_mortality_frame(causes)["cause"])
+
+    db = get_session("ingest")
+    try:
+        DimensionResolver(db, Disease, ["name"]).resolve_many(disease_names)
+        DimensionResolver(db, CauseOfDeath, ["name"]).resolve_many(cause_names)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Resolved {len(disease_names)} diseases and {len(cause_names)} causes of death")
+
+
+def run_job(job):
+    """Run one file-level job; returns its result record."""
+    start = time.perf_counter()
+    rows = LOADERS[job["kind"]](job["path"], job["arg"], async_ingest=job.get("async_ingest", False))
+    return {**job, "rows": rows, "seconds": time.perf_counter() - start}
+
+
+def _init_worker():
+    # Forked workers must not reuse the parent's pooled connections
+    dispose_engines(close=False)
+
+
+def run_jobs(jobs, workers=None):
+    """
+    Run fact-loading jobs across a process pool and collect one summary.
+
+    workers <= 1 runs the jobs in-process, one after another.
+    """
+    results = {"success": [], "failed": [], "skipped": []}
+
+    if workers is not None and workers <= 1:
+        for job in jobs:
+            try:
+                results["success"].append(run_job(job))
+            except Exception as e:
+                results["failed"].append({**job, "error": repr(e)})
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                results["success"].append(future.result())
+            except Exception as e:
+                results["failed"].append({**job, "error": repr(e)})
+    return results
+
+
+def record_data_version(results):
+    """Bump the warehouse data version after a run that loaded anything, invalidating API caches."""
+    db = get_session("ingest")
+    try:
+        version = bump_data_version(
+            db,
+            files_loaded=len(results["success"]),
+            rows_loaded=sum(r["rows"] or 0 for r in results["success"]),
+        )
+        db.commit()
+    finally:
+        db.close()
+    print(f"Warehouse data version is now {version}")
+    return version
+
+
+def run_step(results, name, step):
+    """
+    Run one post-load step, storing its result under `name`.
+
+    The loads are committed by then, so a failing step is recorded in
+    results['failed_steps'] instead of stopping the steps after it; each can be rerun on its own.
+    """
+    try:
+        results[name] = step()
+    except Exception as e:
+        print(f"Post-load step '{name}' failed: {e!r}")
+        results["failed_steps"].append({"step": name, "error": repr(e)})
+
+
+def print_summary(results, elapsed):
+    rows = sum(r["rows"] or 0 for r in results["success"])
+    print("=" * 60)
+    print("ETL SUMMARY")
+    print("=" * 60)
+    for r in sorted(results["success"], key=lambda r: r["path"]):
+        print(f"✓ {r['kind']:<9} {os.path.basename(r['path'])}: {r['rows'] or 0:,} rows in {r['seconds']:.2f}s")
+    for r in sorted(results["failed"], key=lambda r: r["path"]):
+        print(f"✗ {r['kind']:<9} {os.path.basename(r['path'])}: {r['error']}")
+    for r in results.get("failed_steps", []):
+        print(f"✗ step      {r['step']}: {r['error']}")
+    print(f"{len(results['success'])} jobs succeeded, {len(results['failed'])} failed, "
+          f"{len(results['skipped'])} skipped as unchanged, "
+          f"{rows:,} rows in {elapsed:.2f}s")
+
+
+def run_pipeline(sources=None, workers=None, force=False, manifest_path=DEFAULT_MANIFEST_PATH,
+                 async_ingest=False):
+    """
+    Resolve dimensions, then load every changed fact file in parallel; returns the summary.
+
+    Files the manifest shows as already loaded unchanged are skipped unless force is set.
+    async_ingest makes each job overlap CSV parsing with asyncpg COPY writes.
+    """
+    start = time.perf_counter()
+    jobs = build_jobs(sources)
+    for job in jobs:
+        job["async_ingest"] = async_ingest
+
+    manifest = LoadManifest(manifest_path) if manifest_path else None
+    skipped = []
+    if manifest is not None and not force:
+        jobs, skipped = skip_unchanged(jobs, manifest)
+
+    if jobs:
+        resolve_dimensions(jobs)
+    results = run_jobs(jobs, workers=workers)
+    results["skipped"] = skipped
+    results["failed_steps"] = []
+
+    if manifest is not None:
+        for result in results["success"]:
+            manifest.record(result["path"], TARGET_TABLES[result["kind"]], result["rows"])
+        manifest.save()
+
+    if results["success"]:
+        # Derived tables first, so caches keyed on the new data version never see stale aggregates
+        if any(r["kind"] == "facility" for r in results["success"]):
+            run_step(results, "coverage", run_coverage)
+        if any(r["kind"] == "outbreak" for r in results["success"]):
+            run_step(results, "outbreak_alerts", run_detector)
+        run_step(results, "rollups", refresh_rollups)
+        run_step(results, "data_version", lambda: record_data_version(results))
+
+        if parquet_export.available():
+            run_step(results, "snapshot", parquet_export.export_snapshot)
+        else:
+            print("Skipping Parquet snapshot: pyarrow is not installed")
+        run_step(results, "features", build_features)
+    print_summary(results, time.perf_counter() - start)
+    return results
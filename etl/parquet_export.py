@@ -0,0 +1,312 @@
+"""
+Versioned Parquet snapshots of the warehouse fact tables.
+
+Layout (hive partitions, one folder per warehouse data version):
+
+  data/warehouse/
+    LATEST                        -> "v12"
+    v12/_snapshot.json            tables, row counts, partitioning, export time
+    v12/disease_indicators/disease=Malaria/year=2015/part-0.parquet
+    v12/mortality_statistics/country=NGA/part-0.parquet
+    ...
+
+Usage:
+  python -m etl.parquet_export            # export if the current data version has no snapshot yet
+  python -m etl.parquet_export --force    # re-export anyway
+
+Reading (memory-mapped, partition-pruned):
+  from etl.parquet_export import read_frame
+  df = read_frame("disease_indicators", filters={"disease": "Malaria"})
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from sqlalchemy import BigInteger, Date, DateTime, Float, Integer, select
+from database.data_version import current_data_version
+from database.db_connection import get_engine, streaming_connection
+from database.models.causes_of_death import CauseOfDeath
+from database.models.disease_dim import Disease
+from database.models.disease_indicator import DiseaseIndicator
+from database.models.geo_unit import GeoAdminUnit
+from database.models.health_facilities import HealthFacility
+from database.models.mortality_statistic import MortalityStatistic
+from database.models.outbreak_reports import OutbreakReport
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency; see requirements.txt
+    pa = None
+
+DEFAULT_SNAPSHOT_ROOT = "data/warehouse"
+DEFAULT_KEEP = 2
+BATCH_ROWS = 50000
+
+
+def _fact_columns(model):
+    # PostGIS columns stay out of the snapshot; latitude/longitude carry the position
+    return [c for c in model.__table__.columns if c.name != "location"]
+
+
+def snapshot_queries():
+    """Table name -> (SELECT, hive partition columns). Dimension names are denormalized in."""
+    return {
+        "disease_indicators": (
+            select(*_fact_columns(DiseaseIndicator), Disease.name.label("disease"))
+            .outerjoin(Disease, Disease.id == DiseaseIndicator.disease_id),
+            ["disease", "year"],
+        ),
+        "mortality_statistics": (
+            select(*_fact_columns(MortalityStatistic), CauseOfDeath.name.label("cause"))
+            .outerjoin(CauseOfDeath, CauseOfDeath.id == MortalityStatistic.cause_id),
+            ["country"],
+        ),
+        "outbreak_reports": (
+            select(*_fact_columns(OutbreakReport)),
+            ["disease_name"],
+        ),
+        "health_facilities_master": (
+            select(
+                *_fact_columns(HealthFacility),
+                GeoAdminUnit.state_name,
+                GeoAdminUnit.lga_name,
+                GeoAdminUnit.ward_name,
+            ).outerjoin(GeoAdminUnit, GeoAdminUnit.id == HealthFacility.geo_admin_unit_id),
+            ["state_name"],
+        ),
+    }
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet snapshots need pyarrow (pip install pyarrow)")
+
+
+def available() -> bool:
+    return pa is not None
+
+
+def _arrow_type(sql_type):
+    if isinstance(sql_type, (Integer, BigInteger)):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    if sql_type.__class__.__name__ == "JSON":
+        return None  # raw properties blobs are not exported
+    return pa.string()
+
+
+def arrow_schema(stmt, partition_columns):
+    """
+    Arrow schema for a SELECT, derived from the SQL column types (not from data,
+    so an all-NULL batch cannot change a column's type).
+
+    Non-partition strings are dictionary-encoded: repeated codes and names are
+    stored once per row group and come back to pandas as categoricals.
+    """
+    fields = []
+    for column in stmt.selected_columns:
+        arrow_type = _arrow_type(column.type)
+        if arrow_type is None:
+            continue
+        if arrow_type == pa.string() and column.name not in partition_columns:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _record_batches(result, schema):
+    names = schema.names
+    positions = [list(result.keys()).index(name) for name in names]
+    for partition in result.partitions(BATCH_ROWS):
+        columns = list(zip(*partition))
+        arrays = []
+        for field, position in zip(schema, positions):
+            values = columns[position]
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_table(stmt, partition_columns, directory) -> int:
+    """Stream one SELECT from a server-side cursor into a hive-partitioned Parquet dataset."""
+    schema = arrow_schema(stmt, partition_columns)
+    partitioning = ds.partitioning(
+        pa.schema([schema.field(name) for name in partition_columns]), flavor="hive"
+    )
+    os.makedirs(directory, exist_ok=True)
+    # Full schema (partition columns included) for readers, even when the table is empty
+    pq.write_metadata(
+        schema.with_metadata({"partitioning": json.dumps(partition_columns)}),
+        os.path.join(directory, "_common_metadata"),
+    )
+    written = 0
+
+    def counted(batches):
+        nonlocal written
+        for batch in batches:
+            written += batch.num_rows
+            yield batch
+
+    with streaming_connection("ingest") as conn:
+        result = conn.execute(stmt)
+        ds.write_dataset(
+            counted(_record_batches(result, schema)),
+            directory,
+            schema=schema,
+            format="parquet",
+            partitioning=partitioning,
+            basename_template="part-{i}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(use_dictionary=True, compression="zstd"),
+            max_rows_per_group=BATCH_ROWS,
+        )
+    return written
+
+
+def _latest_file(root):
+    return os.path.join(root, "LATEST")
+
+
+def latest_snapshot(root=DEFAULT_SNAPSHOT_ROOT):
+    """Folder of the newest complete snapshot, or None."""
+    try:
+        with open(_latest_file(root)) as f:
+            return os.path.join(root, f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def prune_snapshots(root, keep):
+    """Delete all but the newest `keep` v<N> folders under root."""
+    snapshots = sorted(
+        (name for name in os.listdir(root) if name.startswith("v") and name[1:].isdigit()),
+        key=lambda name: int(name[1:]),
+    )
+    for name in snapshots[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def publish_snapshot(root, name, building, keep):
+    """
+    Move a fully written snapshot folder into place as root/name, point LATEST
+    at it and prune old versions. Readers that go through LATEST never see a
+    half-written snapshot.
+    """
+    target = os.path.join(root, name)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(building, target)
+    tmp_latest = f"{_latest_file(root)}.tmp"
+    with open(tmp_latest, "w") as f:
+        f.write(name)
+    os.replace(tmp_latest, _latest_file(root))
+    prune_snapshots(root, keep)
+    return target
+
+
+def export_snapshot(root=DEFAULT_SNAPSHOT_ROOT, force=False, keep=DEFAULT_KEEP):
+    """
+    Write every fact table as Parquet under root/v<data version>; returns that folder.
+
+    Nothing is exported when a snapshot for the current data version already
+    exists (unless force). The snapshot is built in a temp folder and then
+    published (see publish_snapshot); only the newest `keep` are kept.
+    """
+    _require_pyarrow()
+    with get_engine("ingest").connect() as conn:
+        version = current_data_version(conn)
+
+    name = f"v{version}"
+    target = os.path.join(root, name)
+    if os.path.isdir(target) and not force:
+        print(f"Parquet snapshot {target} is already current")
+        return target
+
+    start = time.perf_counter()
+    building = f"{target}.tmp"
+    shutil.rmtree(building, ignore_errors=True)
+    os.makedirs(building)
+
+    tables = {}
+    for table, (stmt, partition_columns) in snapshot_queries().items():
+        rows = export_table(stmt, partition_columns, os.path.join(building, table))
+        tables[table] = {"rows": rows, "partitioning": partition_columns}
+        print(f"Exported {rows:,} rows of {table}")
+
+    with open(os.path.join(building, "_snapshot.json"), "w") as f:
+        json.dump({
+            "data_version": version,
+            "exported_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "tables": tables,
+        }, f, indent=2)
+
+    publish_snapshot(root, name, building, keep)
+    print(f"Parquet snapshot {target} written in {time.perf_counter() - start:.2f}s")
+    return target
+
+
+def open_dataset(table: str, root=DEFAULT_SNAPSHOT_ROOT, snapshot=None):
+    """
+    pyarrow Dataset over one table of a snapshot (default: the latest).
+
+    Files are memory-mapped, and filters on partition columns skip whole
+    folders, so repeated reads cost neither a database round trip nor CSV parsing.
+    """
+    _require_pyarrow()
+    snapshot = snapshot or latest_snapshot(root)
+    if snapshot is None:
+        raise FileNotFoundError(f"No Parquet snapshot under {root}; run python -m etl.parquet_export")
+    directory = os.path.join(snapshot, table)
+    schema = pq.read_schema(os.path.join(directory, "_common_metadata"))
+    partition_columns = json.loads(schema.metadata[b"partitioning"])
+    return ds.dataset(
+        directory,
+        schema=schema.remove_metadata(),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([schema.field(c) for c in partition_columns]), flavor="hive"),
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def _filter_expression(filters):
+    """{'disease': 'Malaria', 'year': [2015, 2016]} -> pyarrow expression (equality / membership, ANDed)."""
+    expression = None
+    for column, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            condition = ds.field(column).isin(list(value))
+        else:
+            condition = ds.field(column) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_table(table: str, filters=None, columns=None, **kwargs):
+    """Arrow table for a snapshot table; `filters` is a dict or a pyarrow expression."""
+    if isinstance(filters, dict) or filters is None:
+        filters = _filter_expression(filters)
+    return open_dataset(table, **kwargs).to_table(columns=columns, filter=filters)
+
+
+def read_frame(table: str, filters=None, columns=None, **kwargs):
+    """pandas DataFrame for a snapshot table (dictionary-encoded strings come back as categoricals)."""
+    return read_table(table, filters=filters, columns=columns, **kwargs).to_pandas()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the warehouse fact tables to versioned Parquet")
+    parser.add_argument("--root", default=DEFAULT_SNAPSHOT_ROOT)
+    parser.add_argument("--force", action="store_true", help="Re-export even if this data version has a snapshot")
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP, help="Number of snapshots to keep")
+    args = parser.parse_args()
+    export_snapshot(root=args.root, force=args.force, keep=args.keep)
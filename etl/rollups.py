@@ -0,0 +1,36 @@
+import time
+from sqlalchemy import text
+from database.db_connection import get_engine
+from database.models.rollups import ROLLUP_TABLES
+
+
+def refresh_rollups(concurrently: bool = True) -> dict:
+    """
+    Recompute every rollup materialized view; returns {view: seconds}.
+
+    CONCURRENTLY keeps the old contents readable by the API while the new ones
+    are built (it relies on each view's unique index). A view that has never
+    been populated can only be refreshed the blocking way, so that case falls
+    back automatically. Each refresh commits on its own.
+    """
+    timings = {}
+    engine = get_engine("ingest")
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in ROLLUP_TABLES:
+            start = time.perf_counter()
+            populated = conn.execute(
+                text("SELECT relispopulated FROM pg_class WHERE relname = :name AND relkind = 'm'"),
+                {"name": table.name},
+            ).scalar()
+            if populated is None:
+                print(f"Skipping rollup {table.name}: materialized view not found (run alembic upgrade head)")
+                continue
+            mode = "CONCURRENTLY " if concurrently and populated else ""
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW {mode}{table.name}"))
+            timings[table.name] = time.perf_counter() - start
+            print(f"Refreshed rollup {table.name} in {timings[table.name]:.2f}s")
+    return timings
+
+
+if __name__ == "__main__":
+    refresh_rollups()
@@ -0,0 +1,96 @@
+"""
+CSV sources that may be compressed: plain files, .gz files and members of .zip archives.
+
+pandas reads .gz files by path. Archive members are read as decompressing
+streams straight from the archive, so they never need to be extracted to disk.
+A member is named 'archive.zip::folder/file.csv'.
+"""
+import os
+import zipfile
+from contextlib import contextmanager, nullcontext
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+
+MEMBER_SEPARATOR = "::"
+COMPRESSED_SUFFIX = ".gz"
+
+
+class ArchiveMember:
+    """One file inside a .zip archive."""
+
+    def __init__(self, archive, member: str):
+        self.archive = Path(archive)
+        self.member = member
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name
+
+    def __str__(self) -> str:
+        return f"{os.path.normpath(self.archive)}{MEMBER_SEPARATOR}{self.member}"
+
+    def __repr__(self) -> str:
+        return f"ArchiveMember({str(self)!r})"
+
+    def exists(self) -> bool:
+        try:
+            self.info()
+        except (OSError, KeyError, zipfile.BadZipFile):
+            return False
+        return True
+
+    def info(self) -> zipfile.ZipInfo:
+        """Central-directory entry: CRC-32 and uncompressed size, read without decompressing anything."""
+        with zipfile.ZipFile(self.archive) as archive:
+            return archive.getinfo(self.member)
+
+    @contextmanager
+    def open(self):
+        with zipfile.ZipFile(self.archive) as archive, archive.open(self.member) as stream:
+            yield stream
+
+
+def as_source(path):
+    """Path for plain and .gz files, ArchiveMember for 'archive.zip::member' names."""
+    if isinstance(path, ArchiveMember):
+        return path
+    archive, separator, member = str(path).partition(MEMBER_SEPARATOR)
+    return ArchiveMember(archive, member) if separator else Path(path)
+
+
+def source_name(source) -> str:
+    """File name without the compression suffix: 'PHC.csv' for PHC.csv, PHC.csv.gz and a.zip::dir/PHC.csv."""
+    name = as_source(source).name
+    return name[:-len(COMPRESSED_SUFFIX)] if name.lower().endswith(COMPRESSED_SUFFIX) else name
+
+
+def open_source(source):
+    """Context manager yielding something pd.read_csv can read (a path, or a stream for archive members)."""
+    source = as_source(source)
+    return source.open() if isinstance(source, ArchiveMember) else nullcontext(source)
+
+
+def rewind(handle):
+    """Start a stream from open_source over again (paths need nothing)."""
+    if hasattr(handle, "seek"):
+        handle.seek(0)
+
+
+def list_sources(path, pattern: str = "*.csv") -> list:
+    """
+    CSV sources under `path` whose file name matches `pattern`.
+
+    A directory yields its matching files, compressed (pattern + '.gz') or
+    not; a .zip archive yields its matching members.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return sorted(set(path.glob(pattern)) | set(path.glob(pattern + COMPRESSED_SUFFIX)))
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            members = [
+                info.filename for info in archive.infolist()
+                if not info.is_dir() and fnmatchcase(PurePosixPath(info.filename).name, pattern)
+            ]
+        return [ArchiveMember(path, member) for member in sorted(members)]
+    return []
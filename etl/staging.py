@@ -0,0 +1,42 @@
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from .bulk_copy import copy_dataframe, quote_ident
+
+
+def merge_frame(db: Session, df: pd.DataFrame, target_table: str) -> int:
+    """
+    Insert the rows of `df` whose natural key is not yet in `target_table`.
+
+    The frame is COPYed into a temp staging table shaped like the target's
+    columns, then merged with INSERT ... SELECT ... ON CONFLICT DO NOTHING
+    against the target's natural-key unique index. Existing rows are never
+    read back into Python, so dedupe costs O(file) index probes instead of
+    O(table) memory. Duplicate keys inside the file are skipped the same way.
+
+    Runs inside the session's transaction; the caller commits.
+    Returns the number of rows inserted.
+    """
+    staging = quote_ident(f"stage_{target_table}")
+    target = quote_ident(target_table)
+    columns = ", ".join(quote_ident(c) for c in df.columns)
+
+    db.execute(text(
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+        f"SELECT {columns} FROM {target} WITH NO DATA"
+    ))
+
+    cursor = db.connection().connection.cursor()
+    try:
+        copy_dataframe(cursor, df, f"stage_{target_table}")
+    finally:
+        cursor.close()
+
+    result = db.execute(text(
+        f"INSERT INTO {target} ({columns}) "
+        f"SELECT {columns} FROM {staging} "
+        f"ON CONFLICT DO NOTHING"
+    ))
+    # Schema-qualified so this can only ever drop the temp table, never a permanent one of the same name
+    db.execute(text(f"DROP TABLE pg_temp.{staging}"))
+    return result.rowcount
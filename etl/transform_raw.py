@@ -0,0 +1,184 @@
+"""
+Raw WHO GHO / HDX indicator exports -> data/processed/disease_indicators, in one batch.
+
+Replaces the per-dataset notebooks in data/scripts (malaria.ipynb,
+child_motality_indicators.ipynb, ...). Every raw file with a GHO indicator
+column goes through the same vectorized steps:
+  - the HDX hashtag row (#indicator+code, #indicator+name, ...) is dropped
+  - "GHO (CODE)"-style and HDX lowercase headers get the loader's column names
+  - a missing `numeric` is parsed from `value`, including space-grouped
+    numbers such as "16 702 261" and estimates such as "0.45 [0.36 - 0.58]"
+  - SEX dimensions are shortened (SEX / SEX_FMLE -> Sex / FMLE); rows with no
+    dimension at all are national totals and get Sex / BTSX / Both sexes
+Files are transformed in parallel. Raw files with identical content (the
+"(1)" copies) are transformed once, and an output is only rewritten when its
+content changed, so the load manifest keeps skipping it in etl.load_all.
+
+Usage:
+  python -m etl.transform_raw
+  python -m etl.transform_raw --raw data/raw/Disease_and_Mobidity_data --output /tmp/indicators --workers 1
+"""
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import pandas as pd
+from .load_disease_indicators import INDICATOR_COLUMN_ALIASES, INTEGER_FIELDS
+from .manifest import file_sha256
+from .normalize import DIGIT_SEPARATOR, GROUPED_NUMBER, drop_hashtag_rows, normalize_frame
+from .sources import ArchiveMember, list_sources, open_source, source_name
+
+DEFAULT_RAW_DIRS = ["data/raw", "data/raw/Disease_and_Mobidity_data"]
+DEFAULT_OUTPUT_DIR = "data/processed/disease_indicators"
+
+# Leading number of a GHO value: "16 702 261", "13.19", "0.45 [0.36 - 0.58]"
+LEADING_NUMBER = rf"^\s*({GROUPED_NUMBER.pattern})"
+# Browser download copies: "name(1).csv"
+COPY_SUFFIX = re.compile(r"\(\d+\)(?=\.csv$)")
+
+DIMENSION_COLUMNS = ["dimension_type", "dimension_code", "dimension_name"]
+TOTAL_DIMENSION = ["Sex", "BTSX", "Both sexes"]
+
+
+def parse_grouped_numbers(series: pd.Series) -> pd.Series:
+    """Leading number of each value with digit-group separators removed; non-numeric values become missing."""
+    digits = series.astype("string").str.extract(LEADING_NUMBER, expand=False)
+    return pd.to_numeric(digits.str.replace(DIGIT_SEPARATOR, "", regex=True), errors="coerce")
+
+
+def transform_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """One raw GHO / HDX frame (read as text) -> the processed disease_indicators layout."""
+    df = drop_hashtag_rows(df)
+    out = normalize_frame(df, INDICATOR_COLUMN_ALIASES, numeric_fields={"numeric"}, integer_fields=INTEGER_FIELDS)
+    out["numeric"] = out["numeric"].fillna(parse_grouped_numbers(out["value"]))
+
+    sex = out["dimension_type"].str.upper().eq("SEX").fillna(False).astype(bool)
+    out.loc[sex, "dimension_type"] = "Sex"
+    out.loc[sex, "dimension_code"] = out.loc[sex, "dimension_code"].str.upper().str.replace(r"^SEX_", "", regex=True)
+    total = out[DIMENSION_COLUMNS].isna().all(axis=1)
+    out.loc[total, DIMENSION_COLUMNS] = TOTAL_DIMENSION
+
+    return out[out["indicator_code"].notna()].reset_index(drop=True)
+
+
+def is_indicator_file(source) -> bool:
+    with open_source(source) as handle:
+        header = pd.read_csv(handle, nrows=0).columns
+    return any(alias in header for alias in INDICATOR_COLUMN_ALIASES["indicator_code"])
+
+
+def content_key(source):
+    """Identity of a raw file's content: CRC-32 + size for archive members, else SHA-256."""
+    if isinstance(source, ArchiveMember):
+        info = source.info()
+        return ("crc32", info.CRC, info.file_size)
+    return ("sha256", file_sha256(source))
+
+
+def output_path(output_dir, name: str) -> Path:
+    """Where a raw file's output goes: an existing 'cleaned_' output of the same name is kept in place."""
+    output_dir = Path(output_dir)
+    cleaned = output_dir / f"cleaned_{name}"
+    return cleaned if cleaned.exists() else output_dir / name
+
+
+def build_jobs(raw_paths=None, output_dir=DEFAULT_OUTPUT_DIR, pattern="*.csv"):
+    """One job per distinct raw indicator file: {'source', 'output'}."""
+    sources = [source for path in (raw_paths or DEFAULT_RAW_DIRS) for source in list_sources(path, pattern)]
+    # Originals before their "(1)" copies, so duplicates keep the original's name
+    sources.sort(key=lambda s: (bool(COPY_SUFFIX.search(source_name(s))), source_name(s)))
+
+    jobs, seen_content, outputs = [], set(), {}
+    for source in sources:
+        if not is_indicator_file(source):
+            continue
+        key = content_key(source)
+        if key in seen_content:
+            continue
+        seen_content.add(key)
+        output = output_path(output_dir, source_name(source))
+        if output in outputs:
+            print(f"Skipping {source}: {outputs[output]} already writes {output}")
+            continue
+        outputs[output] = source
+        jobs.append({"source": source, "output": output})
+    return jobs
+
+
+def transform_file(job):
+    """Transform one raw file; the output is left untouched when its content would not change."""
+    start = time.perf_counter()
+    with open_source(job["source"]) as handle:
+        raw = pd.read_csv(handle, dtype=str)
+    df = transform_frame(raw)
+    text = df.to_csv(index=False)
+
+    output = Path(job["output"])
+    changed = not output.exists() or output.read_text() != text
+    if changed:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output.with_name(f"{output.name}.tmp")
+        tmp_path.write_text(text)
+        os.replace(tmp_path, output)
+    return {**job, "rows_in": len(raw), "rows": len(df), "changed": changed, "seconds": time.perf_counter() - start}
+
+
+def run_transforms(jobs, workers=None):
+    """Transform files across a process pool; workers <= 1 runs them in-process."""
+    results = {"success": [], "failed": []}
+
+    if workers is not None and workers <= 1:
+        for job in jobs:
+            try:
+                results["success"].append(transform_file(job))
+            except Exception as e:
+                results["failed"].append({**job, "error": repr(e)})
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(transform_file, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                results["success"].append(future.result())
+            except Exception as e:
+                results["failed"].append({**job, "error": repr(e)})
+    return results
+
+
+def print_summary(results, elapsed):
+    for r in sorted(results["success"], key=lambda r: str(r["output"])):
+        state = "written" if r["changed"] else "unchanged"
+        print(f"✓ {source_name(r['source'])} -> {r['output'].name}: {r['rows_in']:,} -> {r['rows']:,} rows, "
+              f"{state} in {r['seconds']:.2f}s")
+    for r in sorted(results["failed"], key=lambda r: str(r["output"])):
+        print(f"✗ {source_name(r['source'])}: {r['error']}")
+    written = sum(r["changed"] for r in results["success"])
+    print(f"{len(results['success'])} files transformed ({written} written, "
+          f"{len(results['success']) - written} unchanged), {len(results['failed'])} failed in {elapsed:.2f}s")
+
+
+def transform_all(raw_paths=None, output_dir=DEFAULT_OUTPUT_DIR, workers=None, pattern="*.csv"):
+    """Transform every raw indicator file under raw_paths (directories or .zip archives); returns the summary."""
+    start = time.perf_counter()
+    jobs = build_jobs(raw_paths, output_dir, pattern)
+    results = run_transforms(jobs, workers=workers)
+    print_summary(results, time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transform raw WHO GHO / HDX indicator files for the ETL")
+    parser.add_argument("--raw", action="append", default=None,
+                        help=f"Directory or .zip archive of raw files (repeatable; default: {' '.join(DEFAULT_RAW_DIRS)})")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="Folder the processed CSVs are written to")
+    parser.add_argument("--pattern", default="*.csv", help="Raw file name pattern")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Parallel file transforms (1 = run serially in-process)")
+    args = parser.parse_args()
+
+    results = transform_all(args.raw, args.output, workers=args.workers, pattern=args.pattern)
+    if results["failed"]:
+        raise SystemExit(1)
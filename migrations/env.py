@@ -19,7 +19,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 # --- Import your SQLAlchemy Base and DB URL ---
 from database.db_connection import Base, DATABASE_URL
-from database.models import disease_dim, disease_indicator, mortality_statistic, outbreak_reports, geo_unit, health_facilities
+from database.models import disease_dim, disease_indicator, mortality_statistic, outbreak_reports, geo_unit, health_facilities, data_version, ward_coverage, forecast, outbreak_epiweeks
 
 
 # --- Let Alembic know which metadata to use ---
@@ -28,6 +28,14 @@ target_metadata = Base.metadata
 # --- Inject your DB URL dynamically ---
 config.set_main_option("sqlalchemy.url", DATABASE_URL)
 
+# --- Database-only objects autogenerate must not drop ---
+# health_facilities_master.location exists only where PostGIS is installed (revision 5b1d08e3f6a9)
+UNMAPPED_OBJECTS = {("column", "location"), ("index", "ix_health_facilities_master_location")}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and (type_, name) in UNMAPPED_OBJECTS)
+
 
 # --- Run migrations offline ---
 def run_migrations_offline():
@@ -37,7 +45,8 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
-        user_module_prefix="geoalchemy2."
+        user_module_prefix="geoalchemy2.",
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -56,6 +65,7 @@ def run_migrations_online():
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,60 @@
+"""add geo_admin_unit natural key
+
+Revision ID: 081c5282fefc
+Revises: 6d78b3229a9d
+Create Date: 2026-10-16 09:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '081c5282fefc'
+down_revision: Union[str, Sequence[str], None] = '6d78b3229a9d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GEO_NATURAL_KEY = (
+    "country_code, coalesce(state_name, ''), coalesce(lga_name, ''), coalesce(ward_name, '')"
+)
+
+GEO_REFERENCES = [
+    ('health_facilities_master', 'geo_admin_unit_id'),
+    ('disease_indicators', 'geo_admin_unit_id'),
+    ('mortality_statistics', 'geo_admin_unit_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Collapse duplicate geo units created by the old per-row lookup onto the lowest id
+    op.execute(f"""
+        CREATE TEMP TABLE geo_admin_unit_duplicates ON COMMIT DROP AS
+        SELECT id, min(id) OVER (PARTITION BY {GEO_NATURAL_KEY}) AS keep_id
+        FROM geo_admin_unit
+    """)
+    for table, column in GEO_REFERENCES:
+        op.execute(f"""
+            UPDATE {table} AS t SET {column} = d.keep_id
+            FROM geo_admin_unit_duplicates AS d
+            WHERE t.{column} = d.id AND d.id <> d.keep_id
+        """)
+    op.execute("""
+        DELETE FROM geo_admin_unit AS g
+        USING geo_admin_unit_duplicates AS d
+        WHERE g.id = d.id AND d.id <> d.keep_id
+    """)
+
+    # NULL-safe unique key so loaders can INSERT ... ON CONFLICT DO NOTHING
+    op.execute(
+        f"CREATE UNIQUE INDEX ux_geo_admin_unit_natural_key ON geo_admin_unit ({GEO_NATURAL_KEY})"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_geo_admin_unit_natural_key', table_name='geo_admin_unit')
@@ -0,0 +1,34 @@
+"""add warehouse data versions
+
+Revision ID: 3c9e1f4b7a20
+Revises: a5625cd7362f
+Create Date: 2026-10-16 11:02:47.519304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f4b7a20'
+down_revision: Union[str, Sequence[str], None] = 'a5625cd7362f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('warehouse_data_versions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('loaded_at', sa.DateTime(), nullable=False),
+    sa.Column('files_loaded', sa.Integer(), nullable=False),
+    sa.Column('rows_loaded', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('warehouse_data_versions')
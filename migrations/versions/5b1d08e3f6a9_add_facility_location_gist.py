@@ -0,0 +1,47 @@
+"""add facility location with gist index
+
+Revision ID: 5b1d08e3f6a9
+Revises: e27b94d0c518
+Create Date: 2026-10-16 12:31:55.046172
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1d08e3f6a9'
+down_revision: Union[str, Sequence[str], None] = 'e27b94d0c518'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def postgis_available() -> bool:
+    bind = op.get_bind()
+    return bind.execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'")).first() is not None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not postgis_available():
+        # Radius / nearest search then runs in-process (analytics.facility_search.FacilityGridIndex)
+        print("PostGIS is not available; skipping health_facilities_master.location")
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    # Generated from latitude/longitude, so every load path (COPY, bulk insert) keeps it current
+    op.execute("""
+        ALTER TABLE health_facilities_master
+        ADD COLUMN location geography(Point, 4326)
+        GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography) STORED
+    """)
+    op.execute(
+        "CREATE INDEX ix_health_facilities_master_location ON health_facilities_master USING gist (location)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_health_facilities_master_location")
+    op.execute("ALTER TABLE health_facilities_master DROP COLUMN IF EXISTS location")
@@ -0,0 +1,76 @@
+"""add outbreak epiweeks and detector tables
+
+Revision ID: 7d3e5a91c0b4
+Revises: c81a4f0d2b59
+Create Date: 2026-10-16 23:31:07.442910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3e5a91c0b4'
+down_revision: Union[str, Sequence[str], None] = 'c81a4f0d2b59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbreak_epiweeks',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('disease_name', sa.String(), nullable=False),
+    sa.Column('country_code', sa.String(), nullable=False),
+    sa.Column('epiweek', sa.Date(), nullable=False),
+    sa.Column('weeks_covered', sa.Integer(), nullable=False),
+    sa.Column('new_cases', sa.Integer(), nullable=False),
+    sa.Column('new_deaths', sa.Integer(), nullable=False),
+    sa.Column('cum_cases', sa.Integer(), nullable=True),
+    sa.Column('cum_deaths', sa.Integer(), nullable=True),
+    sa.Column('report_id', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbreak_epiweeks_epiweek_brin', 'outbreak_epiweeks', ['epiweek'], unique=False, postgresql_using='brin')
+    op.create_index('ux_outbreak_epiweeks_series_week', 'outbreak_epiweeks', ['disease_name', 'country_code', 'epiweek'], unique=True)
+    op.create_table('outbreak_detector_state',
+    sa.Column('disease_name', sa.String(), nullable=False),
+    sa.Column('country_code', sa.String(), nullable=False),
+    sa.Column('last_report_id', sa.Integer(), nullable=False),
+    sa.Column('first_epiwk', sa.Date(), nullable=True),
+    sa.Column('last_epiwk', sa.Date(), nullable=True),
+    sa.Column('cum_cases', sa.Integer(), nullable=True),
+    sa.Column('cum_deaths', sa.Integer(), nullable=True),
+    sa.Column('weeks_seen', sa.Integer(), nullable=False),
+    sa.Column('ewma_mean', sa.Float(), nullable=False),
+    sa.Column('ewma_var', sa.Float(), nullable=False),
+    sa.Column('cusum', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('disease_name', 'country_code')
+    )
+    op.create_table('outbreak_alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('disease_name', sa.String(), nullable=False),
+    sa.Column('country_code', sa.String(), nullable=False),
+    sa.Column('epiweek', sa.Date(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('weekly_cases', sa.Float(), nullable=False),
+    sa.Column('expected', sa.Float(), nullable=False),
+    sa.Column('zscore', sa.Float(), nullable=False),
+    sa.Column('cusum', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_outbreak_alerts_epiweek'), 'outbreak_alerts', ['epiweek'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_outbreak_alerts_epiweek'), table_name='outbreak_alerts')
+    op.drop_table('outbreak_alerts')
+    op.drop_table('outbreak_detector_state')
+    op.drop_index('ux_outbreak_epiweeks_series_week', table_name='outbreak_epiweeks')
+    op.drop_index('ix_outbreak_epiweeks_epiweek_brin', table_name='outbreak_epiweeks', postgresql_using='brin')
+    op.drop_table('outbreak_epiweeks')
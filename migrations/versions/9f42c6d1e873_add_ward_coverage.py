@@ -0,0 +1,40 @@
+"""add ward coverage
+
+Revision ID: 9f42c6d1e873
+Revises: 5b1d08e3f6a9
+Create Date: 2026-10-16 13:20:14.660281
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f42c6d1e873'
+down_revision: Union[str, Sequence[str], None] = '5b1d08e3f6a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ward_coverage',
+    sa.Column('geo_admin_unit_id', sa.Integer(), nullable=False),
+    sa.Column('radius_km', sa.Float(), nullable=False),
+    sa.Column('nearest_functional_km', sa.Float(), nullable=True),
+    sa.Column('nearest_functional_facility_id', sa.Integer(), nullable=True),
+    sa.Column('facilities_within_radius', sa.Integer(), nullable=False),
+    sa.Column('functional_within_radius', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['geo_admin_unit_id'], ['geo_admin_unit.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('geo_admin_unit_id')
+    )
+    op.create_index(op.f('ix_ward_coverage_nearest_functional_km'), 'ward_coverage', ['nearest_functional_km'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_ward_coverage_nearest_functional_km'), table_name='ward_coverage')
+    op.drop_table('ward_coverage')
@@ -0,0 +1,55 @@
+"""add fact table natural keys
+
+Revision ID: a5625cd7362f
+Revises: 081c5282fefc
+Create Date: 2026-10-16 10:04:52.730115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5625cd7362f'
+down_revision: Union[str, Sequence[str], None] = '081c5282fefc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# NULL-safe natural keys; must match the Index definitions on the models
+NATURAL_KEYS = {
+    'disease_indicators': (
+        'ux_disease_indicators_natural_key',
+        "coalesce(disease_id, 0), coalesce(geo_admin_unit_id, 0), coalesce(indicator_code, ''), "
+        "coalesce(year, 0), coalesce(dimension_type, ''), coalesce(dimension_code, '')",
+    ),
+    'mortality_statistics': (
+        'ux_mortality_statistics_natural_key',
+        "coalesce(country, ''), coalesce(cause_id, 0), coalesce(geo_admin_unit_id, 0), "
+        "coalesce(year, 0), coalesce(gender, '')",
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (index_name, key) in NATURAL_KEYS.items():
+        # Keep the first copy of any rows loaded twice before the key existed
+        op.execute(f"""
+            DELETE FROM {table} WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, row_number() OVER (PARTITION BY {key} ORDER BY id) AS copy_number
+                    FROM {table}
+                ) AS ranked
+                WHERE copy_number > 1
+            )
+        """)
+        op.execute(f"CREATE UNIQUE INDEX {index_name} ON {table} ({key})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (index_name, _) in NATURAL_KEYS.items():
+        op.drop_index(index_name, table_name=table)
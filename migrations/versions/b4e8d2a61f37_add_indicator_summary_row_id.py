@@ -0,0 +1,72 @@
+"""add row_id to mv_indicator_summary
+
+Revision ID: b4e8d2a61f37
+Revises: 7d3e5a91c0b4
+Create Date: 2026-10-16 18:05:41.930271
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8d2a61f37'
+down_revision: Union[str, Sequence[str], None] = '7d3e5a91c0b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same rows as revision e27b94d0c518, numbered in the API's sort order so
+# /rollups/indicators can page on row_id (keyset) like the other list endpoints.
+SUMMARY_QUERY = """
+    SELECT
+        i.disease_id,
+        d.name AS disease_name,
+        i.indicator_code,
+        max(i.indicator_name) AS indicator_name,
+        i.year,
+        CASE WHEN upper(i.dimension_type) = 'SEX'
+             THEN regexp_replace(upper(i.dimension_code), '^SEX_', '')
+             ELSE 'BTSX' END AS sex,
+        count(*) AS value_count,
+        avg(i.numeric) AS value_avg,
+        min(i.numeric) AS value_min,
+        max(i.numeric) AS value_max
+    FROM disease_indicators AS i
+    JOIN diseases AS d ON d.id = i.disease_id
+    WHERE i.indicator_code IS NOT NULL
+      AND i.year IS NOT NULL
+      AND (i.dimension_type IS NULL
+           OR upper(i.dimension_type) = 'UNKNOWN'
+           OR (upper(i.dimension_type) = 'SEX' AND i.dimension_code IS NOT NULL))
+    GROUP BY 1, 2, 3, 5, 6
+"""
+
+NUMBERED_QUERY = f"""
+    SELECT
+        row_number() OVER (ORDER BY s.disease_name, s.indicator_code, s.year, s.sex, s.disease_id)::integer AS row_id,
+        s.*
+    FROM ({SUMMARY_QUERY}) AS s
+"""
+
+
+def create_view(query: str, row_id: bool) -> None:
+    op.execute(f"CREATE MATERIALIZED VIEW mv_indicator_summary AS {query} WITH DATA")
+    op.execute("CREATE UNIQUE INDEX ux_mv_indicator_summary ON mv_indicator_summary (disease_id, indicator_code, year, sex)")
+    op.execute("CREATE INDEX ix_mv_indicator_summary_disease_name ON mv_indicator_summary (disease_name, indicator_code)")
+    if row_id:
+        op.execute("CREATE UNIQUE INDEX ux_mv_indicator_summary_row_id ON mv_indicator_summary (row_id)")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_indicator_summary")
+    create_view(NUMBERED_QUERY, row_id=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_indicator_summary")
+    create_view(SUMMARY_QUERY, row_id=False)
@@ -0,0 +1,47 @@
+"""add forecasts
+
+Revision ID: c81a4f0d2b59
+Revises: 9f42c6d1e873
+Create Date: 2026-10-16 23:12:41.308517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81a4f0d2b59'
+down_revision: Union[str, Sequence[str], None] = '9f42c6d1e873'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('forecasts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('series_key', sa.String(), nullable=False),
+    sa.Column('series_hash', sa.String(length=40), nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('disease', sa.String(), nullable=True),
+    sa.Column('indicator_code', sa.String(), nullable=True),
+    sa.Column('dimension_code', sa.String(), nullable=True),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('ds', sa.Date(), nullable=False),
+    sa.Column('yhat', sa.Float(), nullable=True),
+    sa.Column('yhat_lower', sa.Float(), nullable=True),
+    sa.Column('yhat_upper', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_forecasts_disease'), 'forecasts', ['disease'], unique=False)
+    op.create_index(op.f('ix_forecasts_series_key'), 'forecasts', ['series_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_forecasts_series_key'), table_name='forecasts')
+    op.drop_index(op.f('ix_forecasts_disease'), table_name='forecasts')
+    op.drop_table('forecasts')
@@ -0,0 +1,103 @@
+"""add rollup materialized views
+
+Revision ID: e27b94d0c518
+Revises: 3c9e1f4b7a20
+Create Date: 2026-10-16 11:47:09.208815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e27b94d0c518'
+down_revision: Union[str, Sequence[str], None] = '3c9e1f4b7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Dashboard aggregates; etl.rollups refreshes them after every load.
+# Each view has a plain-column unique index so REFRESH ... CONCURRENTLY works.
+ROLLUP_VIEWS = {
+    # Indicator values per disease / indicator / year / sex. Rows broken down by
+    # other dimensions (age group, residence area, ...) are left out; rows with
+    # no dimension count as both sexes.
+    'mv_indicator_summary': (
+        """
+        SELECT
+            i.disease_id,
+            d.name AS disease_name,
+            i.indicator_code,
+            max(i.indicator_name) AS indicator_name,
+            i.year,
+            CASE WHEN upper(i.dimension_type) = 'SEX'
+                 THEN regexp_replace(upper(i.dimension_code), '^SEX_', '')
+                 ELSE 'BTSX' END AS sex,
+            count(*) AS value_count,
+            avg(i.numeric) AS value_avg,
+            min(i.numeric) AS value_min,
+            max(i.numeric) AS value_max
+        FROM disease_indicators AS i
+        JOIN diseases AS d ON d.id = i.disease_id
+        WHERE i.indicator_code IS NOT NULL
+          AND i.year IS NOT NULL
+          AND (i.dimension_type IS NULL
+               OR upper(i.dimension_type) = 'UNKNOWN'
+               OR (upper(i.dimension_type) = 'SEX' AND i.dimension_code IS NOT NULL))
+        GROUP BY 1, 2, 3, 5, 6
+        """,
+        'disease_id, indicator_code, year, sex',
+    ),
+    # National causes of death ranked within each country / year / gender
+    'mv_top_causes_of_death': (
+        """
+        SELECT
+            m.country,
+            m.year,
+            m.gender,
+            m.cause_id,
+            c.name AS cause_name,
+            m.deaths,
+            rank() OVER (PARTITION BY m.country, m.year, m.gender ORDER BY m.deaths DESC NULLS LAST) AS cause_rank
+        FROM mortality_statistics AS m
+        JOIN causes_of_death AS c ON c.id = m.cause_id
+        WHERE m.geo_admin_unit_id IS NULL
+          AND m.country IS NOT NULL
+          AND m.year IS NOT NULL
+          AND m.gender IS NOT NULL
+        """,
+        'country, year, gender, cause_id',
+    ),
+    # Facility counts per state / LGA / functional status
+    'mv_facility_counts': (
+        """
+        SELECT
+            coalesce(g.state_name, 'Unknown') AS state_name,
+            coalesce(g.lga_name, 'Unknown') AS lga_name,
+            coalesce(f.functional_status, 'Unknown') AS functional_status,
+            count(*) AS facility_count
+        FROM health_facilities_master AS f
+        LEFT JOIN geo_admin_unit AS g ON g.id = f.geo_admin_unit_id
+        GROUP BY 1, 2, 3
+        """,
+        'state_name, lga_name, functional_status',
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for view, (query, unique_columns) in ROLLUP_VIEWS.items():
+        op.execute(f"CREATE MATERIALIZED VIEW {view} AS {query} WITH DATA")
+        op.execute(f"CREATE UNIQUE INDEX ux_{view} ON {view} ({unique_columns})")
+
+    op.execute("CREATE INDEX ix_mv_indicator_summary_disease_name ON mv_indicator_summary (disease_name, indicator_code)")
+    op.execute("CREATE INDEX ix_mv_top_causes_of_death_rank ON mv_top_causes_of_death (country, year, gender, cause_rank)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for view in reversed(list(ROLLUP_VIEWS)):
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view}")
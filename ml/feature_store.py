@@ -0,0 +1,334 @@
+"""
+Wide feature matrices for model training, built once per warehouse data version.
+
+The long fact tables are pivoted to one row per (entity, year) and one column
+per feature, where an entity is a country (ISO3) or, at the "lga" level, a
+"State/LGA" pair:
+
+  indicator:<indicator_code>:<dimension_code|ALL>   mean disease_indicators.numeric
+  mortality:<cause>:<gender>                        mortality_statistics.deaths
+  outbreak:<disease>:cases|deaths|reports           outbreak_epiweeks increments, by year of the epi week
+
+Layout (one folder per data version, published through LATEST):
+
+  data/features/
+    LATEST                     -> "v12"
+    v12/country/features.npy   float32 (rows, columns), NaN where missing
+    v12/country/rows.npy       int32 (rows, 2): entity position, year
+    v12/country/meta.json      data version, entities, column metadata
+
+Usage:
+  python -m ml.feature_store             # build for the current data version (no-op if it exists)
+  python -m ml.feature_store --force
+
+  from ml.feature_store import load_matrix
+  features = load_matrix("country")             # reads meta.json only
+  X = features.select(prefix="indicator:")      # memory-maps features.npy on first use
+  df = features.to_frame(entities=["NGA"], years=range(2010, 2020))
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from functools import cached_property
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, Integer, cast, extract, func, literal, or_, select, union_all
+from database.data_version import current_data_version
+from database.models.causes_of_death import CauseOfDeath
+from database.models.disease_indicator import DiseaseIndicator
+from database.models.geo_unit import GeoAdminUnit
+from database.models.health_facilities import HealthFacility  # noqa: F401 (GeoAdminUnit relationship target)
+from database.models.mortality_statistic import MortalityStatistic
+from database.models.outbreak_epiweeks import OutbreakEpiweek
+from etl.parquet_export import latest_snapshot, publish_snapshot
+
+DEFAULT_FEATURE_ROOT = "data/features"
+DEFAULT_KEEP = 2
+LEVELS = ("country", "lga")
+# The WHO indicator files are national (..._nga.csv); rows without a geo unit belong to Nigeria
+INDICATOR_COUNTRY = "NGA"
+
+
+def _entity(level, country):
+    if level == "country":
+        return country
+    return func.concat(GeoAdminUnit.state_name, "/", GeoAdminUnit.lga_name)
+
+
+def _level_filter(level, model):
+    """Rows recorded at the level's granularity (national rows have no geo unit or a country-level one)."""
+    if level == "country":
+        return or_(model.geo_admin_unit_id.is_(None), GeoAdminUnit.adm_level == 0)
+    return GeoAdminUnit.adm_level == 2
+
+
+def indicator_features(level):
+    entity = _entity(level, func.coalesce(GeoAdminUnit.country_code, INDICATOR_COUNTRY))
+    feature = func.concat(
+        "indicator:", DiseaseIndicator.indicator_code, ":", func.coalesce(DiseaseIndicator.dimension_code, "ALL")
+    )
+    return (
+        select(
+            entity.label("entity"),
+            DiseaseIndicator.year.label("year"),
+            feature.label("feature"),
+            cast(func.avg(DiseaseIndicator.numeric), Float).label("value"),
+        )
+        .outerjoin(GeoAdminUnit, GeoAdminUnit.id == DiseaseIndicator.geo_admin_unit_id)
+        .where(
+            DiseaseIndicator.numeric.isnot(None),
+            DiseaseIndicator.year.isnot(None),
+            DiseaseIndicator.indicator_code.isnot(None),
+            _level_filter(level, DiseaseIndicator),
+        )
+        .group_by(entity, DiseaseIndicator.year, feature)
+    )
+
+
+def mortality_features(level):
+    entity = _entity(level, MortalityStatistic.country)
+    feature = func.concat("mortality:", CauseOfDeath.name, ":", func.coalesce(MortalityStatistic.gender, "BTSX"))
+    return (
+        select(
+            entity.label("entity"),
+            MortalityStatistic.year.label("year"),
+            feature.label("feature"),
+            cast(func.sum(MortalityStatistic.deaths), Float).label("value"),
+        )
+        .join(CauseOfDeath, CauseOfDeath.id == MortalityStatistic.cause_id)
+        .outerjoin(GeoAdminUnit, GeoAdminUnit.id == MortalityStatistic.geo_admin_unit_id)
+        .where(
+            MortalityStatistic.deaths.isnot(None),
+            MortalityStatistic.year.isnot(None),
+            MortalityStatistic.country.isnot(None),
+            _level_filter(level, MortalityStatistic),
+        )
+        .group_by(entity, MortalityStatistic.year, feature)
+    )
+
+
+def outbreak_features(level):
+    """
+    Outbreak series carry only a country code, so they exist at the country level only.
+
+    Report totals are cumulative per reporting cycle, so the features sum the
+    per-report increments in outbreak_epiweeks (derived by
+    analytics.outbreak_detector), each in the year of the week it was reported for.
+    """
+    year = cast(extract("year", OutbreakEpiweek.epiweek), Integer)
+    measures = {
+        "cases": func.sum(OutbreakEpiweek.new_cases),
+        "deaths": func.sum(OutbreakEpiweek.new_deaths),
+        "reports": func.count(),
+    }
+    selects = []
+    for name, aggregate in measures.items():
+        feature = literal("outbreak:") + OutbreakEpiweek.disease_name + literal(f":{name}")
+        selects.append(
+            select(
+                OutbreakEpiweek.country_code.label("entity"),
+                year.label("year"),
+                feature.label("feature"),
+                cast(aggregate, Float).label("value"),
+            )
+            .group_by(OutbreakEpiweek.country_code, year, feature)
+        )
+    return selects
+
+
+def feature_query(level):
+    """All (entity, year, feature, value) facts for a level, as one UNION ALL."""
+    selects = [indicator_features(level), mortality_features(level)]
+    if level == "country":
+        selects.extend(outbreak_features(level))
+    return union_all(*selects)
+
+
+def pivot(long: pd.DataFrame):
+    """
+    Long (entity, year, feature, value) facts -> (float32 matrix, entities, rows, columns).
+
+    Vectorized: entities and features are factorized to integer codes, the
+    (entity, year) pairs are deduplicated with np.unique, and all values are
+    scattered into the matrix in one fancy-indexed assignment.
+    """
+    entity_codes, entities = pd.factorize(long["entity"], sort=True)
+    column_codes, columns = pd.factorize(long["feature"], sort=True)
+    years = long["year"].to_numpy(dtype=np.int64)
+
+    year_min = years.min() if len(years) else 0
+    span = (years.max() - year_min + 1) if len(years) else 1
+    keys, row_codes = np.unique(entity_codes * span + (years - year_min), return_inverse=True)
+    rows = np.column_stack([keys // span, keys % span + year_min]).astype(np.int32)
+
+    matrix = np.full((len(keys), len(columns)), np.nan, dtype=np.float32)
+    matrix[row_codes, column_codes] = long["value"].to_numpy(dtype=np.float32)
+    return matrix, list(entities), rows, list(columns)
+
+
+def column_metadata(columns, matrix) -> list:
+    non_null = np.count_nonzero(~np.isnan(matrix), axis=0)
+    metadata = []
+    for name, count in zip(columns, non_null):
+        source, rest = name.split(":", 1)
+        code, detail = rest.rsplit(":", 1)
+        metadata.append({"name": name, "source": source, "code": code, "detail": detail, "non_null": int(count)})
+    return metadata
+
+
+def write_matrix(directory, level, version, matrix, entities, rows, columns):
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "features.npy"), matrix)
+    np.save(os.path.join(directory, "rows.npy"), rows)
+    with open(os.path.join(directory, "meta.json"), "w") as f:
+        json.dump({
+            "data_version": version,
+            "level": level,
+            "built_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "shape": list(matrix.shape),
+            "dtype": str(matrix.dtype),
+            "entities": entities,
+            "columns": column_metadata(columns, matrix),
+        }, f)
+
+
+def build_features(root=DEFAULT_FEATURE_ROOT, levels=LEVELS, force=False, keep=DEFAULT_KEEP):
+    """
+    Build every level's matrix for the current data version under root/v<version>; returns that folder.
+
+    Nothing is rebuilt when the version already has matrices (unless force).
+    """
+    from database.db_connection import get_session
+
+    db = get_session("ingest")
+    try:
+        version = current_data_version(db)
+        name = f"v{version}"
+        target = os.path.join(root, name)
+        if os.path.isdir(target) and not force:
+            print(f"Feature matrices {target} are already current")
+            return target
+
+        start = time.perf_counter()
+        building = f"{target}.tmp"
+        shutil.rmtree(building, ignore_errors=True)
+        os.makedirs(building)
+        for level in levels:
+            long = pd.DataFrame(db.execute(feature_query(level)).all(), columns=["entity", "year", "feature", "value"])
+            matrix, entities, rows, columns = pivot(long)
+            write_matrix(os.path.join(building, level), level, version, matrix, entities, rows, columns)
+            print(f"Built {level} features: {matrix.shape[0]:,} rows x {matrix.shape[1]:,} columns")
+    finally:
+        db.close()
+
+    publish_snapshot(root, name, building, keep)
+    print(f"Feature matrices {target} written in {time.perf_counter() - start:.2f}s")
+    return target
+
+
+class FeatureMatrix:
+    """
+    One level's stored matrix. Opening it reads only meta.json; the arrays are
+    memory-mapped on first use, so a training run pays for the rows and
+    columns it actually touches.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.columns = [c["name"] for c in self.meta["columns"]]
+        self.entities = self.meta["entities"]
+        self._column_positions = {name: i for i, name in enumerate(self.columns)}
+
+    @property
+    def data_version(self) -> int:
+        return self.meta["data_version"]
+
+    @property
+    def shape(self):
+        return tuple(self.meta["shape"])
+
+    @cached_property
+    def values(self) -> np.ndarray:
+        return np.load(os.path.join(self.directory, "features.npy"), mmap_mode="r")
+
+    @cached_property
+    def rows(self) -> np.ndarray:
+        return np.load(os.path.join(self.directory, "rows.npy"))
+
+    def column_positions(self, columns=None, prefix=None) -> np.ndarray:
+        if columns is not None:
+            return np.array([self._column_positions[name] for name in columns], dtype=np.int64)
+        if prefix is not None:
+            return np.array([i for i, name in enumerate(self.columns) if name.startswith(prefix)], dtype=np.int64)
+        return np.arange(len(self.columns))
+
+    def row_positions(self, entities=None, years=None) -> np.ndarray:
+        mask = np.ones(len(self.rows), dtype=bool)
+        if entities is not None:
+            wanted = np.flatnonzero(np.isin(np.array(self.entities, dtype=object), list(entities)))
+            mask &= np.isin(self.rows[:, 0], wanted)
+        if years is not None:
+            mask &= np.isin(self.rows[:, 1], list(years))
+        return np.flatnonzero(mask)
+
+    def select(self, columns=None, prefix=None, entities=None, years=None) -> np.ndarray:
+        """float32 array of the chosen rows/columns (a copy; the stored matrix stays read-only)."""
+        rows = self.row_positions(entities, years)
+        return self.values[np.ix_(rows, self.column_positions(columns, prefix))]
+
+    def to_frame(self, columns=None, prefix=None, entities=None, years=None) -> pd.DataFrame:
+        """The same selection as a DataFrame indexed by (entity, year)."""
+        rows = self.row_positions(entities, years)
+        positions = self.column_positions(columns, prefix)
+        index = pd.MultiIndex.from_arrays(
+            [np.array(self.entities, dtype=object)[self.rows[rows, 0]], self.rows[rows, 1]],
+            names=["entity", "year"],
+        )
+        return pd.DataFrame(
+            self.values[np.ix_(rows, positions)], index=index, columns=[self.columns[i] for i in positions]
+        )
+
+
+class FeatureStore:
+    """Access to the stored feature matrices; matrices are opened lazily and cached per (version, level)."""
+
+    def __init__(self, root=DEFAULT_FEATURE_ROOT):
+        self.root = root
+        self._open = {}
+
+    def versions(self) -> list:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(int(name[1:]) for name in os.listdir(self.root) if name.startswith("v") and name[1:].isdigit())
+
+    def matrix(self, level="country", version=None) -> FeatureMatrix:
+        snapshot = os.path.join(self.root, f"v{version}") if version is not None else latest_snapshot(self.root)
+        if snapshot is None:
+            raise FileNotFoundError(f"No feature matrices under {self.root}; run python -m ml.feature_store")
+        key = (snapshot, level)
+        if key not in self._open:
+            self._open[key] = FeatureMatrix(os.path.join(snapshot, level))
+        return self._open[key]
+
+
+_default_store = FeatureStore()
+
+
+def load_matrix(level="country", version=None) -> FeatureMatrix:
+    """The latest (or given version's) matrix for a level from the default store."""
+    return _default_store.matrix(level, version)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build per-version feature matrices from the warehouse")
+    parser.add_argument("--root", default=DEFAULT_FEATURE_ROOT)
+    parser.add_argument("--level", choices=LEVELS, action="append", help="Build only these levels (repeatable)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if this data version has matrices")
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP, help="Number of versions to keep")
+    args = parser.parse_args()
+    build_features(root=args.root, levels=args.level or LEVELS, force=args.force, keep=args.keep)
@@ -0,0 +1,240 @@
+"""
+Batched NumPy forecasting baselines for many short series.
+
+Series of one frequency are right-aligned into a single matrix (one row per
+series, last observation in the last column, NaN for padding and gaps), and
+every model is fitted to all rows at once:
+
+  linear  least-squares trend per row, masked to the observed points
+  holt    Holt's linear exponential smoothing with a damped trend; smoothing
+          parameters are chosen per row from a grid, all grid points at once
+
+The only Python loop is over time steps (10-25 for annual WHO indicators), so
+thousands of series fit in milliseconds, where a Prophet fit takes ~a second each.
+"""
+from itertools import product
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+
+HOLT_ALPHAS = (0.1, 0.2, 0.3, 0.5, 0.7, 0.9)
+HOLT_BETAS = (0.01, 0.05, 0.1, 0.2, 0.4)
+HOLT_PHIS = (0.8, 0.9, 0.98, 1.0)
+
+_WEEK_ORIGIN = np.datetime64("1970-01-05")  # a Monday
+
+
+def period_ordinals(ds, freq: str) -> np.ndarray:
+    """Integer period number of each date (years for YS, Monday-based weeks for W-MON)."""
+    ds = np.asarray(ds, dtype="datetime64[D]")
+    if freq == "YS":
+        return ds.astype("datetime64[Y]").astype(np.int64)
+    if freq == "W-MON":
+        return (ds - _WEEK_ORIGIN).astype(np.int64) // 7
+    raise ValueError(f"Unsupported frequency {freq!r}")
+
+
+def ordinal_dates(ordinals, freq: str) -> np.ndarray:
+    """Inverse of period_ordinals: the first day of each period."""
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    if freq == "YS":
+        return ordinals.astype("datetime64[Y]").astype("datetime64[D]")
+    if freq == "W-MON":
+        return _WEEK_ORIGIN + ordinals * 7
+    raise ValueError(f"Unsupported frequency {freq!r}")
+
+
+def pad_series(ds_list, y_list, freq: str):
+    """
+    Right-align series into one matrix.
+
+    Returns (Y, last_ordinal): Y is (n_series, longest span) float64 with NaN
+    where a series has no value; last_ordinal is each series' last period,
+    from which its forecast periods are counted.
+    """
+    ordinals = [period_ordinals(ds, freq) for ds in ds_list]
+    last = np.array([o[-1] for o in ordinals], dtype=np.int64)
+    width = max(int(o[-1] - o[0]) + 1 for o in ordinals)
+
+    Y = np.full((len(ordinals), width), np.nan)
+    rows = np.repeat(np.arange(len(ordinals)), [len(o) for o in ordinals])
+    cols = np.concatenate([o - o[-1] for o in ordinals]) + width - 1
+    Y[rows, cols] = np.concatenate([np.asarray(y, dtype=np.float64) for y in y_list])
+    return Y, last
+
+
+def _z(interval_width: float) -> float:
+    return NormalDist().inv_cdf((1 + interval_width) / 2)
+
+
+def fit_linear(Y: np.ndarray, horizon: int, interval_width: float = 0.95) -> dict:
+    """Masked least-squares trend for every row of Y; forecasts the `horizon` columns after the last."""
+    observed = ~np.isnan(Y)
+    n = observed.sum(axis=1)
+    x = np.arange(Y.shape[1], dtype=np.float64)
+    y = np.where(observed, Y, 0.0)
+
+    x_mean = (observed * x).sum(axis=1) / n
+    y_mean = y.sum(axis=1) / n
+    dx = np.where(observed, x - x_mean[:, None], 0.0)
+    sxx = (dx * dx).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(sxx > 0, (dx * (y - y_mean[:, None])).sum(axis=1) / sxx, 0.0)
+        intercept = y_mean - slope * x_mean
+        residuals = np.where(observed, y - (intercept[:, None] + slope[:, None] * x), 0.0)
+        sigma = np.sqrt(np.where(n > 2, (residuals * residuals).sum(axis=1) / (n - 2), 0.0))
+
+        x_future = Y.shape[1] - 1 + np.arange(1, horizon + 1, dtype=np.float64)
+        yhat = intercept[:, None] + slope[:, None] * x_future
+        leverage = 1 / n[:, None] + (x_future - x_mean[:, None]) ** 2 / sxx[:, None]
+        spread = _z(interval_width) * sigma[:, None] * np.sqrt(1 + np.where(sxx[:, None] > 0, leverage, 0.0))
+    return {
+        "yhat": yhat,
+        "yhat_lower": yhat - spread,
+        "yhat_upper": yhat + spread,
+        "params": {"slope": slope, "intercept": intercept, "sigma": sigma},
+    }
+
+
+def _holt_states(Y, slope, alpha, beta, phi):
+    """
+    Run every parameter combination over a block of rows; returns (level, trend, sse, steps).
+
+    The state arrays are (combinations, rows) and updated in place with
+    preallocated buffers. Rows that have not reached their first observation
+    carry a zero state and a zero error, so no NaN enters the arithmetic.
+    """
+    P, N = alpha.shape[0], Y.shape[0]
+    observed = ~np.isnan(Y)
+    values = np.where(observed, Y, 0.0)
+    alpha_beta = alpha * beta
+    level, trend, sse = np.zeros((P, N)), np.zeros((P, N)), np.zeros((P, N))
+    prediction, error = np.empty((P, N)), np.empty((P, N))
+    started = np.zeros(N, dtype=bool)
+    steps = np.zeros(N)
+
+    for t in range(Y.shape[1]):
+        valid = observed[:, t]
+        update = valid & started
+        np.multiply(phi, trend, out=prediction)
+        prediction += level
+        np.subtract(values[:, t], prediction, out=error)
+        error *= update
+        sse += error * error
+        steps += update
+
+        np.multiply(alpha, error, out=level)
+        level += prediction
+        trend *= phi
+        trend += alpha_beta * error
+
+        first = valid & ~started
+        if first.any():
+            level[:, first] = values[first, t]
+            trend[:, first] = slope[first]
+            started |= first
+    return level, trend, sse, steps
+
+
+def fit_holt(Y: np.ndarray, horizon: int, interval_width: float = 0.95,
+             alphas=HOLT_ALPHAS, betas=HOLT_BETAS, phis=HOLT_PHIS, block_rows: int = 512) -> dict:
+    """
+    Damped-trend Holt smoothing for every row of Y, each with its own (alpha, beta, phi).
+
+    All parameter combinations run side by side, one time step at a time;
+    each series keeps the combination with the smallest one-step-ahead
+    squared error. The level starts at the first observation and the trend
+    at the least-squares slope. Missing values inside a series advance the
+    state without an update. Rows are processed `block_rows` at a time so the
+    state stays in cache.
+    """
+    grid = np.array(list(product(alphas, betas, phis)))
+    alpha, beta, phi = (grid[:, i:i + 1] for i in range(3))  # (P, 1) against (P, N) state
+    slope = fit_linear(Y, 1)["params"]["slope"]
+
+    N = Y.shape[0]
+    level, trend, sigma = np.empty(N), np.empty(N), np.empty(N)
+    best = np.empty(N, dtype=np.int64)
+    for start in range(0, N, block_rows):
+        rows = slice(start, start + block_rows)
+        block_level, block_trend, sse, steps = _holt_states(Y[rows], slope[rows], alpha, beta, phi)
+        choice = sse.argmin(axis=0)
+        pick = (choice, np.arange(len(choice)))
+        best[rows] = choice
+        level[rows], trend[rows] = block_level[pick], block_trend[pick]
+        sigma[rows] = np.sqrt(sse[pick] / np.maximum(steps, 1))
+
+    alpha, beta, phi = grid[best, 0], grid[best, 1], grid[best, 2]
+    h = np.arange(1, horizon + 1)
+    damping = np.cumsum(phi[:, None] ** h, axis=1)  # phi + phi^2 + ... + phi^h
+    yhat = level[:, None] + damping * trend[:, None]
+    # ETS(A,Ad,N) variance: sigma^2 * (1 + sum_{j<h} (alpha + alpha*beta*damping_j)^2)
+    c = alpha[:, None] + (alpha * beta)[:, None] * damping[:, :-1]
+    variance = 1 + np.concatenate([np.zeros((N, 1)), np.cumsum(c * c, axis=1)], axis=1)
+    spread = _z(interval_width) * sigma[:, None] * np.sqrt(variance)
+    return {
+        "yhat": yhat,
+        "yhat_lower": yhat - spread,
+        "yhat_upper": yhat + spread,
+        "params": {"alpha": alpha, "beta": beta, "phi": phi, "level": level, "trend": trend, "sigma": sigma},
+    }
+
+
+def fit_naive(Y: np.ndarray, horizon: int, interval_width: float = 0.95) -> dict:
+    """Last observed value carried forward; the reference the other engines must beat."""
+    last = Y[:, -1]
+    steps = np.diff(Y, axis=1)
+    observed = ~np.isnan(steps)
+    sigma = np.sqrt(np.where(observed, steps * steps, 0.0).sum(axis=1) / np.maximum(observed.sum(axis=1), 1))
+    yhat = np.repeat(last[:, None], horizon, axis=1)
+    spread = _z(interval_width) * sigma[:, None] * np.sqrt(np.arange(1, horizon + 1))
+    return {
+        "yhat": yhat,
+        "yhat_lower": yhat - spread,
+        "yhat_upper": yhat + spread,
+        "params": {"sigma": sigma},
+    }
+
+
+ENGINES = {"naive": fit_naive, "linear": fit_linear, "holt": fit_holt}
+
+
+def forecast_matrix(engine: str, ds_list, y_list, freq: str, horizon: int, interval_width: float = 0.95):
+    """Fit one engine to a list of series of one frequency; returns (fit result, forecast period dates)."""
+    Y, last = pad_series(ds_list, y_list, freq)
+    result = ENGINES[engine](Y, horizon, interval_width)
+    dates = ordinal_dates(last[:, None] + np.arange(1, horizon + 1), freq)
+    return result, dates
+
+
+def fit_tasks(tasks, interval_width: float = 0.95) -> list:
+    """
+    Batched counterpart of ml.pipelines.forecast.fit_series.
+
+    tasks are (hash, engine, ds, y, freq, horizon) tuples; they are grouped by
+    (engine, freq, horizon) and each group is fitted as one matrix. Returns
+    (hash, params, forecast, error) per task.
+    """
+    groups = {}
+    for task in tasks:
+        groups.setdefault((task[1], task[4], task[5]), []).append(task)
+
+    results = []
+    for (engine, freq, horizon), group in groups.items():
+        try:
+            fit, dates = forecast_matrix(
+                engine, [t[2] for t in group], [t[3] for t in group], freq, horizon, interval_width
+            )
+        except Exception as e:
+            results.extend((t[0], None, None, repr(e)) for t in group)
+            continue
+        for i, task in enumerate(group):
+            forecast = pd.DataFrame({
+                "ds": pd.to_datetime(dates[i]),
+                "yhat": fit["yhat"][i],
+                "yhat_lower": fit["yhat_lower"][i],
+                "yhat_upper": fit["yhat_upper"][i],
+            })
+            params = {name: float(values[i]) for name, values in fit["params"].items()}
+            results.append((task[0], params, forecast, None))
+    return results
@@ -0,0 +1,326 @@
+"""
+Forecast every disease indicator and outbreak series in the warehouse.
+
+Series:
+  indicator  (disease, indicator_code, dimension_code)   yearly mean of disease_indicators.numeric
+  outbreak   (disease, 'new_cases', country_code)        weekly case rate (outbreak_epiweeks new_cases /
+                                                          weeks_covered, spread over the covered weeks;
+                                                          the rate analytics.outbreak_detector scores)
+
+All series are extracted with one query. Prophet fits run across a process
+pool; the NumPy baselines in ml.pipelines.baseline (linear, holt) fit every
+series of a frequency at once in-process. Each fitted model
+and its forecast are cached under data/.model_cache by a hash of the series'
+data, so a rerun only refits series whose data changed, and only rewrites
+those series in the forecasts table.
+
+Usage:
+  python -m ml.pipelines.forecast                  # Prophet if installed, else linear
+  python -m ml.pipelines.forecast --model holt
+  python -m ml.pipelines.forecast --model prophet --workers 4
+  python -m ml.pipelines.forecast --force          # refit everything
+"""
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sqlalchemy import Date, Float, cast, delete, func, literal, select, union_all
+from sqlalchemy.orm import Session
+from database.models.disease_dim import Disease
+from database.models.disease_indicator import DiseaseIndicator
+from database.models.forecast import Forecast
+# Relationship targets of DiseaseIndicator, needed to configure the mappers
+from database.models.geo_unit import GeoAdminUnit  # noqa: F401
+from database.models.health_facilities import HealthFacility  # noqa: F401
+from database.models.outbreak_epiweeks import OutbreakEpiweek
+from etl.bulk_copy import copy_dataframe
+from . import baseline
+
+try:
+    from prophet import Prophet
+    from prophet.serialize import model_to_json
+except ImportError:  # optional dependency; see requirements.txt
+    Prophet = None
+
+DEFAULT_CACHE_DIR = "data/.model_cache"
+INTERVAL_WIDTH = 0.95
+MIN_POINTS = 3
+# Bump when the fitting code changes, so cached models are not reused
+CACHE_VERSION = 2
+
+# source -> (pandas frequency of the series, periods to forecast)
+FREQUENCIES = {
+    "indicator": ("YS", 3),
+    "outbreak": ("W-MON", 8),
+}
+SERIES_COLUMNS = ["source", "disease", "indicator_code", "dimension_code"]
+
+
+def series_query():
+    """Every series' points as (source, disease, indicator_code, dimension_code, ds, y, weeks), in series order."""
+    indicators = (
+        select(
+            literal("indicator").label("source"),
+            Disease.name.label("disease"),
+            DiseaseIndicator.indicator_code,
+            func.coalesce(DiseaseIndicator.dimension_code, "").label("dimension_code"),
+            func.make_date(DiseaseIndicator.year, 1, 1).label("ds"),
+            cast(func.avg(DiseaseIndicator.numeric), Float).label("y"),
+        )
+        .join(Disease, Disease.id == DiseaseIndicator.disease_id)
+        .where(DiseaseIndicator.numeric.isnot(None), DiseaseIndicator.year.isnot(None))
+        .group_by(Disease.name, DiseaseIndicator.indicator_code, DiseaseIndicator.dimension_code, DiseaseIndicator.year)
+    )
+    # outbreak_reports.case_total is cumulative per report; outbreak_epiweeks holds the new cases of each
+    # report, over weeks_covered weeks. y is the per-week rate; spread_weeks gives every covered week its point.
+    outbreaks = select(
+        literal("outbreak").label("source"),
+        OutbreakEpiweek.disease_name.label("disease"),
+        literal("new_cases").label("indicator_code"),
+        OutbreakEpiweek.country_code.label("dimension_code"),
+        cast(func.date_trunc("week", OutbreakEpiweek.epiweek), Date).label("ds"),
+        (cast(OutbreakEpiweek.new_cases, Float) / OutbreakEpiweek.weeks_covered).label("y"),
+        OutbreakEpiweek.weeks_covered.label("weeks"),
+    )
+    indicators = indicators.add_columns(literal(1).label("weeks"))
+    combined = union_all(indicators, outbreaks).subquery()
+    return select(combined).order_by(*(combined.c[name] for name in SERIES_COLUMNS), combined.c.ds)
+
+
+def spread_weeks(points: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give each of the `weeks` weeks ending at a point's ds its own point with the same (per-week) y.
+
+    A report that arrives after a gap covers several weeks; spreading its
+    rate over them keeps the series free of both the spike and the empty weeks.
+    Points landing on the same (series, ds) are summed.
+    """
+    weeks = points["weeks"].fillna(1).to_numpy(dtype=np.int64).clip(min=1)
+    points = points.loc[points.index.repeat(weeks)].drop(columns="weeks")
+    weeks_back = np.arange(len(points)) - np.repeat(np.cumsum(weeks) - weeks, weeks)
+    points["ds"] = pd.to_datetime(points["ds"]) - pd.to_timedelta(weeks_back * 7, unit="D")
+    return points.groupby(SERIES_COLUMNS + ["ds"], sort=True, dropna=False, as_index=False)["y"].sum()
+
+
+def extract_series(db: Session) -> pd.DataFrame:
+    points = pd.DataFrame(db.execute(series_query()).all(), columns=SERIES_COLUMNS + ["ds", "y", "weeks"])
+    return spread_weeks(points)
+
+
+def split_series(points: pd.DataFrame) -> list:
+    """One dict per series with its key columns and ds/y arrays."""
+    series = []
+    # NULL key parts (e.g. an indicator without a disease name) become '' instead of dropping or breaking the series
+    points = points.assign(**{name: points[name].fillna("").astype(str) for name in SERIES_COLUMNS})
+    for key, group in points.groupby(SERIES_COLUMNS, sort=False):
+        item = dict(zip(SERIES_COLUMNS, key))
+        item["key"] = "|".join(key)
+        item["ds"] = pd.to_datetime(group["ds"]).to_numpy(dtype="datetime64[D]")
+        item["y"] = group["y"].to_numpy(dtype=np.float64)
+        series.append(item)
+    return series
+
+
+def series_hash(series: dict, model: str) -> str:
+    """Fingerprint of a series' data and how it is fitted; the model cache and forecasts table are keyed on it."""
+    freq, horizon = FREQUENCIES[series["source"]]
+    digest = hashlib.sha1(f"{CACHE_VERSION}|{model}|{freq}|{horizon}|{series['key']}".encode())
+    digest.update(series["ds"].astype(np.int64).tobytes())
+    digest.update(series["y"].tobytes())
+    return digest.hexdigest()
+
+
+def resolve_model(model: str) -> str:
+    if model == "auto":
+        return "prophet" if Prophet is not None else "linear"
+    if model == "prophet" and Prophet is None:
+        raise ImportError("The prophet model needs the prophet package (pip install prophet)")
+    return model
+
+
+def future_dates(last, freq: str, horizon: int) -> pd.DatetimeIndex:
+    return pd.date_range(pd.Timestamp(last), periods=horizon + 1, freq=freq)[1:]
+
+
+def fit_prophet(ds, y, freq: str, horizon: int):
+    """Prophet fit; returns (model as JSON, forecast of the next `horizon` periods)."""
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    model = Prophet(
+        interval_width=INTERVAL_WIDTH,
+        yearly_seasonality=freq != "YS",  # yearly points cannot carry a within-year pattern
+        weekly_seasonality=False,
+        daily_seasonality=False,
+    )
+    model.fit(pd.DataFrame({"ds": pd.to_datetime(ds), "y": y}))
+    forecast = model.predict(pd.DataFrame({"ds": future_dates(ds[-1], freq, horizon)}))
+    return model_to_json(model), forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+
+
+FITTERS = {"prophet": fit_prophet}
+
+
+def fit_series(task):
+    """Process pool entry point: (hash, model, ds, y, freq, horizon) -> (hash, fitted, forecast, error)."""
+    digest, model, ds, y, freq, horizon = task
+    try:
+        fitted, forecast = FITTERS[model](ds, y, freq, horizon)
+        return digest, fitted, forecast, None
+    except Exception as e:
+        return digest, None, None, repr(e)
+
+
+def _cache_path(cache_dir: str, digest: str) -> str:
+    return os.path.join(cache_dir, f"{digest}.pkl")
+
+
+def load_cached(cache_dir: str, digest: str):
+    """Cached forecast for a series hash, or None."""
+    try:
+        with open(_cache_path(cache_dir, digest), "rb") as f:
+            return pickle.load(f)["forecast"]
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def save_cached(cache_dir: str, digest: str, model: str, fitted, forecast: pd.DataFrame):
+    path = _cache_path(cache_dir, digest)
+    with open(f"{path}.tmp", "wb") as f:
+        pickle.dump({"model": model, "fitted": fitted, "forecast": forecast}, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def prune_cache(cache_dir: str, keep) -> int:
+    """Delete cached models for hashes no longer in use; returns how many were removed."""
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name.endswith(".pkl") and name[:-4] not in keep:
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+    return removed
+
+
+def fit_all(tasks, model: str, workers=None) -> list:
+    """Fit tasks: baseline models as one batch, Prophet across a process pool (in-process when workers <= 1)."""
+    if not tasks:
+        return []
+    if model in baseline.ENGINES:
+        return baseline.fit_tasks(tasks, interval_width=INTERVAL_WIDTH)
+    if workers is not None and workers <= 1:
+        return [fit_series(task) for task in tasks]
+    workers = workers or os.cpu_count() or 1
+    # Several series per round trip: most fits are far cheaper than pickling overhead
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fit_series, tasks, chunksize=chunksize))
+
+
+def stored_hashes(db: Session) -> dict:
+    """series_key -> series_hash of the forecasts currently in the table."""
+    return dict(db.execute(select(Forecast.series_key, Forecast.series_hash).distinct()).all())
+
+
+def forecast_rows(series: dict, digest: str, model: str, forecast: pd.DataFrame) -> pd.DataFrame:
+    rows = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].copy()
+    rows["ds"] = pd.to_datetime(rows["ds"]).dt.date
+    for column in SERIES_COLUMNS:
+        rows[column] = series[column]
+    rows["series_key"] = series["key"]
+    rows["series_hash"] = digest
+    rows["model"] = model
+    return rows
+
+
+def write_forecasts(db: Session, replace_keys, rows: pd.DataFrame) -> int:
+    """Replace the forecasts of the given series in the session's transaction; the caller commits."""
+    replace_keys = list(replace_keys)
+    for start in range(0, len(replace_keys), 1000):
+        db.execute(delete(Forecast).where(Forecast.series_key.in_(replace_keys[start:start + 1000])))
+    if rows.empty:
+        return 0
+    cursor = db.connection().connection.cursor()
+    try:
+        return copy_dataframe(cursor, rows, Forecast.__tablename__)
+    finally:
+        cursor.close()
+
+
+def run_forecasts(model: str = "auto", workers=None, cache_dir: str = DEFAULT_CACHE_DIR, force: bool = False) -> dict:
+    """Forecast every series whose data changed since the last run; returns a summary."""
+    from database.db_connection import get_session
+
+    start = time.perf_counter()
+    model = resolve_model(model)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    db = get_session("ingest")
+    try:
+        all_series = split_series(extract_series(db))
+        series = [s for s in all_series if len(s["y"]) >= MIN_POINTS]
+        hashes = {s["key"]: series_hash(s, model) for s in series}
+        stored = {} if force else stored_hashes(db)
+        changed = [s for s in series if stored.get(s["key"]) != hashes[s["key"]]]
+        removed = set(stored) - set(hashes)
+
+        forecasts, tasks = {}, []
+        for s in changed:
+            digest = hashes[s["key"]]
+            cached = None if force else load_cached(cache_dir, digest)
+            if cached is not None:
+                forecasts[digest] = cached
+            else:
+                tasks.append((digest, model, s["ds"], s["y"], *FREQUENCIES[s["source"]]))
+        cached_count = len(forecasts)
+
+        keys = {digest: key for key, digest in hashes.items()}
+        failed = []
+        for digest, fitted, forecast, error in fit_all(tasks, model, workers=workers):
+            if error is not None:
+                failed.append((keys[digest], error))
+                continue
+            save_cached(cache_dir, digest, model, fitted, forecast)
+            forecasts[digest] = forecast
+
+        # Series that failed to fit keep their previous forecasts
+        ready = [s for s in changed if hashes[s["key"]] in forecasts]
+        frames = [forecast_rows(s, hashes[s["key"]], model, forecasts[hashes[s["key"]]]) for s in ready]
+        rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        replace_keys = removed | {s["key"] for s in ready}
+        written = write_forecasts(db, replace_keys, rows)
+        db.commit()
+    finally:
+        db.close()
+    prune_cache(cache_dir, set(hashes.values()))
+
+    summary = {
+        "model": model,
+        "series": len(series),
+        "too_short": len(all_series) - len(series),
+        "unchanged": len(series) - len(changed),
+        "from_cache": cached_count,
+        "fitted": len(tasks) - len(failed),
+        "failed": failed,
+        "rows": written,
+    }
+    print(f"Forecast {summary['series']:,} series with {model} in {time.perf_counter() - start:.2f}s: "
+          f"{summary['fitted']:,} fitted, {summary['from_cache']:,} from cache, "
+          f"{summary['unchanged']:,} unchanged, {len(failed):,} failed, "
+          f"{summary['too_short']:,} skipped (< {MIN_POINTS} points); {written:,} rows written")
+    for key, error in failed[:10]:
+        print(f"  ✗ {key}: {error}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Forecast every disease indicator and outbreak series")
+    parser.add_argument("--model", choices=["auto", "prophet", *baseline.ENGINES], default="auto",
+                        help="auto uses Prophet when it is installed")
+    parser.add_argument("--workers", type=int, default=None, help="Prophet process pool size (default: CPU count)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--force", action="store_true", help="Refit every series, ignoring the model cache")
+    args = parser.parse_args()
+    run_forecasts(model=args.model, workers=args.workers, cache_dir=args.cache_dir, force=args.force)
@@ -0,0 +1,6 @@
+# Placeholder credentials so modules that build an engine at import time (data/scripts/load_csv.py)
+# can be imported; none of these tests open a database connection.
+import os
+
+for key, value in {"DB_USER": "test", "DB_PASSWORD": "test", "DB_HOST": "localhost", "DB_PORT": "5432", "DB_NAME": "test"}.items():
+    os.environ.setdefault(key, value)
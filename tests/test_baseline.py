@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ml.pipelines.baseline import fit_holt, fit_linear, fit_naive, fit_tasks, ordinal_dates, pad_series, period_ordinals
+
+
+def series():
+    rng = np.random.default_rng(3)
+    years = [np.arange(2000, 2020), np.arange(2008, 2020), np.array([2010, 2011, 2013, 2016, 2017, 2018])]
+    ds_list = [pd.to_datetime([f"{y}-01-01" for y in ys]) for ys in years]
+    y_list = [50 + 2.5 * np.arange(len(ys)) + rng.normal(0, 3, len(ys)) for ys in years]
+    return ds_list, y_list
+
+
+def test_period_ordinals_round_trip():
+    weeks = np.array(["2024-01-01", "2024-01-08", "2024-12-30"], dtype="datetime64[D]")
+    np.testing.assert_array_equal(ordinal_dates(period_ordinals(weeks, "W-MON"), "W-MON"), weeks)
+    np.testing.assert_array_equal(period_ordinals(np.array(["2019-01-01", "2020-06-30"], dtype="datetime64[D]"), "YS"), [49, 50])
+    with pytest.raises(ValueError):
+        period_ordinals(weeks, "MS")
+
+
+def test_pad_series_right_aligns_with_gaps():
+    ds_list, y_list = series()
+    Y, last = pad_series(ds_list, y_list, "YS")
+    assert Y.shape == (3, 20)
+    np.testing.assert_array_equal(last, [2019 - 1970, 2019 - 1970, 2018 - 1970])
+    np.testing.assert_array_equal(Y[1, -12:], y_list[1])
+    assert np.isnan(Y[1, :-12]).all()
+    assert np.isnan(Y[2, [-7, -5, -4]]).all() and np.count_nonzero(~np.isnan(Y[2])) == 6
+
+
+def test_linear_matches_polyfit():
+    ds_list, y_list = series()
+    Y, _ = pad_series(ds_list, y_list, "YS")
+    fit = fit_linear(Y, horizon=3)
+
+    x = np.arange(Y.shape[1])
+    for i, row in enumerate(Y):
+        observed = ~np.isnan(row)
+        slope, intercept = np.polyfit(x[observed], row[observed], 1)
+        np.testing.assert_allclose(fit["params"]["slope"][i], slope)
+        np.testing.assert_allclose(fit["params"]["intercept"][i], intercept)
+        np.testing.assert_allclose(fit["yhat"][i], np.polyval([slope, intercept], x[-1] + np.arange(1, 4)))
+    assert (fit["yhat_lower"] < fit["yhat"]).all() and (fit["yhat"] < fit["yhat_upper"]).all()
+
+
+def holt_reference(row, slope, alpha, beta, phi, horizon):
+    """One series, one parameter set, in plain Python."""
+    values = list(row)
+    start = next(t for t, v in enumerate(values) if not np.isnan(v))
+    level, trend, sse = values[start], slope, 0.0
+    for value in values[start + 1:]:
+        prediction = level + phi * trend
+        error = 0.0 if np.isnan(value) else value - prediction
+        sse += error * error
+        level, trend = prediction + alpha * error, phi * trend + alpha * beta * error
+    return [level + sum(phi ** i for i in range(1, h + 1)) * trend for h in range(1, horizon + 1)], sse
+
+
+def test_holt_matches_scalar_reference():
+    ds_list, y_list = series()
+    Y, _ = pad_series(ds_list, y_list, "YS")
+    slopes = fit_linear(Y, 1)["params"]["slope"]
+    fit = fit_holt(Y, horizon=4, alphas=(0.3,), betas=(0.1,), phis=(0.9,))
+
+    for i, row in enumerate(Y):
+        yhat, _ = holt_reference(row, slopes[i], 0.3, 0.1, 0.9, 4)
+        np.testing.assert_allclose(fit["yhat"][i], yhat)
+
+
+def test_holt_picks_lowest_error_parameters_per_row():
+    ds_list, y_list = series()
+    Y, _ = pad_series(ds_list, y_list, "YS")
+    slopes = fit_linear(Y, 1)["params"]["slope"]
+    alphas, betas, phis = (0.2, 0.8), (0.05, 0.3), (0.9, 1.0)
+    fit = fit_holt(Y, horizon=2, alphas=alphas, betas=betas, phis=phis)
+    in_blocks = fit_holt(Y, horizon=2, alphas=alphas, betas=betas, phis=phis, block_rows=1)
+    np.testing.assert_allclose(in_blocks["yhat"], fit["yhat"])
+
+    for i, row in enumerate(Y):
+        errors = {
+            (a, b, p): holt_reference(row, slopes[i], a, b, p, 2)[1]
+            for a in alphas for b in betas for p in phis
+        }
+        best = min(errors, key=errors.get)
+        assert (fit["params"]["alpha"][i], fit["params"]["beta"][i], fit["params"]["phi"][i]) == best
+
+
+def test_naive_carries_last_value():
+    Y = np.array([[1.0, 2.0, 4.0], [np.nan, 5.0, 5.0]])
+    fit = fit_naive(Y, horizon=2)
+    np.testing.assert_array_equal(fit["yhat"], [[4.0, 4.0], [5.0, 5.0]])
+    np.testing.assert_array_equal(fit["yhat_lower"][1], fit["yhat"][1])  # no variation, no spread
+
+
+def test_fit_tasks_groups_and_dates_forecasts():
+    ds_list, y_list = series()
+    weekly = pd.to_datetime(["2024-01-01", "2024-01-08", "2024-01-15"])
+    tasks = [("a", "linear", ds_list[0], y_list[0], "YS", 2),
+             ("b", "holt", ds_list[1], y_list[1], "YS", 2),
+             ("c", "linear", weekly, [1.0, 2.0, 3.0], "W-MON", 1),
+             ("d", "linear", ds_list[2], y_list[2], "YS", 2)]
+    results = {r[0]: r for r in fit_tasks(tasks)}
+
+    assert set(results) == {"a", "b", "c", "d"} and all(r[3] is None for r in results.values())
+    assert list(results["a"][2]["ds"]) == list(pd.to_datetime(["2020-01-01", "2021-01-01"]))
+    assert list(results["c"][2]["ds"]) == [pd.Timestamp("2024-01-22")]
+    np.testing.assert_allclose(results["c"][2]["yhat"], [4.0])
+    assert set(results["b"][1]) == {"alpha", "beta", "phi", "level", "trend", "sigma"}
@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import create_engine, insert
+from starlette.requests import Request
+from backend.app import cache
+from backend.app.cache import ResponseCache, VersionClock
+from database.models import disease_dim, disease_indicator, mortality_statistic, outbreak_reports, geo_unit, health_facilities
+from database.models.data_version import DataVersion
+
+
+def test_lru_is_bounded_by_entries_and_bytes():
+    response_cache = ResponseCache(max_entries=3, max_bytes=10)
+    for key in "abc":
+        response_cache.put(1, key, b"xx")
+    assert response_cache.get(1, "a") == b"xx"  # a becomes most recent
+
+    response_cache.put(1, "d", b"xx")
+    assert response_cache.get(1, "b") is None
+    assert response_cache.get(1, "a") == b"xx"
+
+    response_cache.put(1, "e", b"xxxxxxx")
+    assert response_cache.stats()["bytes"] <= 10
+    assert response_cache.get(1, "e") == b"xxxxxxx"
+    response_cache.put(1, "huge", b"x" * 11)
+    assert response_cache.get(1, "huge") is None
+
+
+def test_new_version_drops_old_entries():
+    response_cache = ResponseCache()
+    response_cache.put(1, "k", b"old")
+    assert response_cache.get(2, "k") is None
+    assert response_cache.get(1, "k") is None  # the switch to version 2 cleared it
+    assert response_cache.stats() == {"version": 1, "entries": 0, "bytes": 0, "hits": 0, "misses": 2}
+
+
+def test_file_tier_survives_restarts_and_prunes_old_versions(tmp_path):
+    ResponseCache(directory=str(tmp_path)).put(1, "k", b"body")
+
+    restarted = ResponseCache(directory=str(tmp_path))
+    assert restarted.get(1, "k") == b"body"
+    assert restarted.hits == 1
+
+    restarted.get(2, "k")
+    assert not (tmp_path / "1").exists()
+
+
+def test_get_or_compute_runs_the_query_once():
+    response_cache = ResponseCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"items": [1, 2]}
+
+    assert response_cache.get_or_compute(1, "k", compute) == b'{"items":[1,2]}'
+    assert response_cache.get_or_compute(1, "k", compute) == b'{"items":[1,2]}'
+    assert len(calls) == 1
+
+
+@pytest.fixture
+def warehouse(monkeypatch):
+    engine = create_engine("sqlite://")
+    DataVersion.__table__.create(engine)
+    monkeypatch.setattr(cache, "get_engine", lambda profile: engine)
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return engine, now
+
+
+def test_version_clock_rereads_only_after_ttl(warehouse):
+    engine, now = warehouse
+    clock = VersionClock(ttl=5)
+    assert clock.current() == 0
+
+    with engine.begin() as conn:
+        conn.execute(insert(DataVersion), [{"files_loaded": 1, "rows_loaded": 10}])
+    now[0] += 4
+    assert clock.current() == 0
+    now[0] += 1
+    assert clock.current() == 1
+
+
+def make_request(query=b"", headers=()):
+    return Request({"type": "http", "method": "GET", "path": "/rollups/indicators",
+                    "query_string": query, "headers": list(headers)})
+
+
+def test_cached_json_etag_and_not_modified(warehouse, monkeypatch):
+    monkeypatch.setattr(cache, "data_version", VersionClock(ttl=0))
+    monkeypatch.setattr(cache, "response_cache", ResponseCache())
+
+    first = cache.cached_json(make_request(b"b=2&a=1"), lambda: [1])
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and first.body == b"[1]"
+    assert cache.cached_json(make_request(b"a=1&b=2"), lambda: [2]).body == b"[1]"
+
+    revalidate = make_request(b"a=1&b=2", [(b"if-none-match", etag.encode())])
+    assert cache.cached_json(revalidate, lambda: [3]).status_code == 304
+
+    engine, _ = warehouse
+    with engine.begin() as conn:
+        conn.execute(insert(DataVersion), [{"files_loaded": 1, "rows_loaded": 10}])
+    after_load = cache.cached_json(revalidate, lambda: [4])
+    assert after_load.status_code == 200 and after_load.body == b"[4]"
+    assert after_load.headers["etag"] != etag
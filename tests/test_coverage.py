@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from analytics.coverage import compute_coverage, is_functional, ward_centroids, ward_coverage
+from analytics.geo_math import haversine_km
+from benchmarks.spatial_search import NIGERIA_BOUNDS
+
+
+def brute_force(ward_lat, ward_lon, fac_lat, fac_lon, functional, radius_km):
+    distances = haversine_km(ward_lat[:, None], ward_lon[:, None], fac_lat[None, :], fac_lon[None, :])
+    inside = distances <= radius_km
+    functional_km = np.where(functional[None, :], distances, np.inf)
+    nearest = functional_km.min(axis=1)
+    return {
+        "nearest_functional_km": np.where(np.isinf(nearest), np.nan, nearest),
+        "facilities_within_radius": inside.sum(axis=1),
+        "functional_within_radius": (inside & functional[None, :]).sum(axis=1),
+    }
+
+
+def test_ward_coverage_matches_brute_force():
+    rng = np.random.default_rng(3)
+    lat_min, lat_max, lon_min, lon_max = NIGERIA_BOUNDS
+    ward_lat, ward_lon = rng.uniform(lat_min, lat_max, 400), rng.uniform(lon_min, lon_max, 400)
+    fac_lat, fac_lon = rng.uniform(lat_min, lat_max, 2000), rng.uniform(lon_min, lon_max, 2000)
+    functional = rng.random(2000) < 0.05
+
+    for radius_km in (5.0, 30.0):
+        result = ward_coverage(ward_lat, ward_lon, fac_lat, fac_lon, functional, radius_km=radius_km)
+        expected = brute_force(ward_lat, ward_lon, fac_lat, fac_lon, functional, radius_km)
+
+        np.testing.assert_allclose(result["nearest_functional_km"], expected["nearest_functional_km"])
+        np.testing.assert_array_equal(result["facilities_within_radius"], expected["facilities_within_radius"])
+        np.testing.assert_array_equal(result["functional_within_radius"], expected["functional_within_radius"])
+        index = result["nearest_functional_index"]
+        assert functional[index].all()
+        np.testing.assert_allclose(
+            haversine_km(ward_lat, ward_lon, fac_lat[index], fac_lon[index]), result["nearest_functional_km"]
+        )
+
+
+def test_ward_coverage_without_functional_facilities():
+    result = ward_coverage([9.0], [7.0], [9.01], [7.01], [False])
+    assert np.isnan(result["nearest_functional_km"][0])
+    assert result["nearest_functional_index"][0] == -1
+    assert result["facilities_within_radius"][0] == 1
+
+
+def test_wards_are_measured_from_the_centroid_of_their_facilities():
+    # Ward 1's stored point is its first facility, which is functional
+    wards = pd.DataFrame({"geo_admin_unit_id": [1, 2, 3], "latitude": [9.0, 10.0, None], "longitude": [7.0, 8.0, None]})
+    facilities = pd.DataFrame({
+        "facility_id": [10, 11, 12],
+        "geo_admin_unit_id": [1, 1, None],
+        "latitude": [9.0, 9.2, 12.0],
+        "longitude": [7.0, 7.0, 12.0],
+        "functional_status": ["Functional", " not functional", None],
+    })
+
+    centroids = ward_centroids(wards, facilities)
+    assert centroids["geo_admin_unit_id"].tolist() == [1, 2]
+    np.testing.assert_allclose(centroids[["latitude", "longitude"]].to_numpy(), [[9.1, 7.0], [10.0, 8.0]])
+
+    coverage = compute_coverage(wards, facilities, radius_km=15.0).set_index("geo_admin_unit_id")
+    assert coverage.loc[1, "nearest_functional_km"] == np.float64(haversine_km(9.1, 7.0, 9.0, 7.0))
+    assert coverage.loc[1, "nearest_functional_facility_id"] == 10
+    assert coverage.loc[1, "facilities_within_radius"] == 2
+    assert coverage.loc[1, "functional_within_radius"] == 1
+    assert is_functional(facilities["functional_status"]).tolist() == [True, False, False]
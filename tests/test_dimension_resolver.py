@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session
+from database.models import disease_dim, disease_indicator, mortality_statistic, outbreak_reports, geo_unit, health_facilities
+from database.models.disease_dim import Disease
+from database.models.geo_unit import GeoAdminUnit
+from etl.dimension_resolver import DimensionResolver
+from etl.load_health_facilities import GEO_KEY, geo_unit_defaults
+
+
+@pytest.fixture
+def db():
+    # SQLite understands INSERT ... ON CONFLICT DO NOTHING RETURNING too
+    engine = create_engine("sqlite://")
+    Disease.__table__.create(engine)
+    GeoAdminUnit.__table__.create(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    with Session(engine) as session:
+        session.statements = statements
+        yield session
+
+
+def test_preloaded_keys_need_no_statements(db):
+    db.execute(insert(Disease), [{"name": "Cholera"}, {"name": "Measles"}])
+    resolver = DimensionResolver(db, Disease, ["name"])
+    expected = dict(db.execute(select(Disease.name, Disease.id)).all())
+    db.statements.clear()
+
+    assert resolver.resolve_many(["Cholera", "Measles", "Cholera"]) == expected
+    assert resolver.resolve("Measles") == expected["Measles"]
+    assert db.statements == []
+
+
+def test_missing_keys_are_inserted_in_one_statement(db):
+    db.execute(insert(Disease), [{"name": "Cholera"}])
+    resolver = DimensionResolver(db, Disease, ["name"])
+    db.statements.clear()
+
+    ids = resolver.resolve_many(["Cholera", "Lassa", "Mpox"])
+    assert len(db.statements) == 1 and db.statements[0].startswith("INSERT")
+    assert ids == dict(db.execute(select(Disease.name, Disease.id)).all())
+
+
+def test_keys_inserted_by_another_loader_are_fetched(db):
+    resolver = DimensionResolver(db, Disease, ["name"])
+    db.execute(insert(Disease), [{"name": "Lassa"}])  # after the preload
+    db.statements.clear()
+
+    ids = resolver.resolve_many(["Lassa", "Mpox"])
+    assert [sql.split()[0] for sql in db.statements] == ["INSERT", "SELECT"]
+    assert ids == dict(db.execute(select(Disease.name, Disease.id)).all())
+
+
+def test_tuple_keys_with_nulls_defaults_and_attributes(db):
+    resolver = DimensionResolver(db, GeoAdminUnit, GEO_KEY, row_defaults=geo_unit_defaults)
+    ward, lga = ("Kano", "Dala", "Adakawa"), ("Kano", float("nan"), None)
+
+    ids = resolver.resolve_many([ward, lga], attributes={ward: {"latitude": 12.0, "longitude": 8.5}})
+    assert set(ids) == {ward, ("Kano", None, None)}
+
+    rows = {row.id: row for row in db.execute(select(GeoAdminUnit)).scalars()}
+    assert (rows[ids[ward]].adm_level, rows[ids[ward]].latitude) == (3, 12.0)
+    assert (rows[ids[("Kano", None, None)]].adm_level, rows[ids[("Kano", None, None)]].latitude) == (1, None)
+
+    # A second resolver sees the same ids through its preload
+    assert DimensionResolver(db, GeoAdminUnit, GEO_KEY).resolve(lga) == ids[("Kano", None, None)]
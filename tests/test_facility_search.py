@@ -0,0 +1,146 @@
+import json
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+from analytics.facility_search import FacilityGridIndex, GridFacilitySearch, location_column_exists
+from analytics.geo_math import haversine_km
+from backend.app import cache
+from backend.app.routers import facilities as facilities_router
+from benchmarks.spatial_search import NIGERIA_BOUNDS
+from database.models import disease_dim, disease_indicator, mortality_statistic, outbreak_reports, geo_unit, health_facilities
+from database.models.health_facilities import HealthFacility
+
+
+@pytest.fixture(scope="module")
+def facilities():
+    rng = np.random.default_rng(7)
+    lat_min, lat_max, lon_min, lon_max = NIGERIA_BOUNDS
+    lat = rng.uniform(lat_min, lat_max, 3000)
+    lon = rng.uniform(lon_min, lon_max, 3000)
+    lat[10], lon[10] = np.nan, 8.0  # no position: never returned
+    return np.arange(3000), lat, lon
+
+
+def query_points(n=50):
+    rng = np.random.default_rng(11)
+    lat_min, lat_max, lon_min, lon_max = NIGERIA_BOUNDS
+    return zip(rng.uniform(lat_min, lat_max, n), rng.uniform(lon_min, lon_max, n))
+
+
+@pytest.mark.parametrize("cell_deg", [0.05, 0.1, 0.5])
+@pytest.mark.parametrize("radius_km", [5.0, 25.0, 120.0])
+def test_within_matches_brute_force(facilities, cell_deg, radius_km):
+    ids, lat, lon = facilities
+    index = FacilityGridIndex(ids, lat, lon, cell_deg=cell_deg)
+    for q_lat, q_lon in query_points():
+        distances = haversine_km(q_lat, q_lon, lat, lon)
+        expected = ids[distances <= radius_km]
+
+        found, found_km = index.within(q_lat, q_lon, radius_km)
+        assert sorted(found) == sorted(expected)
+        assert np.all(np.diff(found_km) >= 0)
+        np.testing.assert_allclose(found_km, distances[found])
+
+
+@pytest.mark.parametrize("k", [1, 5, 40])
+def test_nearest_matches_brute_force(facilities, k):
+    ids, lat, lon = facilities
+    index = FacilityGridIndex(ids, lat, lon, cell_deg=0.1)
+    for q_lat, q_lon in query_points():
+        distances = np.nan_to_num(haversine_km(q_lat, q_lon, lat, lon), nan=np.inf)
+        expected_km = np.sort(distances)[:k]
+
+        found, found_km = index.nearest(q_lat, q_lon, k)
+        assert len(found) == k
+        np.testing.assert_allclose(found_km, expected_km)
+        np.testing.assert_allclose(distances[found], found_km)
+
+
+def test_nearest_far_outside_the_grid_and_small_indexes():
+    index = FacilityGridIndex([1, 2], [9.0, 9.1], [7.0, 7.1])
+    found, _ = index.nearest(-40.0, 150.0, k=5)
+    assert sorted(found) == [1, 2]
+
+    empty = FacilityGridIndex([], [], [])
+    assert len(empty.nearest(9.0, 7.0)[0]) == 0
+    assert len(empty.within(9.0, 7.0, 10.0)[0]) == 0
+
+
+@pytest.fixture
+def facility_db(facilities, monkeypatch):
+    ids, lat, lon = facilities
+    engine = create_engine("sqlite://")
+    HealthFacility.__table__.create(engine)
+    status = np.where(ids % 3 == 0, "Functional", "Non Functional")
+    with engine.begin() as conn:
+        conn.execute(insert(HealthFacility), [
+            {"facility_id": int(i), "facility_name": f"F{i}", "functional_status": s,
+             "latitude": None if np.isnan(a) else float(a), "longitude": float(o)}
+            for i, s, a, o in zip(ids, status, lat, lon)
+        ])
+    with Session(engine) as db:
+        yield db, status == "Functional"
+
+
+def test_grid_search_without_postgis(facilities, facility_db):
+    db, functional = facility_db
+    ids, lat, lon = facilities
+    search = GridFacilitySearch()
+    assert not location_column_exists(db)
+
+    for q_lat, q_lon in query_points(10):
+        distances = haversine_km(q_lat, q_lon, lat, lon)
+        rows = search.within(db, 1, q_lat, q_lon, 40.0, limit=5)
+        expected = ids[np.argsort(np.where(distances <= 40.0, distances, np.inf))][:len(rows)]
+        assert [row["facility_id"] for row in rows] == expected.tolist()
+        assert len(rows) == min(5, np.count_nonzero(distances <= 40.0))
+
+        nearest = search.nearest(db, 1, q_lat, q_lon, k=3, functional_only=True)
+        expected = ids[functional][np.argsort(distances[functional])][:3]
+        assert [row["facility_id"] for row in nearest] == expected.tolist()
+        assert all(row["functional_status"] == "Functional" for row in nearest)
+
+    row, = search.within(db, 1, 9.0, 8.0, 200.0, limit=1)
+    assert set(row) == {"facility_id", "facility_name", "facility_type", "functional_status",
+                        "latitude", "longitude", "distance_km"}
+    assert set(search._indexes) == {(1, False), (1, True)}
+    search.nearest(db, 2, 9.0, 8.0)
+    assert set(search._indexes) == {(2, False)}  # a new data version drops the old indexes
+
+
+def test_nearest_endpoint_falls_back_to_grid(facility_db, monkeypatch):
+    db, _ = facility_db
+    version = SimpleNamespace(current=lambda: 1)
+    monkeypatch.setattr(cache, "data_version", version)
+    monkeypatch.setattr(cache, "response_cache", cache.ResponseCache())
+    monkeypatch.setattr(facilities_router, "data_version", version)
+    monkeypatch.setattr(facilities_router, "_postgis", {})
+    request = Request({"type": "http", "method": "GET", "path": "/facilities/nearest",
+                       "query_string": b"lat=9&lon=8&k=2", "headers": []})
+
+    response = facilities_router.facilities_nearest(request, lat=9.0, lon=8.0, k=2, functional_only=False, db=db)
+    rows = json.loads(response.body)
+    assert response.status_code == 200 and len(rows) == 2
+    assert rows[0]["distance_km"] <= rows[1]["distance_km"]
+    assert facilities_router._postgis == {"available": False}
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("a_b", [1]), ("100%", [3]), ("0 c", [4]), ("c:\\d", [5]), ("clinic", [1, 2]),
+])
+def test_name_filter_matches_wildcards_literally(name, expected):
+    engine = create_engine("sqlite://")
+    HealthFacility.__table__.create(engine)
+    names = ["A_B Clinic", "AxB Clinic", "100% Care", "100 Care", "C:\\D Post"]
+    with engine.begin() as conn:
+        conn.execute(insert(HealthFacility), [{"facility_id": i, "facility_name": n} for i, n in enumerate(names, 1)])
+    filters = dict.fromkeys(["state_name", "lga_name", "ward_name", "geo_admin_unit_id", "facility_type",
+                             "category", "ownership", "functional_status"])
+    conditions = facilities_router.facility_filters(name=name, **filters)
+
+    with Session(engine) as db:
+        found = db.scalars(select(HealthFacility.facility_id).where(*conditions).order_by(HealthFacility.facility_id))
+        assert found.all() == expected
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, insert, union_all
+from analytics.outbreak_detector import EPIWEEK_COLUMNS, STATE_COLUMNS, derive_epiweeks
+from database.models.outbreak_epiweeks import OutbreakEpiweek
+from etl.normalize import to_records
+from etl.parquet_export import publish_snapshot
+from ml.feature_store import FeatureStore, column_metadata, outbreak_features, pivot, write_matrix
+
+
+def facts():
+    return pd.DataFrame({
+        "entity": ["NGA", "NGA", "GHA", "NGA", "GHA", "NGA"],
+        "year": [2020, 2021, 2020, 2020, 2019, 2021],
+        "feature": ["indicator:MAL:ALL", "indicator:MAL:ALL", "indicator:MAL:ALL",
+                    "mortality:Malaria:BTSX", "outbreak:Cholera:cases", "outbreak:Cholera:cases"],
+        "value": [1.5, 2.5, 3.0, 40.0, 7.0, 9.0],
+    })
+
+
+def test_pivot_matches_pandas():
+    long = facts()
+    matrix, entities, rows, columns = pivot(long)
+
+    expected = long.pivot_table(index=["entity", "year"], columns="feature", values="value").sort_index()
+    assert entities == ["GHA", "NGA"] and columns == sorted(long["feature"].unique())
+    assert [(entities[e], y) for e, y in rows] == list(expected.index)
+    assert matrix.dtype == np.float32
+    np.testing.assert_array_equal(matrix, expected[columns].to_numpy(dtype=np.float32))
+
+
+def test_pivot_of_nothing_is_empty():
+    matrix, entities, rows, columns = pivot(facts().head(0))
+    assert matrix.shape == (0, 0) and entities == [] and rows.shape == (0, 2) and columns == []
+
+
+def test_column_metadata_splits_names_and_counts_values():
+    matrix, _, _, columns = pivot(facts())
+    metadata = {c["name"]: c for c in column_metadata(columns, matrix)}
+    assert metadata["indicator:MAL:ALL"] == {
+        "name": "indicator:MAL:ALL", "source": "indicator", "code": "MAL", "detail": "ALL", "non_null": 3,
+    }
+    assert metadata["outbreak:Cholera:cases"]["non_null"] == 2
+
+
+@pytest.fixture
+def store(tmp_path):
+    matrix, entities, rows, columns = pivot(facts())
+    for version in (1, 2):
+        building = tmp_path / f"v{version}.tmp"
+        write_matrix(str(building / "country"), "country", version, matrix + version - 1, entities, rows, columns)
+        publish_snapshot(str(tmp_path), f"v{version}", str(building), keep=2)
+    return FeatureStore(str(tmp_path))
+
+
+def test_store_serves_latest_and_pinned_versions(store):
+    assert store.versions() == [1, 2]
+    latest = store.matrix("country")
+    assert latest.data_version == 2 and latest.shape == (4, 3)
+    assert store.matrix("country") is latest
+    assert store.matrix("country", version=1).select(columns=["indicator:MAL:ALL"], entities=["GHA"], years=[2020])[0, 0] == 3.0
+
+    frame = latest.to_frame(prefix="outbreak:", entities=["NGA"])
+    assert list(frame.index) == [("NGA", 2020), ("NGA", 2021)]
+    assert frame["outbreak:Cholera:cases"].tolist()[1] == 10.0
+    assert np.isnan(frame["outbreak:Cholera:cases"].tolist()[0])
+
+
+def test_missing_store_says_how_to_build(tmp_path):
+    with pytest.raises(FileNotFoundError, match="ml.feature_store"):
+        FeatureStore(str(tmp_path / "none")).matrix("country")
+
+
+def test_outbreak_features_count_each_case_once():
+    engine = create_engine("sqlite://")
+    OutbreakEpiweek.__table__.create(engine)
+    reports = pd.DataFrame([
+        (1, "Cholera", "NGA", "2024-01-01", "2024-01-08", 10, 1),
+        (2, "Cholera", "NGA", "2024-01-01", "2024-01-22", 25, 2),  # same cycle: 15 more cases
+        (3, "Cholera", "NGA", "2024-12-30", "2025-01-13", 4, 0),   # new cycle, reported in 2025
+    ], columns=["id", "disease_name", "country_code", "first_epiwk", "last_epiwk", "case_total", "death_total"])
+    weeks = derive_epiweeks(reports, pd.DataFrame(columns=STATE_COLUMNS))
+    with engine.begin() as conn:
+        conn.execute(insert(OutbreakEpiweek), [
+            {"id": i, **row} for i, row in enumerate(to_records(weeks[EPIWEEK_COLUMNS]), start=1)
+        ])
+        long = pd.DataFrame(conn.execute(union_all(*outbreak_features("country"))).all(),
+                            columns=["entity", "year", "feature", "value"])
+
+    matrix, entities, rows, columns = pivot(long)
+    assert entities == ["NGA"] and rows[:, 1].tolist() == [2024, 2025]
+    assert columns == ["outbreak:Cholera:cases", "outbreak:Cholera:deaths", "outbreak:Cholera:reports"]
+    np.testing.assert_array_equal(matrix, [[25, 2, 2], [4, 0, 1]])
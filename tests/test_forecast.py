@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from ml.pipelines.forecast import SERIES_COLUMNS, series_hash, split_series, spread_weeks
+
+
+def points():
+    return pd.DataFrame({
+        "source": ["indicator", "indicator", "indicator", "outbreak", "outbreak"],
+        "disease": ["Malaria", "Malaria", None, "Cholera", "Cholera"],
+        "indicator_code": ["MAL_DEATHS", "MAL_DEATHS", "TB_CASES", "new_cases", "new_cases"],
+        "dimension_code": ["BTSX", "BTSX", "", "NGA", "NGA"],
+        "ds": pd.to_datetime(["2019-01-01", "2020-01-01", "2020-01-01", "2024-01-01", "2024-01-08"]),
+        "y": [10.0, 12.0, 5.0, 3.0, 7.0],
+    })
+
+
+def test_split_series_groups_points_by_key():
+    series = split_series(points())
+
+    assert [s["key"] for s in series] == ["indicator|Malaria|MAL_DEATHS|BTSX", "indicator||TB_CASES|", "outbreak|Cholera|new_cases|NGA"]
+    malaria = series[0]
+    assert {name: malaria[name] for name in SERIES_COLUMNS} == {
+        "source": "indicator", "disease": "Malaria", "indicator_code": "MAL_DEATHS", "dimension_code": "BTSX",
+    }
+    np.testing.assert_array_equal(malaria["ds"], np.array(["2019-01-01", "2020-01-01"], dtype="datetime64[D]"))
+    np.testing.assert_array_equal(malaria["y"], [10.0, 12.0])
+
+
+def test_series_hash_changes_with_data_and_model():
+    first, *_ = split_series(points())
+    changed = dict(first, y=first["y"] + 1)
+
+    assert series_hash(first, "linear") == series_hash(dict(first), "linear")
+    assert series_hash(first, "linear") != series_hash(changed, "linear")
+    assert series_hash(first, "linear") != series_hash(first, "holt")
+
+
+def test_spread_weeks_turns_gapped_reports_into_a_weekly_rate():
+    points = pd.DataFrame({
+        "source": ["outbreak"] * 3 + ["indicator"],
+        "disease": ["Cholera"] * 3 + [None],
+        "indicator_code": ["new_cases"] * 3 + ["TB_CASES"],
+        "dimension_code": ["NGA"] * 3 + [""],
+        "ds": pd.to_datetime(["2024-01-01", "2024-01-08", "2024-02-05", "2020-01-01"]),
+        "y": [6.0, 8.0, 40.0 / 4, 5.0],   # the last report came 4 weeks after the previous one
+        "weeks": [1, 1, 4, 1],
+    })
+    tb, cholera = split_series(spread_weeks(points))
+    np.testing.assert_array_equal(
+        cholera["ds"], np.array(["2024-01-01", "2024-01-08", "2024-01-15", "2024-01-22", "2024-01-29", "2024-02-05"],
+                                dtype="datetime64[D]"),
+    )
+    np.testing.assert_array_equal(cholera["y"], [6.0, 8.0, 10.0, 10.0, 10.0, 10.0])
+    assert cholera["y"].sum() == 6 + 8 + 40
+    assert tb["key"] == "indicator||TB_CASES|" and tb["y"].tolist() == [5.0]
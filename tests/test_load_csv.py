@@ -0,0 +1,163 @@
+import json
+import zipfile
+import numpy as np
+import pandas as pd
+import pytest
+from data.scripts import load_csv
+
+
+@pytest.fixture
+def schema_cache(tmp_path, monkeypatch):
+    monkeypatch.setitem(load_csv.CONFIG, "schema_cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setitem(load_csv.CONFIG, "refresh_schema", False)
+    return tmp_path
+
+
+def write_csv(path, text):
+    path.write_text(text)
+    return path
+
+
+def test_infer_schema_detects_dates_and_grouped_numbers():
+    df = pd.DataFrame({
+        "report_date": ["2024-01-05", "2024-02-09"],
+        "value": ["16 702 261", "1 204"],
+        "name": ["a", "b"],
+        "count": [1, 2],
+    })
+    df, schema = load_csv.clean_columns(df)
+
+    assert schema["report_date"] == {"kind": "datetime", "format": "%Y-%m-%d"}
+    assert schema["value"] == {"kind": "numeric_text"}
+    assert schema["name"] == {"kind": "text"}
+    assert schema["count"] == {"kind": "native", "dtype": "Int64"}
+    assert df["value"].tolist() == [16702261, 1204]
+    assert pd.api.types.is_datetime64_any_dtype(df["report_date"])
+
+
+def test_bare_years_are_not_dates():
+    df = pd.DataFrame({"YEAR (DISPLAY)": ["2015", "2016", "2017"], "STARTYEAR": ["2015", "2016", "2017"]})
+    df, schema = load_csv.clean_columns(df)
+
+    assert schema["YEAR (DISPLAY)"]["kind"] == "numeric_text"
+    assert schema["STARTYEAR"]["kind"] == "numeric_text"
+    assert df["STARTYEAR"].tolist() == [2015, 2016, 2017]
+
+
+def test_hashtag_row_is_dropped_before_inference(tmp_path):
+    path = write_csv(tmp_path / "malaria.csv", (
+        "GHO (CODE),YEAR (DISPLAY),Numeric,Value\n"
+        "#indicator+code,#date+year,#indicator+value+num,#indicator+value\n"
+        "MALARIA_EST_DEATHS,2015,16702261,16 702 261\n"
+        "MALARIA_EST_DEATHS,2016,15000000,15 000 000\n"
+    ))
+    df, schema = load_csv.clean_dataframe(pd.read_csv(path), path.name)
+
+    assert len(df) == 2
+    assert schema["YEAR (DISPLAY)"]["kind"] == "numeric_text"
+    assert schema["Numeric"]["kind"] == "numeric_text"
+    assert df["YEAR (DISPLAY)"].tolist() == [2015, 2016]
+    assert df["Value"].tolist() == [16702261, 15000000]
+
+
+def test_hashtag_rows_need_every_filled_cell_tagged():
+    df = pd.DataFrame({"code": ["#indicator+code", "#not a tag"], "name": ["#indicator+name", "x"]})
+    assert load_csv.drop_hashtag_rows(df)["code"].tolist() == ["#not a tag"]
+
+
+def test_apply_schema_converts_only_dates_and_numeric_text():
+    df = pd.DataFrame({"d": ["05/01/2024", "bad"], "n": ["1,234", "x"], "t": ["1 000", "2"]})
+    schema = {"d": {"kind": "datetime", "format": "%d/%m/%Y"}, "n": {"kind": "numeric_text"}, "t": {"kind": "text"}}
+    df = load_csv.apply_schema(df, schema)
+
+    assert df["d"].iloc[0] == pd.Timestamp("2024-01-05") and pd.isna(df["d"].iloc[1])
+    assert df["n"].iloc[0] == 1234 and pd.isna(df["n"].iloc[1])
+    assert df["t"].tolist() == ["1 000", "2"]
+
+
+def test_cached_schema_is_reused_and_discarded_when_stale(schema_cache):
+    path = write_csv(schema_cache / "cases.csv", "region,cases\nnorth,1\nsouth,2\n")
+    with load_csv.open_source(path) as handle:
+        df, schema = load_csv.read_csv_with_schema(path, handle)
+    assert schema is None
+    load_csv.save_schema(path, load_csv.clean_columns(df)[1])
+
+    with load_csv.open_source(path) as handle:
+        df, schema = load_csv.read_csv_with_schema(path, handle)
+    assert schema["cases"] == {"kind": "native", "dtype": "Int64"}
+    assert str(df["cases"].dtype) == "Int64"
+
+    write_csv(path, "region,cases\nnorth,1\nsouth,foo\n")
+    with load_csv.open_source(path) as handle:
+        df, schema = load_csv.read_csv_with_schema(path, handle)
+    assert schema is None
+    assert df["cases"].tolist() == ["1", "foo"]
+
+
+def test_stale_cached_dtype_does_not_break_streaming(schema_cache):
+    path = schema_cache / "cases.csv"
+    write_csv(path, "region,cases\n" + "".join(f"r{i},{i}\n" for i in range(10)))
+    load_csv.save_schema(path, {"region": {"kind": "text"}, "cases": {"kind": "native", "dtype": "Int64"}})
+    write_csv(path, "region,cases\n" + "".join(f"r{i},{i}\n" for i in range(10)) + "r10,foo\n")
+
+    with load_csv.open_source(path) as handle:
+        chunks, schema = load_csv.read_csv_with_schema(path, handle, chunksize=4)
+        values = [value for chunk in chunks for value in chunk["cases"].astype(str)]
+
+    assert schema is not None
+    assert values[-1] == "foo" and len(values) == 11
+    assert json.loads(load_csv.schema_cache_path(path).read_text())["columns"] == ["region", "cases"]
+
+
+def test_stale_cached_schema_rereads_a_zip_member(schema_cache):
+    archive = schema_cache / "export.zip"
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("2024/cases.csv", "region,cases\nnorth,1\nsouth,foo\n")
+    member = f"{archive}::2024/cases.csv"
+    load_csv.save_schema(member, {"region": {"kind": "text"}, "cases": {"kind": "native", "dtype": "Int64"}})
+
+    with load_csv.open_source(member) as handle:
+        df, schema = load_csv.read_csv_with_schema(member, handle)
+    assert schema is None
+    assert df["region"].tolist() == ["north", "south"] and df["cases"].tolist() == ["1", "foo"]
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(str(statement))
+
+
+def test_conform_chunk_casts_and_widens():
+    conn = RecordingConnection()
+    schema = {"count": "integer", "rate": "float", "name": "text"}
+    chunk = pd.DataFrame({"count": ["3", "4"], "rate": [1, 2], "name": ["a", "b"]})
+
+    chunk = load_csv.conform_chunk(chunk, schema, conn, "t__staging")
+    assert str(chunk["count"].dtype) == "Int64" and chunk["rate"].dtype == float
+    assert conn.statements == []
+
+    chunk = pd.DataFrame({"count": [1.5, None], "rate": ["x", "1"], "name": ["c", "d"]})
+    chunk = load_csv.conform_chunk(chunk, schema, conn, "t__staging")
+    assert schema == {"count": "float", "rate": "text", "name": "text"}
+    assert chunk["count"].iloc[0] == 1.5 and chunk["rate"].tolist() == ["x", "1"]
+    assert conn.statements == [
+        'ALTER TABLE "t__staging" ALTER COLUMN "count" TYPE DOUBLE PRECISION',
+        'ALTER TABLE "t__staging" ALTER COLUMN "rate" TYPE TEXT',
+    ]
+
+
+def test_row_hash_set_matches_drop_duplicates():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.integers(0, 50, 5000), "b": rng.integers(0, 20, 5000)})
+    seen = load_csv.RowHashSet()
+
+    kept = [chunk[seen.add_new(pd.util.hash_pandas_object(chunk, index=False).to_numpy())]
+            for chunk in (df.iloc[start:start + 137] for start in range(0, len(df), 137))]
+
+    expected = df.drop_duplicates()
+    assert pd.concat(kept).equals(expected)
+    assert len(seen) == len(expected)
+    assert len(seen.runs) <= 2 * np.log2(len(df) / 137) and all(np.all(np.diff(run) > 0) for run in seen.runs)
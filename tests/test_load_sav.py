@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+import pandas as pd
+from data.scripts.load_sav import clean_chunk, column_kinds, label_value, value_label_rows, variable_rows
+
+FORMATS = {"Q1": "F8", "Q2": "F8.0", "WEIGHT": "F8.2", "NAME": "A10", "VISIT": "DATE11", "START": "TIME8", "RAW": None}
+
+
+def meta():
+    return SimpleNamespace(
+        column_names=list(FORMATS),
+        original_variable_types=FORMATS,
+        readstat_variable_types={name: "string" if name == "NAME" else "double" for name in FORMATS},
+        variable_value_labels={"Q1": {1.0: "Yes", 2.0: "No"}, "NAME": {"x": "Unknown"}},
+        column_names_to_labels={"Q1": "Any staff on duty?", "WEIGHT": "Sampling weight"},
+    )
+
+
+def test_column_kinds_follow_the_spss_formats():
+    assert column_kinds(meta()) == {
+        "Q1": "integer", "Q2": "integer", "WEIGHT": "float", "NAME": "text",
+        "VISIT": "datetime", "START": "text", "RAW": "integer",
+    }
+
+
+def test_label_value_matches_postgres_text():
+    assert [label_value(v) for v in (1.0, -2.0, 1.5, 3, "x")] == ["1", "-2", "1.5", "3", "x"]
+
+
+def test_value_labels_one_row_per_code():
+    rows = value_label_rows("phc", meta())
+    assert rows.values.tolist() == [
+        ["phc", "q1", "1", "Yes"], ["phc", "q1", "2", "No"], ["phc", "name", "x", "Unknown"],
+    ]
+
+
+def test_variable_rows_keep_position_label_and_format():
+    rows = variable_rows("phc", meta())
+    assert rows["column_name"].tolist() == [name.lower() for name in FORMATS]
+    assert rows["position"].tolist() == list(range(1, len(FORMATS) + 1))
+    assert rows.loc[0, "label"] == "Any staff on duty?" and rows["label"].isna().sum() == len(FORMATS) - 2
+    assert rows.loc[2, "spss_format"] == "F8.2" and rows["table_name"].eq("phc").all()
+
+
+def test_clean_chunk_blanks_strings_and_parses_dates():
+    chunk = pd.DataFrame({
+        "NAME": ["Clinic A  ", "   ", ""],
+        "VISIT": ["2002-03-01", None, "not a date"],
+        "Q1": [1.0, 2.0, None],
+    })
+    out = clean_chunk(chunk, {"NAME": "text", "VISIT": "datetime", "Q1": "integer"})
+
+    assert list(out.columns) == ["name", "visit", "q1"]
+    assert out["name"].dtype == object
+    assert out["name"].iloc[0] == "Clinic A" and out["name"].isna().tolist() == [False, True, True]
+    assert out["visit"].tolist()[0] == pd.Timestamp("2002-03-01") and out["visit"].isna().tolist()[1:] == [True, True]
+    assert out["q1"].tolist()[:2] == [1.0, 2.0]
@@ -0,0 +1,87 @@
+import os
+import zipfile
+from etl import manifest as manifest_module
+from etl.manifest import LoadManifest
+from etl.orchestrator import skip_unchanged
+from etl.sources import ArchiveMember
+
+
+def write(path, text, mtime_ns=None):
+    path.write_text(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_unchanged_file_is_skipped_after_save_and_reload(tmp_path):
+    csv = write(tmp_path / "cases.csv", "a,b\n1,2\n")
+    manifest = LoadManifest(tmp_path / "manifest.json")
+    assert not manifest.is_unchanged(csv, "outbreak_reports")
+
+    manifest.record(csv, "outbreak_reports", 1)
+    manifest.save()
+
+    reloaded = LoadManifest(tmp_path / "manifest.json")
+    assert reloaded.is_unchanged(csv, "outbreak_reports")
+    assert not reloaded.is_unchanged(csv, "disease_indicators")
+    assert reloaded.entries[os.path.normpath(str(csv))]["row_count"] == 1
+
+
+def test_content_change_is_detected(tmp_path):
+    csv = write(tmp_path / "cases.csv", "a,b\n1,2\n", mtime_ns=1_000_000_000_000_000_000)
+    manifest = LoadManifest(tmp_path / "manifest.json")
+    manifest.record(csv, "outbreak_reports", 1)
+
+    write(csv, "a,b\n1,3\n", mtime_ns=1_000_000_001_000_000_000)  # same size
+    assert not manifest.is_unchanged(csv, "outbreak_reports")
+    write(csv, "a,b\n1,2\n9,9\n")
+    assert not manifest.is_unchanged(csv, "outbreak_reports")
+
+
+def test_touched_file_is_hashed_once_then_trusted(tmp_path, monkeypatch):
+    csv = write(tmp_path / "cases.csv", "a,b\n1,2\n", mtime_ns=1_000_000_000_000_000_000)
+    manifest = LoadManifest(tmp_path / "manifest.json")
+    manifest.record(csv, "outbreak_reports", 1)
+
+    hashed = []
+    real_sha256 = manifest_module.file_sha256
+    monkeypatch.setattr(manifest_module, "file_sha256", lambda path: hashed.append(path) or real_sha256(path))
+
+    assert manifest.is_unchanged(csv, "outbreak_reports")  # same mtime: no hashing at all
+    assert hashed == []
+
+    write(csv, "a,b\n1,2\n", mtime_ns=1_000_000_001_000_000_000)
+    assert manifest.is_unchanged(csv, "outbreak_reports")
+    assert manifest.is_unchanged(csv, "outbreak_reports")
+    assert len(hashed) == 1
+
+
+def test_archive_members_are_fingerprinted_without_reading(tmp_path):
+    archive = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("cases.csv", "a,b\n1,2\n")
+    member = ArchiveMember(archive, "cases.csv")
+
+    manifest = LoadManifest(tmp_path / "manifest.json")
+    manifest.record(member, "outbreak_reports", 1)
+    assert manifest.is_unchanged(member, "outbreak_reports")
+    assert "sha256" not in manifest.entries[str(member)]
+
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("cases.csv", "a,b\n1,3\n")
+    assert not manifest.is_unchanged(member, "outbreak_reports")
+
+
+def test_skip_unchanged_splits_jobs(tmp_path):
+    old = write(tmp_path / "old.csv", "a\n1\n")
+    new = write(tmp_path / "new.csv", "a\n2\n")
+    manifest = LoadManifest(tmp_path / "manifest.json")
+    manifest.record(old, "outbreak_reports", 1)
+    manifest.record(new, "outbreak_reports", 1)
+    write(new, "a\n2\n3\n")
+
+    jobs = [{"kind": "outbreak", "path": str(old)}, {"kind": "outbreak", "path": str(new)},
+            {"kind": "disease", "path": str(old)}]
+    to_run, skipped = skip_unchanged(jobs, manifest)
+    assert skipped == [jobs[0]]
+    assert to_run == jobs[1:]
@@ -0,0 +1,35 @@
+import pandas as pd
+from etl.normalize import DIGIT_SEPARATOR, GROUPED_NUMBER, coalesce_aliases, drop_hashtag_rows, hashtag_rows, normalize_frame
+
+
+def test_coalesce_takes_first_filled_alias_per_row():
+    df = pd.DataFrame({"Value": [None, " b ", "", None], "value": ["a", "x", "c", None]})
+    assert coalesce_aliases(df, ["value", "Value"]).tolist() == ["a", "x", "c", pd.NA]
+    assert coalesce_aliases(df, ["Value", "value"]).tolist() == ["a", "b", "c", pd.NA]
+    assert coalesce_aliases(df, ["missing"]).isna().all()
+
+
+def test_single_alias_gaps_stay_empty():
+    df = pd.DataFrame({"sex_code": [None, "FMLE"], "Numeric": [None, "1.5"]}, dtype=str)
+    out = normalize_frame(df, {"dimension_code": ["dimension_code", "sex_code"], "numeric": ["Numeric"]},
+                          numeric_fields={"numeric"})
+    assert out["dimension_code"].isna().tolist() == [True, False]
+    assert out["numeric"].isna().tolist() == [True, False]
+
+
+def test_hashtag_rows_need_every_filled_cell_tagged():
+    df = pd.DataFrame({
+        "code": ["#indicator+code", "#not a tag", None, "#indicator+code", None, "MAL"],
+        "year": ["#date+year", "x", "#date+year", "2015", None, "#date+year"],
+        "count": [None, None, None, None, None, 3],
+    })
+    assert hashtag_rows(df).tolist() == [True, False, True, False, False, False]
+    assert drop_hashtag_rows(df)["year"].tolist() == ["x", "2015", None, "#date+year"]
+    untagged = df.iloc[[1, 3]]
+    assert drop_hashtag_rows(untagged) is untagged and not hashtag_rows(pd.DataFrame({"n": [1]})).any()
+
+
+def test_grouped_numbers_accept_commas_and_spaces():
+    values = ["16 702 261", "16 702 261", "1,204", "-3.5", "12 34", "1,2", "x"]
+    assert [bool(GROUPED_NUMBER.fullmatch(v)) for v in values] == [True, True, True, True, False, False, False]
+    assert DIGIT_SEPARATOR.sub("", "16 702 261,5") == "167022615"
@@ -0,0 +1,42 @@
+import pytest
+from etl import orchestrator
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """run_pipeline with one successful facility job and recording stand-ins for the post-load steps."""
+    calls = []
+
+    def step(name, fails=False):
+        def run():
+            calls.append(name)
+            if fails:
+                raise RuntimeError(f"{name} broke")
+            return name
+        return run
+
+    job = {"kind": "facility", "path": "data/processed/Facility_level_data/a.csv", "arg": "a"}
+    monkeypatch.setattr(orchestrator, "build_jobs", lambda sources: [dict(job)])
+    monkeypatch.setattr(orchestrator, "resolve_dimensions", lambda jobs: None)
+    monkeypatch.setattr(orchestrator, "run_jobs", lambda jobs, workers=None: {
+        "success": [{**job, "rows": 3, "seconds": 0.1}], "failed": [],
+    })
+    monkeypatch.setattr(orchestrator, "run_coverage", step("coverage", fails=True))
+    monkeypatch.setattr(orchestrator, "refresh_rollups", step("rollups"))
+    monkeypatch.setattr(orchestrator, "record_data_version", lambda results: step("data_version")())
+    monkeypatch.setattr(orchestrator.parquet_export, "available", lambda: True)
+    monkeypatch.setattr(orchestrator.parquet_export, "export_snapshot", step("snapshot", fails=True))
+    monkeypatch.setattr(orchestrator, "build_features", step("features"))
+    return calls
+
+
+def test_failing_post_load_steps_do_not_stop_the_rest(pipeline, capsys):
+    results = orchestrator.run_pipeline(manifest_path=None)
+
+    assert pipeline == ["coverage", "rollups", "data_version", "snapshot", "features"]
+    assert [r["step"] for r in results["failed_steps"]] == ["coverage", "snapshot"]
+    assert results["rollups"] == "rollups" and results["features"] == "features"
+    assert "coverage" not in results
+    out = capsys.readouterr().out
+    assert "ETL SUMMARY" in out
+    assert "✗ step      coverage: RuntimeError('coverage broke')" in out
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+from analytics.outbreak_detector import CUSUM_H, STATE_COLUMNS, WARMUP_WEEKS, derive_epiweeks, detect
+
+REPORT_COLUMNS = ["id", "disease_name", "country_code", "first_epiwk", "last_epiwk", "case_total", "death_total"]
+
+
+def reports(rows):
+    return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+
+def no_state():
+    return pd.DataFrame(columns=STATE_COLUMNS)
+
+
+def week(n):
+    return pd.Timestamp("2024-01-01") + pd.Timedelta(weeks=n)
+
+
+def test_cumulative_reports_become_increments():
+    weeks = derive_epiweeks(reports([
+        (1, "Cholera", "NGA", week(0), week(0), 10, 1),
+        (2, "Cholera", "NGA", week(0), week(2), 25, 2),
+        (3, "Cholera", "NGA", week(0), week(3), 24, 2),   # downward revision
+        (4, "Cholera", "NGA", week(10), week(11), 6, 0),  # new reporting cycle counts in full
+        (5, "Lassa", "NGA", week(0), week(1), None, None),
+        (6, None, "NGA", week(0), week(1), 5, 0),         # no series
+    ]), no_state())
+
+    cholera = weeks[weeks["disease_name"] == "Cholera"]
+    assert cholera["new_cases"].tolist() == [10, 15, 0, 6]
+    assert cholera["weeks_covered"].tolist() == [1, 2, 1, 2]
+    assert cholera["new_deaths"].tolist() == [1, 1, 0, 0]
+    assert weeks[weeks["disease_name"] == "Lassa"]["new_cases"].tolist() == [0]
+    assert len(weeks) == 5
+
+
+def test_state_continues_series_and_drops_stale_reports():
+    state = no_state()
+    state.loc[0] = {"disease_name": "Cholera", "country_code": "NGA", "last_report_id": 9,
+                    "first_epiwk": week(0).date(), "last_epiwk": week(4).date(), "cum_cases": 40, "cum_deaths": 3,
+                    "weeks_seen": 5, "ewma_mean": 8.0, "ewma_var": 4.0, "cusum": 0.0}
+    weeks = derive_epiweeks(reports([
+        (10, "Cholera", "NGA", week(0), week(4), 41, 3),  # re-sent week: stale
+        (11, "Cholera", "NGA", week(0), week(5), 50, 4),
+        (12, "Cholera", "NGA", week(0), week(5), 52, 4),  # same week loaded again: last one wins
+    ]), state)
+
+    assert weeks[["new_cases", "new_deaths", "report_id"]].values.tolist() == [[12, 1, 12]]
+
+
+def weekly(cases):
+    rows = [(i + 1, "Cholera", "NGA", week(0), week(i), int(total), 0) for i, total in enumerate(np.cumsum(cases))]
+    return reports(rows)
+
+
+def test_spike_after_warmup_alerts():
+    cases = [10, 11, 9, 10, 10, 11, 60]
+    state, alerts = detect(derive_epiweeks(weekly(cases), no_state()), no_state())
+
+    assert alerts["kind"].tolist() == ["spike", "cusum"]
+    assert (alerts["epiweek"] == week(6).date()).all()
+    assert alerts["weekly_cases"].tolist() == [60.0, 60.0]
+    assert state["weeks_seen"].tolist() == [len(cases)]
+    assert state["cusum"].tolist() == [0.0]  # reset after alerting
+
+    _, quiet = detect(derive_epiweeks(weekly(cases[:WARMUP_WEEKS - 1] + [60]), no_state()), no_state())
+    assert quiet.empty
+
+
+def test_incremental_runs_match_one_batch():
+    cases = [5, 6, 4, 5, 9, 12, 15, 19, 7, 5]
+    batch_state, batch_alerts = detect(derive_epiweeks(weekly(cases), no_state()), no_state())
+    assert (batch_alerts["kind"] == "cusum").any() and batch_alerts["cusum"].min() >= CUSUM_H
+
+    state, alerts = no_state(), []
+    all_reports = weekly(cases)
+    for i in range(len(cases)):
+        state, new_alerts = detect(derive_epiweeks(all_reports.iloc[[i]], state), state)
+        alerts += [new_alerts] if len(new_alerts) else []
+    alerts = pd.concat(alerts, ignore_index=True)
+
+    pd.testing.assert_frame_equal(state.reset_index(drop=True), batch_state, check_dtype=False)
+    pd.testing.assert_frame_equal(alerts, batch_alerts, check_dtype=False)
@@ -0,0 +1,137 @@
+import os
+from contextlib import nullcontext
+import pytest
+from sqlalchemy import Float, Integer, String, column, select, table
+from etl import parquet_export
+from etl.parquet_export import latest_snapshot, prune_snapshots, publish_snapshot
+
+FACTS = table(
+    "facts",
+    column("disease", String), column("year", Integer), column("code", String), column("value", Float),
+)
+ROWS = [  # result columns in a different order than the SELECT
+    (1.5, "MAL_CASES", "Malaria", 2015),
+    (2.5, "MAL_CASES", "Malaria", 2016),
+    (3.5, "MAL_RATE", "Malaria", 2016),
+    (4.5, "TB_CASES", "Tuberculosis", 2015),
+    (5.5, None, None, 2015),
+    (6.5, "MAL_CASES", "Malaria", None),
+]
+
+
+class StubResult:
+    """Just what _record_batches reads from a streamed SQLAlchemy result."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def keys(self):
+        return ["value", "code", "disease", "year"]
+
+    def partitions(self, size):
+        for start in range(0, len(self.rows), size):
+            yield self.rows[start:start + size]
+
+
+class StubConnection:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self, stmt):
+        return self.result
+
+
+def make_snapshot(root, name, tables=("facts",)):
+    building = os.path.join(root, f"{name}.tmp")
+    os.makedirs(building, exist_ok=True)
+    for t in tables:
+        os.makedirs(os.path.join(building, t))
+    return publish_snapshot(root, name, building, keep=2)
+
+
+def test_publish_points_latest_at_the_new_snapshot(tmp_path):
+    root = str(tmp_path)
+    assert latest_snapshot(root) is None
+
+    first = make_snapshot(root, "v1")
+    assert latest_snapshot(root) == first and os.path.isdir(os.path.join(first, "facts"))
+
+    again = make_snapshot(root, "v1", tables=("other",))  # re-export replaces the folder
+    assert os.listdir(again) == ["other"]
+    assert not os.path.exists(os.path.join(root, "v1.tmp")) and not os.path.exists(os.path.join(root, "LATEST.tmp"))
+
+
+def test_prune_keeps_the_newest_versions_numerically(tmp_path):
+    for name in ("v2", "v9", "v10", "v11.tmp", "models"):
+        (tmp_path / name).mkdir()
+
+    prune_snapshots(str(tmp_path), keep=0)
+    assert len(os.listdir(tmp_path)) == 5
+
+    prune_snapshots(str(tmp_path), keep=2)
+    assert sorted(os.listdir(tmp_path)) == ["models", "v10", "v11.tmp", "v9"]
+
+    make_snapshot(str(tmp_path), "v11", tables=())
+    assert sorted(os.listdir(tmp_path)) == ["LATEST", "models", "v10", "v11"]
+
+
+@pytest.fixture
+def pyarrow(monkeypatch):
+    module = pytest.importorskip("pyarrow")
+    monkeypatch.setattr(parquet_export, "BATCH_ROWS", 4)
+    return module
+
+
+def stmt():
+    return select(FACTS.c.disease, FACTS.c.year, FACTS.c.code, FACTS.c.value)
+
+
+def test_schema_and_batches_follow_the_select(pyarrow):
+    schema = parquet_export.arrow_schema(stmt(), ["disease", "year"])
+    assert schema.names == ["disease", "year", "code", "value"]
+    assert schema.field("disease").type == pyarrow.string()
+    assert pyarrow.types.is_dictionary(schema.field("code").type)
+
+    batches = list(parquet_export._record_batches(StubResult(ROWS), schema))
+    assert [b.num_rows for b in batches] == [4, 2]
+    assert batches[0].column(2).dictionary.to_pylist() == ["MAL_CASES", "MAL_RATE", "TB_CASES"]
+    assert batches[1].to_pydict() == {
+        "disease": [None, "Malaria"], "year": [2015, None], "code": [None, "MAL_CASES"], "value": [5.5, 6.5],
+    }
+
+
+@pytest.fixture
+def snapshot(pyarrow, tmp_path, monkeypatch):
+    monkeypatch.setattr(parquet_export, "streaming_connection",
+                        lambda profile: nullcontext(StubConnection(StubResult(ROWS))))
+    building = tmp_path / "v1.tmp"
+    written = parquet_export.export_table(stmt(), ["disease", "year"], str(building / "facts"))
+    assert written == len(ROWS)
+    publish_snapshot(str(tmp_path), "v1", str(building), keep=2)
+    return str(tmp_path)
+
+
+def test_export_round_trips_through_read_frame(snapshot):
+    frame = parquet_export.read_frame("facts", root=snapshot).sort_values("value", ignore_index=True)
+
+    assert list(frame.columns) == ["disease", "year", "code", "value"]
+    assert frame["value"].tolist() == [row[0] for row in ROWS]
+    assert frame["code"].dtype == "category"
+    assert frame["disease"].isna().tolist() == [False, False, False, False, True, False]
+    assert frame["year"].isna().tolist() == [False] * 5 + [True]
+    assert frame.loc[3, ["disease", "code"]].tolist() == ["Tuberculosis", "TB_CASES"]
+
+
+def test_read_frame_filters_on_partitions_and_columns(snapshot):
+    frame = parquet_export.read_frame("facts", filters={"disease": "Malaria", "year": [2015, 2016]},
+                                      columns=["code", "value"], root=snapshot)
+    assert sorted(frame["value"]) == [1.5, 2.5, 3.5]
+    assert list(frame.columns) == ["code", "value"]
+
+    tb = parquet_export.read_frame("facts", filters={"year": 2015}, root=snapshot)
+    assert sorted(tb["value"]) == [1.5, 4.5, 5.5]
+
+
+def test_reading_without_a_snapshot_says_how_to_export(pyarrow, tmp_path):
+    with pytest.raises(FileNotFoundError, match="etl.parquet_export"):
+        parquet_export.read_frame("facts", root=str(tmp_path))
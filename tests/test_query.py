@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.orm import Session
+from backend.app.query import Page, keyset_select
+
+metadata = MetaData()
+items = Table("items", metadata, Column("row_id", Integer, primary_key=True), Column("name", String))
+
+
+def test_keyset_select_pages_through_every_row():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with Session(engine) as db:
+        db.execute(items.insert(), [{"row_id": i, "name": f"n{i}"} for i in range(1, 26)])
+        stmt = select(items).where(items.c.row_id % 2 == 1).order_by(items.c.row_id)
+
+        seen, after = [], None
+        while True:
+            result = keyset_select(db, stmt, items.c.row_id, Page(after_id=after, limit=5))
+            assert len(result["items"]) <= 5
+            seen += [row["row_id"] for row in result["items"]]
+            after = result["next_after"]
+            if after is None:
+                break
+
+    assert seen == list(range(1, 26, 2))
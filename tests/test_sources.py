@@ -0,0 +1,63 @@
+import gzip
+import zipfile
+import pandas as pd
+from pathlib import Path
+from etl.sources import ArchiveMember, as_source, list_sources, open_source, source_name
+
+CSV = "region,cases\nnorth,1\nsouth,2\n"
+
+
+def make_zip(path):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("2024/PHC.csv", CSV)
+        archive.writestr("2024/notes.txt", "not a csv")
+        archive.writestr("README.csv", CSV)
+        archive.writestr("empty/", "")
+    return path
+
+
+def test_directory_lists_plain_and_gzipped_files(tmp_path):
+    (tmp_path / "b.csv").write_text(CSV)
+    with gzip.open(tmp_path / "a.csv.gz", "wt") as f:
+        f.write(CSV)
+    (tmp_path / "c.txt").write_text(CSV)
+
+    sources = list_sources(tmp_path)
+    assert [s.name for s in sources] == ["a.csv.gz", "b.csv"]
+    assert [source_name(s) for s in sources] == ["a.csv", "b.csv"]
+    with open_source(sources[0]) as handle:
+        assert pd.read_csv(handle)["cases"].tolist() == [1, 2]
+
+
+def test_zip_lists_matching_members(tmp_path):
+    archive = make_zip(tmp_path / "export.zip")
+
+    sources = list_sources(archive)
+    assert [s.member for s in sources] == ["2024/PHC.csv", "README.csv"]
+    assert [s.name for s in list_sources(archive, "PHC*")] == ["PHC.csv"]
+    with open_source(sources[0]) as handle:
+        assert pd.read_csv(handle)["region"].tolist() == ["north", "south"]
+
+
+def test_not_a_directory_or_archive_lists_nothing(tmp_path):
+    (tmp_path / "a.csv").write_text(CSV)
+    assert list_sources(tmp_path / "a.csv") == [] and list_sources(tmp_path / "missing") == []
+
+
+def test_archive_member_names_and_info(tmp_path):
+    archive = make_zip(tmp_path / "export.zip")
+    member = as_source(f"{archive}::2024/PHC.csv")
+
+    assert isinstance(member, ArchiveMember) and as_source(member) is member
+    assert member.name == "PHC.csv" and source_name(member) == "PHC.csv"
+    assert str(member) == f"{archive}::2024/PHC.csv"
+    assert member.exists() and member.info().file_size == len(CSV)
+    assert not ArchiveMember(archive, "2024/missing.csv").exists()
+    assert not ArchiveMember(tmp_path / "missing.zip", "PHC.csv").exists()
+
+
+def test_source_name_strips_only_the_compression_suffix():
+    assert source_name("data/PHC.csv.gz") == "PHC.csv"
+    assert source_name("data/PHC.CSV.GZ") == "PHC.CSV"
+    assert source_name("a.zip::dir/PHC.csv.gz") == "PHC.csv"
+    assert source_name(Path("data/PHC.csv")) == "PHC.csv"
@@ -0,0 +1,66 @@
+import pandas as pd
+from etl.transform_raw import build_jobs, parse_grouped_numbers, run_transforms, transform_frame
+
+GHO_CSV = """GHO (CODE),GHO (DISPLAY),YEAR (DISPLAY),STARTYEAR,ENDYEAR,DIMENSION (TYPE),DIMENSION (CODE),DIMENSION (NAME),Numeric,Value
+#indicator+code,#indicator+name,#date+year,#date+year+start,#date+year+end,#dimension+type,#dimension+code,#dimension+name,#indicator+value+num,#indicator+value
+MAL_CASES,Malaria cases,2019,2019,2019,,,,,16 702 261
+MAL_RATE,Malaria incidence,2019,2019,2019,SEX,SEX_FMLE,Female,,0.45 [0.36 - 0.58]
+MAL_RATE,Malaria incidence,2020,2020,2020,SEX,SEX_MLE,Male,0.5,0.5
+MAL_NOTE,Malaria note,2020,2020,2020,,,,,No data
+,Orphan row,2020,2020,2020,,,,,1
+"""
+
+
+def test_parse_grouped_numbers():
+    values = pd.Series(["16 702 261", "1 234.5", "0.45 [0.36 - 0.58]", "-3", "No data", None, "12 34"])
+    parsed = parse_grouped_numbers(values)
+    assert parsed.iloc[:4].tolist() == [16702261, 1234.5, 0.45, -3]
+    assert parsed.iloc[4:6].isna().all()
+    assert parsed.iloc[6] == 12  # "34" is not a digit group
+
+
+def read(text, tmp_path, name="malaria_indicators_nga.csv"):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def test_transform_frame_gho_export(tmp_path):
+    out = transform_frame(pd.read_csv(read(GHO_CSV, tmp_path), dtype=str))
+
+    assert out["indicator_code"].tolist() == ["MAL_CASES", "MAL_RATE", "MAL_RATE", "MAL_NOTE"]
+    assert out["numeric"].iloc[:3].tolist() == [16702261, 0.45, 0.5] and pd.isna(out["numeric"].iloc[3])
+    assert out[["dimension_type", "dimension_code", "dimension_name"]].values.tolist() == [
+        ["Sex", "BTSX", "Both sexes"], ["Sex", "FMLE", "Female"], ["Sex", "MLE", "Male"], ["Sex", "BTSX", "Both sexes"],
+    ]
+    assert out["year"].tolist() == [2019, 2019, 2020, 2020]
+
+
+def test_transform_frame_hdx_headers():
+    raw = pd.DataFrame({
+        "gho_code": ["#indicator+code", "TB_1"], "gho_display": ["#indicator+name", "TB cases"],
+        "year_display": ["#date+year", "2018"], "sex_type": ["#dimension+type", "sex"],
+        "sex_code": ["#dimension+code", "sex_btsx"], "sex_name": ["#dimension+name", "Both sexes"],
+        "Numeric": ["#indicator+value+num", None], "Value": ["#indicator+value", "1 200"],
+    })
+    out = transform_frame(raw)
+    assert out[["indicator_code", "year", "dimension_type", "dimension_code", "numeric"]].values.tolist() == [
+        ["TB_1", 2018, "Sex", "BTSX", 1200],
+    ]
+
+
+def test_copies_are_transformed_once_and_unchanged_outputs_kept(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    read(GHO_CSV, raw)
+    read(GHO_CSV, raw, "malaria_indicators_nga(1).csv")
+    read("a,b\n1,2\n", raw, "not_indicators.csv")
+    output = tmp_path / "out"
+
+    jobs = build_jobs([str(raw)], str(output))
+    assert [job["output"].name for job in jobs] == ["malaria_indicators_nga.csv"]
+
+    first = run_transforms(jobs, workers=1)
+    assert [r["changed"] for r in first["success"]] == [True] and first["failed"] == []
+    again = run_transforms(build_jobs([str(raw)], str(output)), workers=1)
+    assert [r["changed"] for r in again["success"]] == [False]